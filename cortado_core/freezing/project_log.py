@@ -46,122 +46,191 @@ def project_log(
             )
         alignments.append(alignment)
 
-    replaced_frozen_subtrees: List[Tuple[ProcessTree, int]] = []
-    incrementally_projected_logs: Dict[FrozenSet[Tuple[ProcessTree, int]], EventLog] = (
-        {}
+    # the k-th incremental projection replaces the first k frozen subtrees
+    frozen_subtree_keys = list(frozen_subtrees)
+    n_frozen_subtrees = len(frozen_subtree_keys)
+    frozen_subtree_index, frozen_root_index = __build_frozen_subtree_index(
+        pt, frozen_subtree_keys
     )
-    final_projected_log: EventLog
 
-    for frozen_subtree in frozen_subtrees:
-        # incrementally replace the frozen subtree(s)
+    # projected_traces[k][i]: i-th trace of the log in the k-th incremental projection, all projections are computed
+    # in a single pass over each alignment
+    projected_traces: List[List[List[str]]] = [[] for _ in range(n_frozen_subtrees + 1)]
+
+    for i, alignment in enumerate(alignments):
+        current_infix_type = log[i].infix_type
+        assert (
+            not alignment_contains_deviation(alignment)
+            or current_infix_type != InfixType.NOT_AN_INFIX
+        )
 
-        replaced_frozen_subtrees.append(frozen_subtree)
-        res = []
+        if current_infix_type == InfixType.NOT_AN_INFIX:
+            traces = __project_trace_alignment(
+                alignment,
+                frozen_subtrees,
+                frozen_subtree_keys,
+                frozen_subtree_index,
+                frozen_root_index,
+            )
+        else:
+            traces = __project_infix_alignment(
+                alignment,
+                frozen_subtrees,
+                frozen_subtree_keys,
+                frozen_subtree_index,
+                frozen_root_index,
+            )
 
-        for i, alignment in enumerate(alignments):
-            current_infix_type = log[i].infix_type
-            assert (
-                not alignment_contains_deviation(alignment)
-                or current_infix_type != InfixType.NOT_AN_INFIX
+        for k, trace in enumerate(traces):
+            projected_traces[k].append(trace)
+
+    incrementally_projected_logs: Dict[FrozenSet[Tuple[ProcessTree, int]], EventLog] = (
+        {}
+    )
+    final_projected_log: EventLog = []
+    for k in range(1, n_frozen_subtrees + 1):
+        res = [
+            TypedTrace(
+                Trace([Event({"concept:name": label}) for label in trace]),
+                log[i].infix_type,
             )
-            trace = Trace()
-
-            if current_infix_type == InfixType.NOT_AN_INFIX:
-                for step in alignment["alignment"]:
-                    # executed transition always corresponds to a node in the process tree
-                    current_pt: ProcessTree = step[0][1][0]
-                    assert type(current_pt) is ProcessTree
-                    # determine if current_pt is frozen
-                    current_pt_frozen = False
-                    for f_pt, f_pt_id in replaced_frozen_subtrees:
-                        if subtree_is_part_of_tree_based_on_obj_id(current_pt, f_pt):
-                            current_pt_frozen = True
-
-                    activity_label = None
-                    if is_visible_leaf(current_pt) and not current_pt_frozen:
-                        activity_label = step[1][1]
-                    elif (
-                        current_pt_frozen
-                        and pt_dict_key(current_pt) in replaced_frozen_subtrees
-                    ):
-                        if step[0][1][1] == "active":
-                            activity_label = (
-                                frozen_subtrees[pt_dict_key(current_pt)] + "+ACTIVATED"
-                            )
-                        elif step[0][1][1] == "closed":
-                            activity_label = (
-                                frozen_subtrees[pt_dict_key(current_pt)] + "+CLOSED"
-                            )
-                    if activity_label:
-                        event = Event()
-                        event["concept:name"] = activity_label
-                        trace.append(event)
-            else:
-                infix_opened = False
-                open_frozen_trees = []
-                for step in alignment["alignment"]:
-                    # executed transition always corresponds to a node in the process tree
-                    current_pt: ProcessTree = step[0][1][0]
-                    assert type(current_pt) is ProcessTree
-                    # determine if current_pt is frozen
-                    current_pt_frozen = False
-                    for f_pt, f_pt_id in replaced_frozen_subtrees:
-                        if subtree_is_part_of_tree_based_on_obj_id(current_pt, f_pt):
-                            current_pt_frozen = True
-
-                    if not infix_opened and is_sync_move(step):
-                        infix_opened = True
-                        # insert open replacement labels for frozen subtrees opened before infix
-                        for open_pt in open_frozen_trees:
-                            replacement_label = (
-                                frozen_subtrees[pt_dict_key(open_pt)] + "+ACTIVATED"
-                            )
-                            trace.append(Event({"concept:name": replacement_label}))
-                    elif infix_opened and not alignment_step_represents_no_deviation(
-                        step
-                    ):
-                        # the rest of the alignment has deviations and the infix closed
-                        infix_opened = False
-                        # insert closing replacement labels for open frozen subtrees
-                        for open_pt in reversed(open_frozen_trees):
-                            replacement_label = (
-                                frozen_subtrees[pt_dict_key(open_pt)] + "+CLOSED"
-                            )
-                            trace.append(Event({"concept:name": replacement_label}))
-                        break
-
-                    if pt_dict_key(current_pt) in replaced_frozen_subtrees:
-                        if step[0][1][1] == "active":
-                            open_frozen_trees.append(current_pt)
-                            if infix_opened:
-                                replacement_label = (
-                                    frozen_subtrees[pt_dict_key(current_pt)]
-                                    + "+ACTIVATED"
-                                )
-                                trace.append(Event({"concept:name": replacement_label}))
-
-                        elif step[0][1][1] == "closed":
-                            open_frozen_trees.remove(current_pt)
-                            if infix_opened:
-                                replacement_label = (
-                                    frozen_subtrees[pt_dict_key(current_pt)] + "+CLOSED"
-                                )
-                                trace.append(Event({"concept:name": replacement_label}))
-
-                    if (
-                        is_visible_leaf(current_pt)
-                        and is_sync_move(step)
-                        and not current_pt_frozen
-                    ):
-                        trace.append(Event({"concept:name": step[1][1]}))
-
-            typed_trace = TypedTrace(trace, log[i].infix_type)
-            res.append(typed_trace)
-        incrementally_projected_logs[frozenset(replaced_frozen_subtrees)] = res
+            for i, trace in enumerate(projected_traces[k])
+        ]
+        incrementally_projected_logs[frozenset(frozen_subtree_keys[:k])] = res
         final_projected_log = res
+
     return incrementally_projected_logs, final_projected_log
 
 
+def __build_frozen_subtree_index(
+    pt: ProcessTree, frozen_subtree_keys: List[Tuple[ProcessTree, int]]
+) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """
+    Maps the object ids of all tree nodes that are part of a frozen subtree to the (smallest) position of a containing
+    frozen subtree in the order of frozen subtrees, i.e., a node is frozen in the k-th incremental projection iff its
+    index is smaller than k. Additionally, the roots of the frozen subtrees are mapped to their own position.
+    The index is built in a single traversal of the tree.
+    """
+    frozen_root_index: Dict[int, int] = {}
+    for idx, (f_pt, f_pt_id) in enumerate(frozen_subtree_keys):
+        frozen_root_index.setdefault(f_pt_id, idx)
+
+    frozen_subtree_index: Dict[int, int] = {}
+    nodes_to_visit = [(pt, None)]
+    while len(nodes_to_visit) > 0:
+        node, index = nodes_to_visit.pop()
+        if id(node) in frozen_root_index:
+            node_index = frozen_root_index[id(node)]
+            index = node_index if index is None else min(index, node_index)
+        if index is not None:
+            frozen_subtree_index[id(node)] = index
+        for child in node.children:
+            nodes_to_visit.append((child, index))
+
+    return frozen_subtree_index, frozen_root_index
+
+
+def __project_trace_alignment(
+    alignment,
+    frozen_subtrees: OrderedDict[Tuple[ProcessTree, int], str],
+    frozen_subtree_keys: List[Tuple[ProcessTree, int]],
+    frozen_subtree_index: Dict[int, int],
+    frozen_root_index: Dict[int, int],
+) -> List[List[str]]:
+    n_frozen_subtrees = len(frozen_subtree_keys)
+    traces: List[List[str]] = [[] for _ in range(n_frozen_subtrees + 1)]
+
+    for step in alignment["alignment"]:
+        # executed transition always corresponds to a node in the process tree
+        current_pt: ProcessTree = step[0][1][0]
+        assert type(current_pt) is ProcessTree
+        # current_pt is frozen in all projections k > frozen_idx
+        frozen_idx = frozen_subtree_index.get(id(current_pt), n_frozen_subtrees)
+
+        if is_visible_leaf(current_pt):
+            for k in range(frozen_idx + 1):
+                traces[k].append(step[1][1])
+        elif id(current_pt) in frozen_root_index and step[0][1][1] in {
+            "active",
+            "closed",
+        }:
+            root_idx = frozen_root_index[id(current_pt)]
+            activity_label = __get_replacement_label(
+                frozen_subtrees, frozen_subtree_keys[root_idx], step[0][1][1]
+            )
+            for k in range(root_idx + 1, n_frozen_subtrees + 1):
+                traces[k].append(activity_label)
+
+    return traces
+
+
+def __project_infix_alignment(
+    alignment,
+    frozen_subtrees: OrderedDict[Tuple[ProcessTree, int], str],
+    frozen_subtree_keys: List[Tuple[ProcessTree, int]],
+    frozen_subtree_index: Dict[int, int],
+    frozen_root_index: Dict[int, int],
+) -> List[List[str]]:
+    n_frozen_subtrees = len(frozen_subtree_keys)
+    traces: List[List[str]] = [[] for _ in range(n_frozen_subtrees + 1)]
+    infix_opened = False
+    # open frozen subtrees, represented by their position in the order of frozen subtrees
+    open_frozen_trees: List[int] = []
+
+    def append_replacement_label(root_idx: int, status: str):
+        label = __get_replacement_label(
+            frozen_subtrees, frozen_subtree_keys[root_idx], status
+        )
+        for k in range(root_idx + 1, n_frozen_subtrees + 1):
+            traces[k].append(label)
+
+    for step in alignment["alignment"]:
+        # executed transition always corresponds to a node in the process tree
+        current_pt: ProcessTree = step[0][1][0]
+        assert type(current_pt) is ProcessTree
+        frozen_idx = frozen_subtree_index.get(id(current_pt), n_frozen_subtrees)
+
+        if not infix_opened and is_sync_move(step):
+            infix_opened = True
+            # insert open replacement labels for frozen subtrees opened before infix
+            for open_idx in open_frozen_trees:
+                append_replacement_label(open_idx, "active")
+        elif infix_opened and not alignment_step_represents_no_deviation(step):
+            # the rest of the alignment has deviations and the infix closed
+            # insert closing replacement labels for open frozen subtrees
+            for open_idx in reversed(open_frozen_trees):
+                append_replacement_label(open_idx, "closed")
+            break
+
+        if id(current_pt) in frozen_root_index:
+            root_idx = frozen_root_index[id(current_pt)]
+            if step[0][1][1] == "active":
+                open_frozen_trees.append(root_idx)
+                if infix_opened:
+                    append_replacement_label(root_idx, "active")
+            elif step[0][1][1] == "closed":
+                open_frozen_trees.remove(root_idx)
+                if infix_opened:
+                    append_replacement_label(root_idx, "closed")
+
+        if is_visible_leaf(current_pt) and is_sync_move(step):
+            for k in range(frozen_idx + 1):
+                traces[k].append(step[1][1])
+
+    return traces
+
+
+def __get_replacement_label(
+    frozen_subtrees: OrderedDict[Tuple[ProcessTree, int], str],
+    frozen_subtree_key: Tuple[ProcessTree, int],
+    status: str,
+) -> str:
+    if status == "active":
+        return frozen_subtrees[frozen_subtree_key] + "+ACTIVATED"
+
+    return frozen_subtrees[frozen_subtree_key] + "+CLOSED"
+
+
 if __name__ == "__main__":
     pt_1: ProcessTree = pt_parse(
         "-> (*(X(->('A','B'),->('C','D')),tau) ,->('E',->('A','F')) )"
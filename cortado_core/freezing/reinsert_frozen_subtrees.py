@@ -1,8 +1,7 @@
 import collections
-import copy
 import math
 import logging
-from typing import Dict, List, Tuple, OrderedDict, FrozenSet
+from typing import Dict, List, Tuple, OrderedDict, FrozenSet, Set
 
 from pm4py.objects.process_tree.obj import ProcessTree
 from pm4py.objects.process_tree.utils.generic import parse as pt_parse
@@ -23,6 +22,7 @@ from cortado_core.process_tree_utils.miscellaneous import (
     replace_tree_in_children,
     get_root,
     pt_dict_key,
+    get_structural_fingerprint,
 )
 import pm4py.visualization.process_tree.visualizer as tree_vis
 
@@ -136,14 +136,24 @@ def reinsert_frozen_subtrees(
             appropriate_insert_position_found: bool = False
             logging.debug("lca", lca)
 
+            # failed insertions are undone, i.e., the nodes and labels of the tree do not change between the
+            # iterations. Hence, the execution numbers of all candidates can be annotated once upfront
+            pt = get_root(pt)
+            ACTIVATED_annotation = annotate_execution_numbers(
+                pt, replacement_label + "+ACTIVATED"
+            )
+            CLOSED_annotation = annotate_execution_numbers(
+                pt, replacement_label + "+CLOSED"
+            )
+
             while not appropriate_insert_position_found:
-                tree_copy_for_assert_statement = copy.deepcopy(pt)
+                fingerprint_for_assert_statement = get_structural_fingerprint(pt)
                 # non-standard case ==> put subtree to be inserted in parallel next to the remaining tree
-                ACTIVATED_execution_numbers = calculate_execution_numbers(
-                    insert_candidate, replacement_label + "+ACTIVATED"
+                ACTIVATED_execution_numbers = __to_execution_numbers(
+                    ACTIVATED_annotation[id(insert_candidate)]
                 )
-                CLOSED_execution_numbers = calculate_execution_numbers(
-                    insert_candidate, replacement_label + "+CLOSED"
+                CLOSED_execution_numbers = __to_execution_numbers(
+                    CLOSED_annotation[id(insert_candidate)]
                 )
                 intersection = ACTIVATED_execution_numbers.intersection(
                     CLOSED_execution_numbers
@@ -214,7 +224,10 @@ def reinsert_frozen_subtrees(
                     insert_candidate.parent = inserted_parallel.parent
                     del inserted_parallel
                     assert insert_candidate.parent
-                    assert tree_copy_for_assert_statement == pt
+                    assert (
+                        fingerprint_for_assert_statement
+                        == get_structural_fingerprint(pt)
+                    )
                     insert_candidate = insert_candidate.parent
                     logging.debug("NEXT iteration")
 
@@ -234,13 +247,13 @@ def reinsert_frozen_subtrees(
 def post_process_tree(pt: ProcessTree, excluded_subtrees=[]) -> ProcessTree:
     tree_changed = True
     while tree_changed:
-        pt_before_post_process = copy.deepcopy(pt)
+        fingerprint_before_post_process = get_structural_fingerprint(pt)
         pt = remove_operator_node_with_one_or_no_child(
             pt, excluded_subtrees=excluded_subtrees
         )
         pt = general_tau_reduction(pt, excluded_subtrees=excluded_subtrees)
         apply_reduction_rules(pt, excluded_subtrees=excluded_subtrees)
-        if pt == pt_before_post_process:
+        if get_structural_fingerprint(pt) == fingerprint_before_post_process:
             tree_changed = False
     return get_root(pt)
 
@@ -335,16 +348,82 @@ def apply_case_0_1_inf(lca: ProcessTree, frozen: ProcessTree) -> ProcessTree:
 
 
 def calculate_execution_numbers(tree: ProcessTree, label: str) -> set:
+    return __to_execution_numbers(annotate_execution_numbers(tree, label)[id(tree)])
+
+
+def __to_execution_numbers(possible_numbers: Set) -> set:
+    # same semantics as the alignment-based checks, i.e., 1 means that the activity is replayable at least once
     res = set()
-    if activity_zero_times_replayable(tree, label):
+    if 0 in possible_numbers:
         res.add(0)
-    if activity_one_times_replayable(tree, label):
+    if 1 in possible_numbers or math.inf in possible_numbers:
         res.add(1)
-        if activity_multiple_times_replayable(tree, label):
+        if math.inf in possible_numbers:
             res.add(math.inf)
     return res
 
 
+def annotate_execution_numbers(
+    tree: ProcessTree, label: str, annotation: Dict[int, Set] = None
+) -> Dict[int, Set]:
+    """
+    Calculates bottom-up for every node of the tree how often leaves with the given label can be executed in a single
+    execution of the node, i.e., this replaces one alignment per node and execution number by a single tree traversal.
+    :param tree: process tree
+    :param label: label of the leaves to count
+    :param annotation: annotation computed so far
+    :return: dict mapping id(node) to a subset of {0, 1, math.inf}, where math.inf represents 'at least twice'
+    """
+    if annotation is None:
+        annotation = {}
+
+    for c in tree.children:
+        annotate_execution_numbers(c, label, annotation)
+    children_numbers = [annotation[id(c)] for c in tree.children]
+
+    if len(tree.children) == 0:
+        res = {1} if tree.label is not None and tree.label == label else {0}
+    elif tree.operator == Operator.XOR:
+        res = set().union(*children_numbers)
+    elif tree.operator == Operator.LOOP:
+        do_numbers = children_numbers[0]
+        redo_numbers = set().union(*children_numbers[1:])
+        res = set(do_numbers)
+        # do (redo do)*, the abstract domain is finite, i.e., the fixpoint is reached after a few iterations
+        while True:
+            extended = res.union(
+                __add_execution_numbers(
+                    __add_execution_numbers(res, redo_numbers), do_numbers
+                )
+            )
+            if extended == res:
+                break
+            res = extended
+    elif tree.operator == Operator.OR:
+        # at least one child is executed
+        res = {0}
+        for numbers in children_numbers:
+            res = __add_execution_numbers(res, numbers.union({0}))
+        if not any(0 in numbers for numbers in children_numbers):
+            res.discard(0)
+    else:
+        # sequence, parallel, interleaving: every child is executed once
+        res = {0}
+        for numbers in children_numbers:
+            res = __add_execution_numbers(res, numbers)
+
+    annotation[id(tree)] = res
+    return annotation
+
+
+def __add_execution_numbers(numbers_1: Set, numbers_2: Set) -> Set:
+    res = set()
+    for n_1 in numbers_1:
+        for n_2 in numbers_2:
+            res.add(n_1 + n_2 if n_1 + n_2 < 2 else math.inf)
+    return res
+
+
 def activity_zero_times_replayable(tree: ProcessTree, label: str) -> bool:
     # idea: align empty trace and give high model move costs for transitions with given label --> force alignment to
     # not take these transitions
@@ -33,11 +33,14 @@ from cortado_core.utils.alignment_utils import (
     is_sync_move,
     get_first_deviation,
     calculate_alignment_typed_trace,
+    alignment_contains_deviation,
+    typed_trace_fits_process_tree_by_replay,
 )
 from cortado_core.utils.deviation_solvers import (
     DeviationType,
     get_deviation_solver,
     Deviation,
+    EnclosedDeviationSolverTrace,
 )
 from cortado_core.utils.start_and_end_activities import (
     add_artificial_start_and_end_to_pt,
@@ -46,7 +49,7 @@ from cortado_core.utils.start_and_end_activities import (
     add_artificial_start_end_activity_to_typed_log,
 )
 from cortado_core.utils.sublog_utils import calculate_infix_postfix_prefix_alignment
-from cortado_core.utils.trace import TypedTrace
+from cortado_core.utils.trace import TypedTrace, trace_to_activity_tuple
 from cortado_core.utils.visualize_petri_net import visualize_petri_net
 
 DEBUG = False
@@ -92,6 +95,200 @@ def add_trace_to_pt_language(
     )
 
 
+def add_traces_to_pt_language(
+    pt: ProcessTree,
+    log: Union[EventLog, List[TypedTrace]],
+    traces: Union[EventLog, List[TypedTrace]],
+    try_pulling_lca_down=False,
+    add_artificial_start_end=True,
+    pool: Optional[multiprocessing.pool.Pool] = None,
+) -> ProcessTree:
+    """
+    Alters the given process tree such that it accepts all given traces. In contrast to calling add_trace_to_pt_language
+    for each trace, the fitness of all traces is checked at once and non-fitting traces whose first deviation has the
+    same lca are repaired together, i.e., the lca is rediscovered only once for all of them
+    :param pt: process tree to update
+    :param log: event log or list of typed traces, accepted by pt
+    :param traces: event log or list of typed traces that should be accepted by pt in the end
+    :param try_pulling_lca_down:
+    :param add_artificial_start_end:
+    :param pool: Pool to parallelize fitness checks and alignment computations, the alignments of the non-fitting full
+    traces that are computed during the fitness check are reused by the repair step
+    :return: process tree that accepts the given log and traces
+    """
+    if isinstance(log, EventLog):
+        log = __add_typing_information_to_event_log(log)
+
+    if isinstance(traces, EventLog):
+        traces = __add_typing_information_to_event_log(traces)
+
+    if len(traces) == 0:
+        return pt
+
+    art_nodes_added = add_artificial_start_end or any(
+        t.infix_type == InfixType.PREFIX or t.infix_type == InfixType.POSTFIX
+        for t in traces
+    )
+    if art_nodes_added:
+        pt = add_artificial_start_and_end_to_pt(pt)
+        traces = add_artificial_start_end_activity_to_typed_log(traces)
+        log = add_artificial_start_end_activity_to_typed_log(log)
+
+    # identical traces are checked and repaired only once
+    pending_traces: dict[tuple, list[TypedTrace]] = {}
+    for trace in traces:
+        key = (trace_to_activity_tuple(trace.trace), trace.infix_type)
+        pending_traces.setdefault(key, []).append(trace)
+    log = list(log)
+
+    while len(pending_traces) > 0:
+        # necessary, because pt_to_petri_net method is only implemented for 2-loops
+        reduce_loops_with_more_than_two_children(pt)
+        set_preorder_ids_in_tree(pt)
+
+        fitness = __check_fitness_of_traces(
+            pt, [trace_group[0] for trace_group in pending_traces.values()], pool
+        )
+        alignments = []
+        for key, (fits, alignment) in zip(list(pending_traces), fitness):
+            if fits:
+                log.extend(pending_traces.pop(key))
+            else:
+                alignments.append(alignment)
+
+        if len(pending_traces) == 0:
+            break
+
+        pt = __repair_process_tree_for_multiple_traces(
+            pt,
+            log,
+            [trace_group[0] for trace_group in pending_traces.values()],
+            alignments,
+            try_pulling_lca_down,
+            pool,
+        )
+
+    if art_nodes_added:
+        pt = remove_artificial_start_and_end_activity_leaves_from_pt(pt)
+    else:
+        apply_reduction_rules(pt)
+
+    return pt
+
+
+def __check_fitness_of_traces(
+    pt: ProcessTree,
+    traces: List[TypedTrace],
+    pool: Optional[multiprocessing.pool.Pool],
+) -> List[Tuple[bool, Optional[AlignmentResult]]]:
+    """
+    :return: whether each trace fits the process tree and the alignment of the trace if it is a non-fitting full trace
+    """
+    if pool is None:
+        return [__get_fitness_and_alignment(trace, pt) for trace in traces]
+
+    results = [
+        pool.apply_async(__get_fitness_and_alignment, args=[trace, pt])
+        for trace in traces
+    ]
+
+    # the alignments of the workers reference the nodes of copies of the tree
+    nodes = __get_nodes_by_preorder_id(pt)
+    return [
+        (fits, __map_alignment_to_tree(alignment, nodes))
+        for fits, alignment in (r.get() for r in results)
+    ]
+
+
+def __get_fitness_and_alignment(
+    trace: TypedTrace, pt: ProcessTree
+) -> Tuple[bool, Optional[AlignmentResult]]:
+    fits = typed_trace_fits_process_tree_by_replay(trace, pt)
+    if fits:
+        return True, None
+
+    alignment = calculate_alignment_typed_trace(pt, trace)
+    fits = not alignment_contains_deviation(alignment)
+    # the alignments of infixes, prefixes and postfixes contain the net of a copy of the tree, they are not reused
+    if fits or trace.infix_type != InfixType.NOT_AN_INFIX:
+        return fits, None
+
+    return False, alignment
+
+
+def __get_nodes_by_preorder_id(pt: ProcessTree) -> dict[int, ProcessTree]:
+    nodes = {pt.id: pt}
+    for child in pt.children:
+        nodes.update(__get_nodes_by_preorder_id(child))
+
+    return nodes
+
+
+def __map_alignment_to_tree(
+    alignment: Optional[AlignmentResult], nodes: dict[int, ProcessTree]
+) -> Optional[AlignmentResult]:
+    """
+    Replaces the tree nodes of the model moves of the alignment by the nodes with the same preorder ids
+    """
+    if alignment is None:
+        return None
+
+    alignment["alignment"] = [
+        (
+            (
+                (step[0][0], (nodes[step[0][1][0].id], *step[0][1][1:]))
+                if isinstance(step[0][1], tuple)
+                else step[0]
+            ),
+            step[1],
+        )
+        for step in alignment["alignment"]
+    ]
+    return alignment
+
+
+def __repair_process_tree_for_multiple_traces(
+    pt_root: ProcessTree,
+    log: List[TypedTrace],
+    traces: List[TypedTrace],
+    alignments: List[Optional[AlignmentResult]],
+    try_pulling_lca_down: bool,
+    pool: Optional[multiprocessing.pool.Pool],
+) -> ProcessTree:
+    """
+    Performs a single repair step for the given non-fitting traces. Enclosed deviations of full traces are grouped by
+    their lca and the largest group is repaired at once. If there is no such deviation, the first deviation of the
+    first trace is repaired as in the single-trace case.
+    :param alignments: alignment of each trace with the tree from the fitness check, None if it has to be computed
+    """
+    lca_groups: dict[int, list[Deviation]] = {}
+    single_repair = None
+
+    for trace, alignment in zip(traces, alignments):
+        if alignment is None:
+            alignment = calculate_alignment_typed_trace(pt_root, trace)
+        deviation = get_deviation(alignment)
+        if (
+            deviation.type == DeviationType.ENCLOSED
+            and trace.infix_type == InfixType.NOT_AN_INFIX
+        ):
+            lca, _ = EnclosedDeviationSolverTrace.get_lca(deviation, False)
+            lca_groups.setdefault(lca.id, []).append(deviation)
+        elif single_repair is None:
+            single_repair = (deviation, trace.infix_type)
+
+    if len(lca_groups) == 0:
+        deviation, infix_type = single_repair
+        solver = get_deviation_solver(deviation, infix_type, try_pulling_lca_down, pool)
+        return solver.solve(deviation, pt_root, log)
+
+    # repair the lca affected by the most traces first, ties are broken by the preorder id of the lca
+    lca_id = min(lca_groups, key=lambda i: (-len(lca_groups[i]), i))
+    solver = EnclosedDeviationSolverTrace(try_pulling_lca_down, pool)
+
+    return solver.solve_multiple(lca_groups[lca_id], pt_root, log)
+
+
 def __add_typing_information_to_event_log(log: EventLog):
     return [TypedTrace(trace, InfixType.NOT_AN_INFIX) for trace in log]
 
@@ -134,6 +331,10 @@ def __add_trace_to_pt_language(
 
         if DEBUG:
             tree_vis.view(tree_vis.apply(pt, parameters={"format": "svg"}))
+        # most traces already fit, so a cheap replay avoids the alignment computation in these cases
+        if typed_trace_fits_process_tree_by_replay(trace, pt):
+            break
+
         set_preorder_ids_in_tree(pt)
         alignment = calculate_alignment_typed_trace(pt, trace)
         if alignment["cost"] >= STD_MODEL_LOG_MOVE_COST:
@@ -21,14 +21,11 @@ from cortado_core.alignments.prefix_alignments.variants.a_star import (
     PARAM_MODEL_COST_FUNCTION,
     PARAM_TRACE_COST_FUNCTION,
 )
-from pm4py.algo.conformance.alignments.petri_net.algorithm import (
-    apply as calculate_alignment,
-    variants as variants_calculate_alignments,
-)
 
 from cortado_core.models.infix_type import InfixType
 from cortado_core.utils.alignment_utils import (
     alignment_contains_deviation,
+    alignment_step_represents_no_deviation,
     is_log_move,
     is_model_move,
     is_model_move_on_visible_activity,
@@ -36,7 +33,6 @@ from cortado_core.utils.alignment_utils import (
 )
 from cortado_core.utils.parallel_alignments import (
     calculate_alignment_a_star,
-    calculate_alignments_parallel,
 )
 from cortado_core.utils.start_and_end_activities import (
     ARTIFICIAL_END_ACTIVITY_NAME,
@@ -46,14 +42,15 @@ from cortado_core.utils.start_and_end_activities import (
 from cortado_core.utils.sublog_utils import remove_zeros_from_marking, replay_move
 from cortado_core.utils.trace import TypedTrace
 from cortado_core.utils.petri_net_utils import (
+    DistanceTable,
     get_all_distances,
     get_all_paths_between_transitions,
-    get_distances_from_transitions_to_places,
+    get_distance_table,
+    get_petri_net_fingerprint,
     get_transitions_by_label,
+    update_distance_table,
 )
 
-from more_itertools import partitions
-
 from pm4py.vis import view_petri_net, view_alignments
 import pm4py.visualization.process_tree.visualizer as tree_vis
 
@@ -104,6 +101,101 @@ class Sublog:
         return event_log
 
 
+class VariantAlignments:
+    """
+    Alignments of the variants of an event log w.r.t. a petri net that is repaired incrementally. The repair steps only
+    add new nodes to the net or remove unused ones, i.e., an alignment without deviations stays valid as long as none of
+    its transitions were touched by a repair. Hence, only deviating alignments and alignments that fire touched
+    transitions are recomputed in the next phase.
+    """
+
+    def __init__(self, log: EventLog):
+        variant_indices: Dict[Tuple[str, ...], int] = dict()
+        self.traces: List[Trace] = []
+        self.counts: List[int] = []
+        for trace in log:
+            variant = tuple(event["concept:name"] for event in trace)
+            if variant not in variant_indices:
+                variant_indices[variant] = len(self.traces)
+                self.traces.append(trace)
+                self.counts.append(0)
+            self.counts[variant_indices[variant]] += 1
+
+        self.alignments: List[Optional[AlignmentResult]] = [None] * len(self.traces)
+
+    def invalidate(self, touched_transitions: Set[PetriNet.Transition]):
+        """
+        Discards the alignments that fire at least one of the given transitions
+        """
+        touched_names = {t.name for t in touched_transitions}
+        if len(touched_names) == 0:
+            return
+
+        for i, alignment in enumerate(self.alignments):
+            if alignment is not None and any(
+                move[0][1] in touched_names for move in alignment["alignment"]
+            ):
+                self.alignments[i] = None
+
+    def align(
+        self,
+        petri_net: PetriNet,
+        initial_marking: Marking,
+        final_marking: Marking,
+        pool: Optional[Pool] = None,
+        cost_function: Optional[Callable] = None,
+    ) -> List[AlignmentResult]:
+        """
+        Returns an alignment for every variant. Cached alignments without deviations are reused, all others are
+        (re)computed, optionally using the given cost function for log and model moves.
+        :return: alignments in the same order as self.traces and self.counts
+        """
+        to_align = [
+            i
+            for i, alignment in enumerate(self.alignments)
+            if alignment is None or not alignment_fits(alignment)
+        ]
+
+        model_cost_function = None
+        if cost_function:
+            model_cost_function = {t: cost_function(t) for t in petri_net.transitions}
+
+        results = dict()
+        for i in to_align:
+            parameters = {"ret_tuple_as_trans_desc": True}
+            if cost_function:
+                parameters[PARAM_TRACE_COST_FUNCTION] = [
+                    cost_function(act) for act in self.traces[i]
+                ]
+                parameters[PARAM_MODEL_COST_FUNCTION] = model_cost_function
+
+            if pool:
+                results[i] = pool.apply_async(
+                    calculate_alignment_a_star,
+                    args=[self.traces[i], petri_net, initial_marking, final_marking],
+                    kwds={"parameters": parameters},
+                )
+            else:
+                results[i] = calculate_alignment_a_star(
+                    self.traces[i],
+                    petri_net,
+                    initial_marking,
+                    final_marking,
+                    parameters,
+                )
+
+        for i, result in results.items():
+            self.alignments[i] = result.get() if pool else result
+
+        return list(self.alignments)
+
+
+def alignment_fits(alignment: AlignmentResult) -> bool:
+    return all(
+        alignment_step_represents_no_deviation(move) for move in alignment["alignment"]
+    )
+
+
 def induced_subnet(
     full_petri_net: PetriNet, inducing_transitions: set[PetriNet.Transition]
 ) -> Tuple[PetriNet, Marking, Marking]:
@@ -146,15 +238,20 @@ def induced_subnet(
 
 def add_parallel_silent_transitions(
     petri_net: PetriNet, trans_to_be_skipped: Set[PetriNet.Transition]
-):
+) -> Set[PetriNet.Transition]:
+    fingerprint = get_petri_net_fingerprint(petri_net)
+    added_transitions: Set[PetriNet.Transition] = set()
     for skipped_trans in trans_to_be_skipped:
         tau = petri_utils.add_transition(petri_net, str(uuid4()))
+        added_transitions.add(tau)
         pre_set = petri_utils.pre_set(skipped_trans)
         post_set = petri_utils.post_set(skipped_trans)
         for place in pre_set:
             petri_utils.add_arc_from_to(place, tau, petri_net)
         for place in post_set:
             petri_utils.add_arc_from_to(tau, place, petri_net)
+    update_distance_table(fingerprint, petri_net, added_transitions)
+    return added_transitions
 
 
 def repair_for_loops(
@@ -163,29 +260,24 @@ def repair_for_loops(
     final_marking: Marking,
     log: EventLog,
     pool: Optional[Pool] = None,
-):
-    if pool:
-        alignments = calculate_alignments_parallel(
-            log,
-            petri_net,
-            initial_marking,
-            final_marking,
-            parameters={"ret_tuple_as_trans_desc": True},
-            pool=pool,
-        )
-    else:
-        alignments = calculate_alignment(
-            log,
-            petri_net,
-            initial_marking,
-            final_marking,
-            parameters={"ret_tuple_as_trans_desc": True},
-        )
+    variant_alignments: Optional[VariantAlignments] = None,
+) -> Set[PetriNet.Transition]:
+    """
+    Adds loops to the petri net for sublogs of log moves that can be replayed on a part of the net
+    :return: the transitions that were added or modified by the repair
+    """
+    if variant_alignments is None:
+        variant_alignments = VariantAlignments(log)
+    alignments = variant_alignments.align(
+        petri_net, initial_marking, final_marking, pool=pool
+    )
 
     subtraces: Set[Subtrace] = set()
 
     for alignment in alignments:
         if alignment_contains_deviation(alignment):
+            # the alignment is modified in place, so the cached one must not be touched
+            alignment = deepcopy(alignment)
             if not validate_iteration_preserving_alignment(alignment):
                 alignment = make_alignment_iteration_preserving(alignment)
             assert validate_iteration_preserving_alignment(alignment)
@@ -196,7 +288,7 @@ def repair_for_loops(
     sublogs = group_into_aligned_sublogs(subtraces)
     sublogs = pick_relevant_locations(sublogs)
 
-    add_loops(petri_net, sublogs, pool=pool)
+    return add_loops(petri_net, sublogs, pool=pool)
 
 
 def repair_for_subprocess_and_skipped_events(
@@ -205,51 +297,31 @@ def repair_for_subprocess_and_skipped_events(
     final_marking: Marking,
     log: EventLog,
     pool: Optional[Pool] = None,
-):
+    variant_alignments: Optional[VariantAlignments] = None,
+) -> Set[PetriNet.Transition]:
+    """
+    Inserts subprocesses for the sublogs of log moves and silent transitions to skip transitions
+    :return: the transitions that were added or modified by the repair
+    """
+    if variant_alignments is None:
+        variant_alignments = VariantAlignments(log)
+
     global_cost_function = get_global_cost_function(
-        petri_net, initial_marking, final_marking, log, pool=pool
+        petri_net,
+        initial_marking,
+        final_marking,
+        log,
+        pool=pool,
+        variant_alignments=variant_alignments,
     )
 
-    alignments = []
-    for trace in log:
-        if pool:
-            alignment = pool.apply_async(
-                calculate_alignment_a_star,
-                args=[trace, petri_net, initial_marking, final_marking],
-                kwds={
-                    "parameters": {
-                        "ret_tuple_as_trans_desc": True,
-                        PARAM_TRACE_COST_FUNCTION: [
-                            global_cost_function(act) for act in trace
-                        ],
-                        PARAM_MODEL_COST_FUNCTION: {
-                            t: global_cost_function(t) for t in petri_net.transitions
-                        },
-                    }
-                },
-            )
-        else:
-            alignment = calculate_alignment(
-                trace,
-                petri_net,
-                initial_marking,
-                final_marking,
-                parameters={
-                    "ret_tuple_as_trans_desc": True,
-                    PARAM_TRACE_COST_FUNCTION: [
-                        global_cost_function(act) for act in trace
-                    ],
-                    PARAM_MODEL_COST_FUNCTION: {
-                        t: global_cost_function(t) for t in petri_net.transitions
-                    },
-                },
-                variant=variants_calculate_alignments.state_equation_a_star,
-            )
-
-        alignments.append(alignment)
-
-    if pool:
-        alignments = [async_result.get() for async_result in alignments]
+    alignments = variant_alignments.align(
+        petri_net,
+        initial_marking,
+        final_marking,
+        pool=pool,
+        cost_function=global_cost_function,
+    )
 
     subtraces: Set[Subtrace] = set()
     skipped_transitions: Set[PetriNet.Transition] = set()
@@ -263,10 +335,14 @@ def repair_for_subprocess_and_skipped_events(
     sublogs = group_into_aligned_sublogs(subtraces)
     sublogs = pick_relevant_locations(sublogs)
 
-    add_parallel_silent_transitions(petri_net, skipped_transitions)
+    touched_transitions = add_parallel_silent_transitions(
+        petri_net, skipped_transitions
+    )
 
     for sublog in sublogs:
-        repair_model_at_location(petri_net, sublog)
+        touched_transitions.update(repair_model_at_location(petri_net, sublog))
+
+    return touched_transitions
 
 
 def remove_infrequent_nodes(
@@ -276,50 +352,50 @@ def remove_infrequent_nodes(
     log: EventLog,
     threshold: float = 0,
     pool: Optional[Pool] = None,
-):
+    variant_alignments: Optional[VariantAlignments] = None,
+) -> Set[PetriNet.Transition]:
+    """
+    Removes the places and transitions that are used by at most threshold traces of the log
+    :return: the transitions that were removed or lost an arc
+    """
     if threshold < 0:
         raise ValueError("threshold has to be greater or equal to 0.")
-    if pool:
-        alignments = calculate_alignments_parallel(
-            log,
-            petri_net,
-            initial_marking,
-            final_marking,
-            parameters={"ret_tuple_as_trans_desc": True},
-            pool=pool,
-        )
-    else:
-        alignments = calculate_alignment(
-            log,
-            petri_net,
-            initial_marking,
-            final_marking,
-            parameters={"ret_tuple_as_trans_desc": True},
-        )
+    if variant_alignments is None:
+        variant_alignments = VariantAlignments(log)
+    alignments = variant_alignments.align(
+        petri_net, initial_marking, final_marking, pool=pool
+    )
 
     place_counter = Counter(initial_marking)
     transition_counter = Counter()
-    for alignment in alignments:
+    for alignment, count in zip(alignments, variant_alignments.counts):
         assert not alignment_contains_deviation(alignment)
         for move in alignment["alignment"]:
             transition = petri_utils.get_transition_by_name(petri_net, move[0][1])
             assert transition is not None
-            transition_counter[transition] += 1
+            transition_counter[transition] += count
             for place in petri_utils.post_set(transition):
-                place_counter[place] += 1
+                place_counter[place] += count
+
+    touched_transitions: Set[PetriNet.Transition] = set()
     for infrequent_place in [
         place for place in petri_net.places if place_counter[place] <= threshold
     ]:
+        touched_transitions.update(petri_utils.pre_set(infrequent_place))
+        touched_transitions.update(petri_utils.post_set(infrequent_place))
         petri_utils.remove_place(petri_net, infrequent_place)
     for infrequent_transition in [
         transition
         for transition in petri_net.transitions
         if transition_counter[transition] <= threshold
     ]:
+        touched_transitions.add(infrequent_transition)
         petri_utils.remove_transition(petri_net, infrequent_transition)
     if __debug__ and SHOW_VISUALIZATIONS:
         view_petri_net(petri_net, initial_marking, final_marking)
 
+    return touched_transitions
+
 
 def get_global_cost_function(
     petri_net: PetriNet,
@@ -327,32 +403,21 @@ def get_global_cost_function(
     final_marking: Marking,
     log: EventLog,
     pool: Optional[Pool] = None,
+    variant_alignments: Optional[VariantAlignments] = None,
 ):
-    if pool:
-        alignments = calculate_alignments_parallel(
-            log,
-            petri_net,
-            initial_marking,
-            final_marking,
-            parameters={"ret_tuple_as_trans_desc": True},
-            pool=pool,
-        )
-    else:
-        alignments = calculate_alignment(
-            log,
-            petri_net,
-            initial_marking,
-            final_marking,
-            parameters={"ret_tuple_as_trans_desc": True},
-        )
+    if variant_alignments is None:
+        variant_alignments = VariantAlignments(log)
+    alignments = variant_alignments.align(
+        petri_net, initial_marking, final_marking, pool=pool
+    )
     log_move_counter = Counter()
     model_move_counter = Counter()
-    for alignment in alignments:
+    for alignment, count in zip(alignments, variant_alignments.counts):
         for move in alignment["alignment"]:
             if is_log_move(move):
-                log_move_counter[move[1][0]] += 1
+                log_move_counter[move[1][0]] += count
             elif is_model_move(move):
-                model_move_counter[move[0][1]] += 1
+                model_move_counter[move[0][1]] += count
     if len(log_move_counter) > 0 and len(model_move_counter) > 0:
         devMax = max(*log_move_counter.values(), *model_move_counter.values())
     elif len(model_move_counter) > 0:
@@ -390,31 +455,41 @@ def repair_petri_net_with_log(
     :param pool: Pool to parallelize alignment computations
     :return: process model that accepts the given log
     """
-
-    repair_for_loops(petri_net, initial_marking, final_marking, log, pool=pool)
-    repair_for_subprocess_and_skipped_events(
-        petri_net, initial_marking, final_marking, log, pool=pool
+    # all phases work on the variants of the log and share their alignments
+    variant_alignments = VariantAlignments(log)
+
+    touched_transitions = repair_for_loops(
+        petri_net,
+        initial_marking,
+        final_marking,
+        log,
+        pool=pool,
+        variant_alignments=variant_alignments,
+    )
+    variant_alignments.invalidate(touched_transitions)
+    touched_transitions = repair_for_subprocess_and_skipped_events(
+        petri_net,
+        initial_marking,
+        final_marking,
+        log,
+        pool=pool,
+        variant_alignments=variant_alignments,
+    )
+    variant_alignments.invalidate(touched_transitions)
+    touched_transitions = remove_infrequent_nodes(
+        petri_net,
+        initial_marking,
+        final_marking,
+        log,
+        pool=pool,
+        variant_alignments=variant_alignments,
     )
-    remove_infrequent_nodes(petri_net, initial_marking, final_marking, log, pool=pool)
+    variant_alignments.invalidate(touched_transitions)
 
     if __debug__:
-        if pool:
-            final_alignments = calculate_alignments_parallel(
-                log,
-                petri_net,
-                initial_marking,
-                final_marking,
-                parameters={"ret_tuple_as_trans_desc": True},
-                pool=pool,
-            )
-        else:
-            final_alignments = calculate_alignment(
-                log,
-                petri_net,
-                initial_marking,
-                final_marking,
-                parameters={"ret_tuple_as_trans_desc": True},
-            )
+        final_alignments = variant_alignments.align(
+            petri_net, initial_marking, final_marking, pool=pool
+        )
 
         for alignment in final_alignments:
             assert not alignment_contains_deviation(alignment)
@@ -424,115 +499,146 @@ def add_loops(
     petri_net: PetriNet,
     sublogs: Set[Sublog],
     pool: Optional[Pool] = None,
-):
+) -> Set[PetriNet.Transition]:
     # Find the body of a loop that contains all transitions related to log moves
     # in the given loop hypotheses. The loop body consists of all transitions given
     # in the log moves, their pre- and post-places, and all nodes of the net that
     # lie on a path between any two of the given transitions.
     # The loop hypotheses is then tested. If it can replay the sublog, a transition is
     # added to the petri_net.
+    # All hypotheses are built on the unmodified net, i.e., they are independent and can be validated in parallel.
+    # Only the small loop bodies are sent to the pool, not the full net and its distance table.
     petri_net_unmodified = deepcopy(petri_net)
-    distances_transitions_to_places = get_distances_from_transitions_to_places(
-        petri_net_unmodified
-    )
+    distance_table = get_distance_table(petri_net_unmodified)
+
+    hypotheses = []
+    results = []
     for sublog in sublogs:
-        T_s = set()
-        for trace in sublog.log:
-            for activity_label in set(trace.trace):
-                transition_candidates = get_transitions_by_label(
-                    petri_net_unmodified, activity_label
-                )
-                # find transition with minimal distance to a place from the location of the log
-                shortest_distance_to_loop_exit = math.inf
-                transition_closest_to_loop_exit = None
-                for transition in transition_candidates:
-                    distances = distances_transitions_to_places[transition]
-                    distance_to_loop_exit = math.inf
-                    for loop_exit_place in sublog.location:
-                        distance_to_loop_exit = min(
-                            distance_to_loop_exit, distances[loop_exit_place.name]
-                        )
-                    if distance_to_loop_exit < shortest_distance_to_loop_exit:
-                        shortest_distance_to_loop_exit = distance_to_loop_exit
-                        transition_closest_to_loop_exit = transition
-                if transition_closest_to_loop_exit:
-                    T_s.add(transition_closest_to_loop_exit)
-        if (len(T_s)) == 0:
+        hypothesis = build_loop_hypothesis(petri_net_unmodified, sublog, distance_table)
+        if hypothesis is None:
             continue
+        hypotheses.append(hypothesis)
+        args = [*hypothesis, sublog.to_event_log()]
+        if pool:
+            results.append(pool.apply_async(validate_loop_hypothesis, args))
         else:
-            for t1, t2 in combinations(T_s, 2):
-                for vertex in get_all_paths_between_transitions(
-                    petri_net_unmodified, t1, t2
-                ):
-                    if type(vertex) is PetriNet.Transition:
-                        T_s.add(vertex)
-        subnet, subnet_im, subnet_fm = induced_subnet(petri_net_unmodified, T_s)
+            results.append(validate_loop_hypothesis(*args))
 
-        loop_back = petri_utils.add_transition(subnet, str(uuid4()))
-        for p in subnet_im:
-            petri_utils.add_arc_from_to(loop_back, p, subnet)
-        for p in subnet_fm:
-            petri_utils.add_arc_from_to(p, loop_back, subnet)
+    if pool:
+        results = [async_result.get() for async_result in results]
 
-        if __debug__ and SHOW_VISUALIZATIONS:
-            view_petri_net(subnet, subnet_im, subnet_fm)
+    # apply the accepted loops in a deterministic order, independent of the order of the sublogs and the workers
+    accepted_loops = sorted(
+        (
+            tuple(sorted(p.name for p in subnet_im)),
+            tuple(sorted(p.name for p in subnet_fm)),
+        )
+        for (_, subnet_im, subnet_fm), accepted in zip(hypotheses, results)
+        if accepted
+    )
 
-        alignments = []
-        for trace in sublog.to_event_log():
-            if pool:
-                alignment = pool.apply_async(
-                    calculate_alignment_a_star,
-                    args=[trace, subnet, subnet_im, subnet_fm],
-                    kwds={
-                        "parameters": {
-                            "ret_tuple_as_trans_desc": True,
-                            # high cost for all log moves and zero cost for all model moves
-                            # s.t. log moves are avoided if possible
-                            PARAM_TRACE_COST_FUNCTION: [100] * len(trace),
-                            PARAM_MODEL_COST_FUNCTION: {
-                                t: 0 for t in subnet.transitions
-                            },
-                        }
-                    },
-                )
-            else:
-                alignment = calculate_alignment(
-                    trace,
-                    subnet,
-                    subnet_im,
-                    subnet_fm,
-                    parameters={
-                        "ret_tuple_as_trans_desc": True,
-                        # high cost for all log moves and zero cost for all model moves
-                        # s.t. log moves are avoided if possible
-                        PARAM_TRACE_COST_FUNCTION: [100] * len(trace),
-                        PARAM_MODEL_COST_FUNCTION: {t: 0 for t in subnet.transitions},
-                    },
-                    variant=variants_calculate_alignments.state_equation_a_star,
-                )
+    added_transitions: Set[PetriNet.Transition] = set()
+    places_by_name = {place.name: place for place in petri_net.places}
+    for loop_start_place_names, loop_end_place_names in accepted_loops:
+        loop_back = petri_utils.add_transition(petri_net, str(uuid4()))
+        added_transitions.add(loop_back)
+        for place_name in loop_start_place_names:
+            petri_utils.add_arc_from_to(
+                loop_back, places_by_name[place_name], petri_net
+            )
+        for place_name in loop_end_place_names:
+            petri_utils.add_arc_from_to(
+                places_by_name[place_name], loop_back, petri_net
+            )
 
-            alignments.append(alignment)
+    if __debug__ and SHOW_VISUALIZATIONS:
+        view_petri_net(petri_net)
 
-        if pool:
-            alignments = [async_result.get() for async_result in alignments]
-
-        no_log_moves_in_alignments = True
-        for alignment in alignments:
-            log_moves = [move for move in alignment["alignment"] if is_log_move(move)]
-            if len(log_moves) > 0:
-                no_log_moves_in_alignments = False
-
-        if no_log_moves_in_alignments:
-            loop_back = petri_utils.add_transition(petri_net, str(uuid4()))
-            for p in subnet_im:
-                p = {place for place in petri_net.places if place.name == p.name}.pop()
-                petri_utils.add_arc_from_to(loop_back, p, petri_net)
-            for p in subnet_fm:
-                p = {place for place in petri_net.places if place.name == p.name}.pop()
-                petri_utils.add_arc_from_to(p, loop_back, petri_net)
+    return added_transitions
+
+
+def build_loop_hypothesis(
+    petri_net: PetriNet, sublog: Sublog, distance_table: DistanceTable
+) -> Optional[Tuple[PetriNet, Marking, Marking]]:
+    """
+    Builds the loop body for the sublog and closes it with a loop-back transition.
+    :param petri_net: unmodified petri net
+    :param sublog: sublog of log moves
+    :param distance_table: distance table of the petri net
+    :return: the loop body as a separate petri net with its initial and final marking, None if no transition of the
+    net is related to the sublog
+    """
+    T_s = set()
+    for trace in sublog.log:
+        for activity_label in set(trace.trace):
+            transition_candidates = get_transitions_by_label(petri_net, activity_label)
+            # find transition with minimal distance to a place from the location of the log
+            shortest_distance_to_loop_exit = math.inf
+            transition_closest_to_loop_exit = None
+            for transition in transition_candidates:
+                distance_to_loop_exit = math.inf
+                for loop_exit_place in sublog.location:
+                    distance_to_loop_exit = min(
+                        distance_to_loop_exit,
+                        distance_table.get_distance(
+                            transition.name, loop_exit_place.name
+                        ),
+                    )
+                if distance_to_loop_exit < shortest_distance_to_loop_exit:
+                    shortest_distance_to_loop_exit = distance_to_loop_exit
+                    transition_closest_to_loop_exit = transition
+            if transition_closest_to_loop_exit:
+                T_s.add(transition_closest_to_loop_exit)
+    if (len(T_s)) == 0:
+        return None
+    else:
+        for t1, t2 in combinations(T_s, 2):
+            for vertex in get_all_paths_between_transitions(petri_net, t1, t2):
+                if type(vertex) is PetriNet.Transition:
+                    T_s.add(vertex)
+    subnet, subnet_im, subnet_fm = induced_subnet(petri_net, T_s)
+
+    loop_back = petri_utils.add_transition(subnet, str(uuid4()))
+    for p in subnet_im:
+        petri_utils.add_arc_from_to(loop_back, p, subnet)
+    for p in subnet_fm:
+        petri_utils.add_arc_from_to(p, loop_back, subnet)
 
     if __debug__ and SHOW_VISUALIZATIONS:
-        view_petri_net(petri_net)
+        view_petri_net(subnet, subnet_im, subnet_fm)
+
+    return subnet, subnet_im, subnet_fm
+
+
+def validate_loop_hypothesis(
+    subnet: PetriNet, subnet_im: Marking, subnet_fm: Marking, sublog: EventLog
+) -> bool:
+    """
+    Checks if the loop body can replay the sublog without log moves.
+    :param subnet: loop body with loop-back transition
+    :param subnet_im: initial marking of the loop body
+    :param subnet_fm: final marking of the loop body
+    :param sublog: event log of the sublog
+    :return: True if the hypothesis is accepted, False otherwise
+    """
+    for trace in sublog:
+        alignment = calculate_alignment_a_star(
+            trace,
+            subnet,
+            subnet_im,
+            subnet_fm,
+            parameters={
+                "ret_tuple_as_trans_desc": True,
+                # high cost for all log moves and zero cost for all model moves
+                # s.t. log moves are avoided if possible
+                PARAM_TRACE_COST_FUNCTION: [100] * len(trace),
+                PARAM_MODEL_COST_FUNCTION: {t: 0 for t in subnet.transitions},
+            },
+        )
+        if any(is_log_move(move) for move in alignment["alignment"]):
+            return False
+
+    return True
 
 
 def insert_submodel(
@@ -541,7 +647,9 @@ def insert_submodel(
     submodel_start: Optional[PetriNet.Transition],
     submodel_end: Optional[PetriNet.Transition],
     location: Set[PetriNet.Place],
-):
+) -> Set[PetriNet.Transition]:
+    fingerprint = get_petri_net_fingerprint(petri_net)
+
     # rename submodel places
     used_p_names = {p.name for p in petri_net.places}
     place_number = len(petri_net.places)
@@ -561,8 +669,13 @@ def insert_submodel(
         if submodel_end:
             petri_utils.add_arc_from_to(submodel_end, place, petri_net)
 
+    update_distance_table(fingerprint, petri_net, submodel.transitions)
+    return set(submodel.transitions)
 
-def repair_model_at_location(petri_net: PetriNet, sublog: Sublog):
+
+def repair_model_at_location(
+    petri_net: PetriNet, sublog: Sublog
+) -> Set[PetriNet.Transition]:
     sublog.log = add_artificial_start_and_end_activity_to_Log(sublog.to_event_log())
     subnet, subnet_im, subnet_fm = discover_petri_net_inductive(sublog.log)
 
@@ -580,7 +693,7 @@ def repair_model_at_location(petri_net: PetriNet, sublog: Sublog):
     for place in petri_utils.post_set(subnet_end):
         petri_utils.remove_place(subnet, place)
 
-    insert_submodel(petri_net, subnet, subnet_start, subnet_end, sublog.location)
+    return insert_submodel(petri_net, subnet, subnet_start, subnet_end, sublog.location)
 
 
 def get_subtraces(
@@ -639,78 +752,141 @@ def align_subtraces(
     Implementation of algorithm 5.
     Group subtraces into sets based on their shared activities ignoring ordering.
     """
+    activity_sets: Dict[Tuple[str], FrozenSet[str]] = dict()
+
+    def _get_activities(trace: Tuple[str]) -> FrozenSet[str]:
+        if trace not in activity_sets:
+            activity_sets[trace] = frozenset(trace)
+        return activity_sets[trace]
 
     def _are_similar(
         trace1: Tuple[str], trace2: Tuple[str], similiarty_threshold: float
     ):
-        intersection: Set[str] = set(trace1).intersection(set(trace2))
+        intersection: Set[str] = _get_activities(trace1).intersection(
+            _get_activities(trace2)
+        )
         return (
             len(intersection) / len(trace1) >= similiarty_threshold
             and len(intersection) / len(trace2) >= similiarty_threshold
         )
 
+    # multiset of the traces of all current subtraces and an inverted index from the first activity to these traces
+    known_traces: Counter = Counter()
+    traces_by_first_activity: Dict[str, Set[Tuple[str]]] = dict()
+
+    def _add_subtrace(subtrace: Subtrace):
+        if subtrace in subtraces:
+            return
+        subtraces.add(subtrace)
+        known_traces[subtrace.trace] += 1
+        traces_by_first_activity.setdefault(subtrace.trace[0], set()).add(
+            subtrace.trace
+        )
+
+    def _remove_subtrace(subtrace: Subtrace):
+        subtraces.remove(subtrace)
+        known_traces[subtrace.trace] -= 1
+        if known_traces[subtrace.trace] == 0:
+            del known_traces[subtrace.trace]
+            traces_by_first_activity[subtrace.trace[0]].remove(subtrace.trace)
+
+    for subtrace in subtraces:
+        known_traces[subtrace.trace] += 1
+        traces_by_first_activity.setdefault(subtrace.trace[0], set()).add(
+            subtrace.trace
+        )
+
     n_max = max([*map(lambda t: len(t), subtraces), 0])
     for n in range(n_max, 0, -1):
         for subtrace in [sub for sub in subtraces if len(sub) == n]:
+            trace = subtrace.trace
+            # split trace into b0, b1, b2 s.t. b1 is a known subtrace, i.e., only the positions at which a known
+            # subtrace occurs as a contiguous block are candidates
             candidates = []
-            for partition in partitions(subtrace.trace):
-                partition = [tuple(p) for p in partition]
-                if len(partition) == 1:
-                    candidates.append(((), *partition, ()))
-                elif len(partition) == 3:
-                    candidates.append(partition)
-                elif len(partition) == 2:
-                    candidates.append((*partition, ()))
-                    candidates.append(((), *partition))
-
-            # sort for getting maximal length b1 with original subtrace and b1 being dissimilar
-            for b0, b1, b2 in sorted(
-                candidates, key=lambda part: len(part[1]), reverse=True
+            for i in range(n):
+                for known_trace in traces_by_first_activity.get(trace[i], ()):
+                    j = i + len(known_trace)
+                    if j <= n and trace[i:j] == known_trace:
+                        candidates.append((i, j))
+
+            # sort for getting maximal length b1 with original subtrace and b1 being dissimilar, ties are resolved in
+            # the order in which the partitions of the trace are enumerated
+            for i, j in sorted(
+                candidates,
+                key=lambda c: (-(c[1] - c[0]), __get_partition_rank(c[0], c[1], n)),
             ):
-                if _are_similar(subtrace.trace, b1, similiarty_threshold):
+                b0, b1, b2 = trace[:i], trace[i:j], trace[j:]
+                if _are_similar(trace, b1, similiarty_threshold):
                     continue
-                if b1 in list(map(lambda sub: sub.trace, subtraces)):
-                    subtraces.remove(subtrace)
-                    if len(b0) > 0:
-                        subtraces.add(
-                            Subtrace(
-                                b0, subtrace.location, subtrace.previous_last_place
-                            )
-                        )
-                    if len(b1) > 0:
-                        subtraces.add(
-                            Subtrace(
-                                b1, subtrace.location, subtrace.previous_last_place
-                            )
-                        )
-                    if len(b2) > 0:
-                        subtraces.add(
-                            Subtrace(
-                                b2, subtrace.location, subtrace.previous_last_place
+                if b1 in known_traces:
+                    _remove_subtrace(subtrace)
+                    for block in [b0, b1, b2]:
+                        if len(block) > 0:
+                            _add_subtrace(
+                                Subtrace(
+                                    block,
+                                    subtrace.location,
+                                    subtrace.previous_last_place,
+                                )
                             )
-                        )
                     break
 
-    # group subtraces into equivalence classes w.r.t. similarity
+    # group subtraces into equivalence classes w.r.t. similarity. A subtrace can only be similar to another one if they
+    # share an activity, so only the classes in which every member shares an activity with the subtrace are checked
     res: List[List[Subtrace]] = []
+    class_members_by_activity: Dict[str, Set[Tuple[int, int]]] = dict()
     for subtrace in subtraces:
-        eq_class_found = False
-        for eq_class in res:
-            eq_match = True
-            for other_subtrace in eq_class:
-                if not _are_similar(
-                    subtrace.trace, other_subtrace.trace, similiarty_threshold
-                ):
-                    eq_match = False
-            if eq_match:
-                eq_class.append(subtrace)
-                eq_class_found = True
+        hit_members: Dict[int, Set[int]] = dict()
+        for activity in _get_activities(subtrace.trace):
+            for class_index, member_index in class_members_by_activity.get(
+                activity, ()
+            ):
+                hit_members.setdefault(class_index, set()).add(member_index)
+
+        if similiarty_threshold > 0:
+            candidate_classes = [
+                class_index
+                for class_index in sorted(hit_members)
+                if len(hit_members[class_index]) == len(res[class_index])
+            ]
+        else:
+            candidate_classes = range(len(res))
+
+        eq_class_index = None
+        for class_index in candidate_classes:
+            eq_class = res[class_index]
+            if all(
+                _are_similar(subtrace.trace, other_subtrace.trace, similiarty_threshold)
+                for other_subtrace in eq_class
+            ):
+                eq_class_index = class_index
                 break
-        if not eq_class_found:
-            res.append([subtrace])
+
+        if eq_class_index is None:
+            eq_class_index = len(res)
+            res.append([])
+        for activity in _get_activities(subtrace.trace):
+            class_members_by_activity.setdefault(activity, set()).add(
+                (eq_class_index, len(res[eq_class_index]))
+            )
+        res[eq_class_index].append(subtrace)
     return {frozenset(eq_class) for eq_class in res}
 
 
+def __get_partition_rank(i: int, j: int, n: int) -> Tuple[int, ...]:
+    """
+    Returns the position of the split (trace[:i], trace[i:j], trace[j:]) in the order in which the partitions of a trace
+    of length n into at most three contiguous blocks are enumerated
+    """
+    if i == 0 and j == n:
+        return (0,)
+    if j == n:
+        return 1, i, 0
+    if i == 0:
+        return 1, j, 1
+    return 2, i, j
+
+
 def group_into_sublogs(subtraces: FrozenSet[Subtrace]):
     """
     Implementation of algorithm 6.
@@ -1,7 +1,12 @@
-import statistics
+from typing import Optional
 
 import numpy as np
 
+from cortado_core.performance.sketches import StatsSketch, to_float_array
+
+# if True, stats approximates the median and the percentiles with a mergeable sketch instead of sorting all values
+USE_STATS_SKETCHES = False
+
 
 def avg(values):
     if values is None:
@@ -16,28 +21,38 @@ def index(values):
     return {i: v for (i, v) in enumerate(values) if v is not None}
 
 
-def stats(values):
+def stats(values, use_sketch: Optional[bool] = None):
+    """
+    Aggregates the values (list or float array, None/NaN values are ignored) with a single pass of numpy reductions
+    :param use_sketch: if True, the statistics are computed with a StatsSketch (exact counts and moments, approximated
+    median and percentiles), defaults to USE_STATS_SKETCHES
+    """
     if values is None:
         return None
+    if use_sketch is None:
+        use_sketch = USE_STATS_SKETCHES
+    if use_sketch:
+        return StatsSketch().update(values).to_stats()
+
     n = len(values)
-    values = [v for v in values if v is not None]
-    if values:
+    values = to_float_array(values)
+    if values.size > 0:
+        mean = float(values.mean())
+        percentile_50, percentile_95 = np.percentile(values, [50, 95])
         stats = {
-            "min": min(values, default=None),
-            "max": max(values, default=None),
-            "mean": statistics.mean(values),
-            "median": statistics.median(values),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "mean": mean,
+            "median": float(percentile_50),
             "n": n,
-            "n_not_none": len(values),
-            "50th": np.percentile(values, 50),
-            "95th": np.percentile(values, 95),
+            "n_not_none": int(values.size),
+            "50th": float(percentile_50),
+            "95th": float(percentile_95),
         }
-        if len(values) > 1:
-            stats["stdev"] = statistics.stdev(values)
+        if values.size > 1:
+            stats["stdev"] = float(values.std(ddof=1))
             if stats["mean"] != 0:
-                stats["percentage_variance"] = (
-                    statistics.stdev(values) / statistics.mean(values)
-                ) * 100
+                stats["percentage_variance"] = (stats["stdev"] / mean) * 100
         else:
             stats["stdev"] = 0
             stats["percentage_variance"] = 0
@@ -46,6 +61,10 @@ def stats(values):
         return None
 
 
+def sketch_stats(values):
+    return stats(values, use_sketch=True)
+
+
 def stat_stats(stats_list):
     if stats_list is None:
         return None
@@ -64,3 +83,32 @@ def stat_stats(stats_list):
 
 def noop(values):
     return values
+
+
+def segment_sum(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Sums the segments values[offsets[i]:offsets[i + 1]], empty segments sum up to 0
+    """
+    res = np.zeros(len(offsets) - 1, dtype=np.float64)
+    non_empty = offsets[1:] > offsets[:-1]
+    if non_empty.any():
+        res[non_empty] = np.add.reduceat(values, offsets[:-1][non_empty])
+    return res
+
+
+def segmented_avg(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Segmented version of avg, i.e., NaN values are ignored and the average of a segment without values is NaN
+    """
+    valid = ~np.isnan(values)
+    sums = segment_sum(np.where(valid, values, 0), offsets)
+    counts = segment_sum(valid.astype(np.float64), offsets)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+# aggregators that can be applied to all segments of a float array at once
+SEGMENTED_AGGREGATORS = {avg: segmented_avg}
+
+# aggregators that accept float arrays (NaN for None) instead of lists
+ARRAY_AGGREGATORS = {stats, sketch_stats}
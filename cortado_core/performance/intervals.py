@@ -0,0 +1,253 @@
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, Iterable
+
+import numpy as np
+from pm4py.objects.log.util.xes import (
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+)
+from pm4py.util.xes_constants import DEFAULT_NAME_KEY
+
+from cortado_core.performance.aggregators import segment_sum
+from cortado_core.utils.timestamp_utils import TimeUnit
+
+Interval = Tuple[Optional[datetime], Optional[datetime]]
+
+
+class IntervalColumns:
+    """
+    Columnar representation of the intervals of a tree node, i.e., of the nested lists
+    case -> alignment -> instance -> interval(s) returned by compute_performances_intervals.
+    The bounds of all intervals are stored in two flat arrays (datetime64 or float64, missing bounds are NaT/NaN) and the
+    nesting is represented by offset arrays:
+    - interval_offsets: intervals of the i-th instance are interval_offsets[i]:interval_offsets[i + 1]
+    - alignment_offsets: instances of the i-th alignment are alignment_offsets[i]:alignment_offsets[i + 1]
+    - case_offsets: alignments of the i-th case are case_offsets[i]:case_offsets[i + 1]
+    Cases without alignments (None) are skipped, alignments without instances (None) are marked in alignment_valid.
+    """
+
+    def __init__(self, values: List):
+        starts = []
+        ends = []
+        interval_offsets = [0]
+        alignment_offsets = [0]
+        alignment_valid = []
+        case_offsets = [0]
+
+        for alignments in values:
+            if alignments is None:
+                continue
+            for instances in alignments:
+                alignment_valid.append(instances is not None)
+                if instances is not None:
+                    # same distinction as decide_aggregator: an instance is either a list of intervals or an interval
+                    multi = instances[0] == [] or type(instances[0][0]) == list
+                    for instance in instances:
+                        for interval in instance if multi else [instance]:
+                            starts.append(interval[0])
+                            ends.append(interval[1])
+                        interval_offsets.append(len(starts))
+                alignment_offsets.append(len(interval_offsets) - 1)
+            case_offsets.append(len(alignment_valid))
+
+        self.starts, self.ends = to_columns(starts, ends)
+        self.interval_offsets = np.array(interval_offsets, dtype=np.int64)
+        self.alignment_offsets = np.array(alignment_offsets, dtype=np.int64)
+        self.alignment_valid = np.array(alignment_valid, dtype=bool)
+        self.case_offsets = np.array(case_offsets, dtype=np.int64)
+
+    def get_interval_lengths(self) -> np.ndarray:
+        """
+        Returns the length of every interval in seconds (or in the unit of numeric bounds), NaN if a bound is missing
+        """
+        if self.starts.dtype.kind == "M":
+            return (self.ends - self.starts) / np.timedelta64(1, "s")
+        return self.ends - self.starts
+
+    def get_instance_values(self) -> np.ndarray:
+        """
+        Returns the summed interval length of every instance, NaN if no interval of the instance has both bounds
+        """
+        lengths = self.get_interval_lengths()
+        valid = ~np.isnan(lengths)
+        sums = segment_sum(np.where(valid, lengths, 0), self.interval_offsets)
+        counts = segment_sum(valid.astype(np.float64), self.interval_offsets)
+        return np.where(counts > 0, sums, np.nan)
+
+
+def to_columns(starts: List, ends: List) -> Tuple[np.ndarray, np.ndarray]:
+    bounds = [b for b in starts + ends if b is not None]
+    if len(bounds) > 0 and isinstance(bounds[0], datetime):
+        return to_datetime64(starts), to_datetime64(ends)
+    return (
+        np.array([np.nan if b is None else b for b in starts], dtype=np.float64),
+        np.array([np.nan if b is None else b for b in ends], dtype=np.float64),
+    )
+
+
+def to_datetime64(values: List[Optional[datetime]]) -> np.ndarray:
+    if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+        return values.astype("datetime64[us]")
+    # numpy only converts naive datetimes, timezone aware ones are converted to naive UTC datetimes first
+    return np.array(
+        [
+            (
+                v.astimezone(timezone.utc).replace(tzinfo=None)
+                if v is not None and v.tzinfo is not None
+                else v
+            )
+            for v in values
+        ],
+        dtype="datetime64[us]",
+    )
+
+
+class IntervalLogView:
+    """
+    Columnar view of the events of interval traces. Event i of the concatenated traces has
+    - the activity code activity_codes[i] (activities[activity_codes[i]] is the activity),
+    - the activity instance activity_instances[i] (only if an instance key is given),
+    - the start and complete timestamps starts[i] and completes[i] as int64 microseconds since the epoch (UTC),
+      truncated to the time granularity like transform_timestamp.
+    The events of the j-th trace are trace_offsets[j]:trace_offsets[j + 1]. Events without start timestamp start at
+    their complete timestamp.
+    """
+
+    def __init__(
+        self,
+        traces: Iterable,
+        time_granularity: Optional[TimeUnit] = None,
+        activity_key: str = DEFAULT_NAME_KEY,
+        instance_key: Optional[str] = None,
+    ):
+        activity_codes = {}
+        codes = []
+        instances = []
+        starts = []
+        completes = []
+        trace_offsets = [0]
+
+        for trace in traces:
+            for event in trace:
+                activity = event[activity_key]
+                if activity not in activity_codes:
+                    activity_codes[activity] = len(activity_codes)
+                codes.append(activity_codes[activity])
+                if instance_key is not None:
+                    instances.append(event[instance_key])
+                completes.append(event[DEFAULT_TIMESTAMP_KEY])
+                starts.append(
+                    event[DEFAULT_START_TIMESTAMP_KEY]
+                    if DEFAULT_START_TIMESTAMP_KEY in event
+                    else event[DEFAULT_TIMESTAMP_KEY]
+                )
+            trace_offsets.append(len(codes))
+
+        self.activities = list(activity_codes)
+        self.activity_codes_by_name = activity_codes
+        self.activity_codes = np.array(codes, dtype=np.int64)
+        self.activity_instances = (
+            np.array(instances, dtype=np.int64) if instance_key is not None else None
+        )
+        self.starts = to_microseconds(starts, time_granularity)
+        self.completes = to_microseconds(completes, time_granularity)
+        self.trace_offsets = np.array(trace_offsets, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.trace_offsets) - 1
+
+    def get_trace_indices(self) -> np.ndarray:
+        """
+        Returns the index of the trace of every event
+        """
+        return np.repeat(np.arange(len(self)), np.diff(self.trace_offsets))
+
+    def get_activity_mask(self, activities: Iterable) -> np.ndarray:
+        codes = [
+            self.activity_codes_by_name[a]
+            for a in activities
+            if a in self.activity_codes_by_name
+        ]
+        return np.isin(self.activity_codes, codes)
+
+    def get_trace_bounds(
+        self, mask: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the earliest start and the latest complete timestamp of the (masked) events of each trace and whether
+        the trace has a (masked) event at all. The bounds of traces without events are undefined.
+        """
+        starts = self.starts
+        completes = self.completes
+        if mask is not None:
+            starts = np.where(mask, starts, np.iinfo(np.int64).max)
+            completes = np.where(mask, completes, np.iinfo(np.int64).min)
+            has_events = segment_sum(mask.astype(np.float64), self.trace_offsets) > 0
+        else:
+            has_events = np.diff(self.trace_offsets) > 0
+
+        return (
+            segment_reduce(np.minimum, starts, self.trace_offsets),
+            segment_reduce(np.maximum, completes, self.trace_offsets),
+            has_events,
+        )
+
+
+def segment_reduce(ufunc, values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Reduces the segments values[offsets[i]:offsets[i + 1]] with the ufunc, empty segments are 0
+    """
+    res = np.zeros(len(offsets) - 1, dtype=values.dtype)
+    non_empty = offsets[1:] > offsets[:-1]
+    if non_empty.any():
+        res[non_empty] = ufunc.reduceat(values, offsets[:-1][non_empty])
+    return res
+
+
+# length of the time units in microseconds, months have no fixed length
+TIME_UNIT_MICROSECONDS = {
+    TimeUnit.MS.name: 1,
+    TimeUnit.SEC.name: 10**6,
+    TimeUnit.MIN.name: 60 * 10**6,
+    TimeUnit.HOUR.name: 60 * 60 * 10**6,
+    TimeUnit.DAY.name: 24 * 60 * 60 * 10**6,
+}
+
+
+def to_microseconds(
+    timestamps: List[datetime], time_granularity: Optional[TimeUnit] = None
+) -> np.ndarray:
+    """
+    Converts the timestamps to int64 microseconds since the epoch (UTC) and truncates them to the time granularity
+    """
+    microseconds = to_datetime64(timestamps).astype(np.int64)
+    return truncate_microseconds(microseconds, time_granularity)
+
+
+def truncate_microseconds(
+    microseconds: np.ndarray, time_granularity: Optional[TimeUnit] = None
+) -> np.ndarray:
+    """
+    Truncates int64 microseconds since the epoch (towards the past) to the time granularity like transform_timestamp
+    """
+    if time_granularity is None:
+        return microseconds
+    if time_granularity is TimeUnit.MONTH:
+        # casting to a coarser unit truncates, casting back to microseconds is exact
+        return (
+            microseconds.astype("datetime64[us]")
+            .astype("datetime64[M]")
+            .astype("datetime64[us]")
+            .astype(np.int64)
+        )
+    unit = TIME_UNIT_MICROSECONDS[time_granularity.name]
+    # missing timestamps (NaT) are kept
+    return np.where(
+        microseconds == np.iinfo(np.int64).min,
+        microseconds,
+        microseconds - microseconds % unit,
+    )
+
+
+def microseconds_to_seconds(microseconds: np.ndarray) -> np.ndarray:
+    return microseconds / 10**6
@@ -0,0 +1,171 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# size of the level-0 compactor of the quantile sketch, the rank error is roughly proportional to 1 / size
+QUANTILE_SKETCH_SIZE = 200
+
+
+def to_float_array(values) -> np.ndarray:
+    """
+    Converts a list (None values are dropped) or a float array (NaN values are dropped) into a float array
+    """
+    if isinstance(values, np.ndarray):
+        values = values.astype(np.float64, copy=False)
+        return values[~np.isnan(values)]
+    return np.array([v for v in values if v is not None], dtype=np.float64)
+
+
+class QuantileSketch:
+    """
+    Mergeable KLL-style quantile sketch. The values are kept in compactors, the values in the compactor of level h
+    have weight 2^h. If a compactor exceeds its capacity, it is sorted and every second value is moved to the next
+    level. The capacities decrease geometrically towards the lower levels, s.t. the size of the sketch is
+    O(size * log(n / size)). As long as no compaction took place, the quantiles are exact.
+    """
+
+    def __init__(self, size: int = QUANTILE_SKETCH_SIZE):
+        self.size = size
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.n = 0
+        # alternating offsets of the compactions keep the sketch deterministic and unbiased on average
+        self.__offset = 0
+
+    def update(self, values: np.ndarray) -> "QuantileSketch":
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.n += len(values)
+        self.__compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.n += other.n
+        self.__compress()
+        return self
+
+    def get_percentiles(self, percentiles: Sequence[float]) -> np.ndarray:
+        """
+        Returns the (approximated) percentiles with the linear interpolation of np.percentile
+        """
+        if len(self.levels) == 1:
+            return np.percentile(self.levels[0], percentiles)
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(level), 2.0**h) for h, level in enumerate(self.levels)]
+        )
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        weights = weights[order]
+
+        # a value of weight w represents w consecutive ranks, it is placed at the center of these ranks
+        ranks = np.cumsum(weights) - (weights + 1) / 2
+        targets = np.asarray(percentiles, dtype=np.float64) / 100 * (weights.sum() - 1)
+        return np.interp(targets, ranks, values)
+
+    def __get_capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.size * (2 / 3) ** depth)))
+
+    def __compress(self):
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self.__get_capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                level = np.sort(self.levels[h])
+                # an odd value stays in the compactor
+                leftover = level[len(level) - len(level) % 2 :]
+                level = level[: len(level) - len(level) % 2]
+                self.levels[h + 1] = np.concatenate(
+                    [self.levels[h + 1], level[self.__offset :: 2]]
+                )
+                self.levels[h] = leftover
+                self.__offset ^= 1
+            h += 1
+
+
+class StatsSketch:
+    """
+    Mergeable summary of a stream of values that provides the statistics of aggregators.stats in bounded memory.
+    Counts, min, max, mean and standard deviation are exact (Welford's moments, merged with the parallel formula of
+    Chan et al.), median and percentiles are approximated by a QuantileSketch. Sketches of chunks of the values (e.g.,
+    computed by different workers) can be merged.
+    """
+
+    def __init__(self, size: int = QUANTILE_SKETCH_SIZE):
+        self.n = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.quantiles = QuantileSketch(size)
+
+    def update(self, values) -> "StatsSketch":
+        """
+        Adds the values (list with None values or float array with NaN values) to the sketch
+        """
+        self.n += len(values)
+        values = to_float_array(values)
+        if values.size == 0:
+            return self
+
+        mean = float(values.mean())
+        self.__merge_moments(
+            values.size,
+            mean,
+            float(((values - mean) ** 2).sum()),
+            float(values.min()),
+            float(values.max()),
+        )
+        self.quantiles.update(values)
+        return self
+
+    def merge(self, other: "StatsSketch") -> "StatsSketch":
+        self.n += other.n
+        if other.count > 0:
+            self.__merge_moments(
+                other.count, other.mean, other.m2, other.min, other.max
+            )
+            self.quantiles.merge(other.quantiles)
+        return self
+
+    def __merge_moments(self, count: int, mean: float, m2: float, min_value, max_value):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, min_value)
+        self.max = max(self.max, max_value)
+
+    def to_stats(self) -> Optional[dict]:
+        """
+        Returns the statistics in the format of aggregators.stats
+        """
+        if self.count == 0:
+            return None
+
+        percentile_50, percentile_95 = self.quantiles.get_percentiles([50, 95])
+        stats = {
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "median": float(percentile_50),
+            "n": self.n,
+            "n_not_none": self.count,
+            "50th": float(percentile_50),
+            "95th": float(percentile_95),
+        }
+        if self.count > 1:
+            stats["stdev"] = float(np.sqrt(self.m2 / (self.count - 1)))
+            if stats["mean"] != 0:
+                stats["percentage_variance"] = (stats["stdev"] / self.mean) * 100
+        else:
+            stats["stdev"] = 0
+            stats["percentage_variance"] = 0
+        return stats
@@ -1,17 +1,17 @@
-from pm4py.objects.log.obj import EventLog, Event, Trace
+from pm4py.objects.log.obj import EventLog
 from pm4py.objects.log.util.interval_lifecycle import to_interval
-from pm4py.objects.log.util.xes import (
-    DEFAULT_START_TIMESTAMP_KEY,
-    DEFAULT_TIMESTAMP_KEY,
-    DEFAULT_NAME_KEY,
-)
 
 from cortado_core.performance.aggregators import stats
+from cortado_core.performance.intervals import (
+    IntervalLogView,
+    microseconds_to_seconds,
+)
 from cortado_core.utils.cvariants import ACTIVITY_INSTANCE_KEY, SubvariantNode
-from cortado_core.utils.timestamp_utils import TimeUnit, transform_timestamp
+from cortado_core.utils.timestamp_utils import TimeUnit
 
+import numpy as np
 from collections import defaultdict
-from typing import List, Any
+from typing import List, Any, Dict, Tuple
 from dataclasses import dataclass
 
 
@@ -41,9 +41,10 @@ def calculate_subvariant_performance(
 ) -> SubvariantWithPerformance:
     log = EventLog(traces)
     log = to_interval(log)
+    view = IntervalLogView(log, time_granularity, instance_key=ACTIVITY_INSTANCE_KEY)
 
-    global_stats = __get_global_performance_stats(log, time_granularity)
-    service_times_per_activity = __get_service_times_per_activity(log, time_granularity)
+    global_stats = __get_global_performance_stats(view)
+    service_times_per_activity = __get_service_times_per_activity(view)
 
     subvariant_with_service_times = __append_service_time_to_subvariant(
         subvariant, service_times_per_activity
@@ -59,64 +60,53 @@ def calculate_subvariant_performance(
     )
 
 
-def __get_global_performance_stats(interval_log: EventLog, time_granularity: TimeUnit):
-    durations = []
-    min_timestamp = None
-    max_timestamp = None
-
-    for trace in interval_log:
-        for event in trace:
-            start_timestamp = transform_timestamp(
-                event[DEFAULT_START_TIMESTAMP_KEY], time_granularity
-            )
-            complete_timestamp = transform_timestamp(
-                event[DEFAULT_TIMESTAMP_KEY], time_granularity
-            )
-
-            if min_timestamp is None or start_timestamp < min_timestamp:
-                min_timestamp = start_timestamp
+def __get_global_performance_stats(view: IntervalLogView):
+    starts, completes, has_events = view.get_trace_bounds()
 
-            if max_timestamp is None or complete_timestamp > max_timestamp:
-                max_timestamp = complete_timestamp
+    # the earliest start and the latest complete timestamp are accumulated over the traces
+    max_int = np.iinfo(np.int64).max
+    min_int = np.iinfo(np.int64).min
+    min_timestamps = np.minimum.accumulate(np.where(has_events, starts, max_int))
+    max_timestamps = np.maximum.accumulate(np.where(has_events, completes, min_int))
+    has_timestamps = np.logical_or.accumulate(has_events)
 
-        if max_timestamp is None or min_timestamp is None:
-            continue
-
-        durations.append((max_timestamp - min_timestamp).total_seconds())
+    durations = microseconds_to_seconds(
+        max_timestamps[has_timestamps] - min_timestamps[has_timestamps]
+    )
 
     return stats(durations)
 
 
-def __get_service_times_per_activity(
-    interval_log: EventLog, time_granularity: TimeUnit
-):
+def __get_service_times_per_activity(view: IntervalLogView):
+    """
+    Returns the service times of each activity instance (in the order of the traces)
+    :return: dictionary activity -> activity instance -> array of service times
+    """
     service_times_per_activity = defaultdict(dict)
-
-    for trace in interval_log:
-        for event in trace:
-            service_time = __calculate_service_time(event, time_granularity)
-            activity = event[DEFAULT_NAME_KEY]
-            activity_instance = event[ACTIVITY_INSTANCE_KEY]
-
-            service_times_per_activity[activity][activity_instance] = (
-                service_times_per_activity[activity].get(activity_instance, [])
-                + [service_time]
-            )
+    if len(view.activity_codes) == 0:
+        return service_times_per_activity
+
+    service_times = microseconds_to_seconds(view.completes - view.starts)
+
+    # lexsort is stable, i.e., the service times of an activity instance stay in the order of the traces
+    order = np.lexsort((view.activity_instances, view.activity_codes))
+    codes = view.activity_codes[order]
+    instances = view.activity_instances[order]
+    service_times = service_times[order]
+
+    boundaries = (
+        np.flatnonzero((codes[1:] != codes[:-1]) | (instances[1:] != instances[:-1]))
+        + 1
+    ).tolist()
+    for start, end in zip([0] + boundaries, boundaries + [len(codes)]):
+        activity = view.activities[codes[start]]
+        service_times_per_activity[activity][int(instances[start])] = service_times[
+            start:end
+        ]
 
     return service_times_per_activity
 
 
-def __calculate_service_time(event: Event, time_granularity: TimeUnit) -> int:
-    start_timestamp = transform_timestamp(
-        event[DEFAULT_START_TIMESTAMP_KEY], time_granularity
-    )
-    complete_timestamp = transform_timestamp(
-        event[DEFAULT_TIMESTAMP_KEY], time_granularity
-    )
-
-    return (complete_timestamp - start_timestamp).total_seconds()
-
-
 def __append_service_time_to_subvariant(subvariant, service_times_per_activity):
     """
     Appends the already computed service times per activity and instance to the complete nodes of the subvariant
@@ -217,53 +207,70 @@ def get_successor_complete_node(
 def add_performance_to_waiting_time_events(
     waiting_time_events: List[WaitingTimeEvent], traces, time_granularity: TimeUnit
 ):
-    traces_as_act_instance_dicts = traces_to_activity_instance_dicts(traces)
+    view = IntervalLogView(traces, time_granularity, instance_key=ACTIVITY_INSTANCE_KEY)
+    positions = get_activity_instance_positions(view)
 
     for waiting_time_event in waiting_time_events:
-        waiting_times = []
-        for trace_as_instance_dict in traces_as_act_instance_dicts:
-            start_timestamp_key = (
-                DEFAULT_START_TIMESTAMP_KEY
-                if waiting_time_event.start.lifecycle == "start"
-                else DEFAULT_TIMESTAMP_KEY
-            )
-            start_timestamp = trace_as_instance_dict[
-                waiting_time_event.start.activity,
-                waiting_time_event.start.activity_instance,
-            ][start_timestamp_key]
-            start_timestamp = transform_timestamp(start_timestamp, time_granularity)
-
-            complete_timestamp_key = (
-                DEFAULT_START_TIMESTAMP_KEY
-                if waiting_time_event.complete.lifecycle == "start"
-                else DEFAULT_TIMESTAMP_KEY
-            )
-            complete_timestamp = trace_as_instance_dict[
-                waiting_time_event.complete.activity,
-                waiting_time_event.complete.activity_instance,
-            ][complete_timestamp_key]
-            complete_timestamp = transform_timestamp(
-                complete_timestamp, time_granularity
-            )
-
-            waiting_time = (complete_timestamp - start_timestamp).total_seconds()
-            waiting_times.append(waiting_time)
+        start_timestamps = __get_node_timestamps(
+            view, positions, waiting_time_event.start
+        )
+        complete_timestamps = __get_node_timestamps(
+            view, positions, waiting_time_event.complete
+        )
 
-        waiting_time_event.performance_stats = stats(waiting_times)
+        waiting_time_event.performance_stats = stats(
+            microseconds_to_seconds(complete_timestamps - start_timestamps)
+        )
 
     return waiting_time_events
 
 
-def traces_to_activity_instance_dicts(traces: List[Trace]):
-    return [trace_to_activity_instance_dict(t) for t in traces]
+def __get_node_timestamps(
+    view: IntervalLogView, positions: Dict[Tuple[str, int], np.ndarray], node
+) -> np.ndarray:
+    key = (node.activity, node.activity_instance)
+    if key not in positions or (positions[key] < 0).any():
+        raise KeyError(key)
 
+    timestamps = view.starts if node.lifecycle == "start" else view.completes
+    return timestamps[positions[key]]
 
-def trace_to_activity_instance_dict(trace: Trace):
-    result = {}
 
-    for event in trace:
-        activity = event[DEFAULT_NAME_KEY]
-        activity_instance = event[ACTIVITY_INSTANCE_KEY]
-        result[(activity, activity_instance)] = event
+def get_activity_instance_positions(
+    view: IntervalLogView,
+) -> Dict[Tuple[str, int], np.ndarray]:
+    """
+    Returns for each (activity, activity instance) the position of its event in each trace of the view, -1 if the
+    trace does not contain the activity instance. If an activity instance occurs multiple times in a trace, the last
+    event is used.
+    """
+    n = len(view.activity_codes)
+    if n == 0:
+        return {}
+
+    trace_indices = view.get_trace_indices()
+    codes = view.activity_codes
+    instances = view.activity_instances
+    order = np.lexsort((np.arange(n), trace_indices, instances, codes))
+    codes = codes[order]
+    instances = instances[order]
+    trace_indices = trace_indices[order]
+
+    is_new_instance = np.ones(n, dtype=bool)
+    is_new_instance[1:] = (codes[1:] != codes[:-1]) | (instances[1:] != instances[:-1])
+    is_last_in_trace = np.ones(n, dtype=bool)
+    is_last_in_trace[:-1] = is_new_instance[1:] | (
+        trace_indices[1:] != trace_indices[:-1]
+    )
+
+    positions = {}
+    boundaries = np.flatnonzero(is_new_instance).tolist() + [n]
+    for start, end in zip(boundaries, boundaries[1:]):
+        last = start + np.flatnonzero(is_last_in_trace[start:end])
+        instance_positions = np.full(len(view), -1, dtype=np.int64)
+        instance_positions[trace_indices[last]] = order[last]
+        positions[(view.activities[codes[start]], int(instances[start]))] = (
+            instance_positions
+        )
 
-    return result
+    return positions
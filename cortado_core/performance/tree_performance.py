@@ -1,18 +1,24 @@
+import math
 from copy import copy, deepcopy
 from datetime import datetime
+from multiprocessing import Pool
 from typing import List, Tuple, Optional, Dict
 
+import numpy as np
+from cachetools import LRUCache
 from tqdm import tqdm
 
 import pm4py.visualization.process_tree.visualizer as tree_vis
+from cortado_core.performance.aggregators import (
+    ARRAY_AGGREGATORS,
+    SEGMENTED_AGGREGATORS,
+)
+from cortado_core.performance.intervals import IntervalColumns
 from cortado_core.performance.utils import (
-    get_alignment_activities,
+    AlignmentIndex,
     get_alignment_events,
-    get_alignment_tree_nodes,
-    get_all_indices,
-    get_alignment_tree_lf,
-    get_tree_instances,
     get_all_nodes,
+    get_last_position_before,
 )
 from pm4py.algo.conformance.alignments.petri_net import algorithm as net_alignment
 from pm4py.algo.filtering.log.variants import variants_filter
@@ -32,7 +38,20 @@ from pm4py.visualization.petri_net import visualizer as net_visualizer
 from .service_time import compute_service_times, compute_idle_times
 from .waiting_time import get_enabling_nodes
 from ..process_tree_utils import to_petri_net_transition_bordered
-from cortado_core.process_tree_utils.miscellaneous import is_tau_leaf
+from cortado_core.process_tree_utils.miscellaneous import (
+    get_structural_fingerprint,
+    is_tau_leaf,
+)
+
+LOW_LEVEL_NET_CACHE_SIZE = 16
+# number of (tree structure, alignment parameters) combinations whose variant alignments are kept
+ALIGNMENTS_CACHE_SIZE = 8
+
+# number of variants aligned per task if a pool is used, the low-level net is sent once per task
+ALIGNMENT_CHUNK_SIZE = 8
+
+_low_level_nets_cache = LRUCache(maxsize=LOW_LEVEL_NET_CACHE_SIZE)
+_alignments_cache = LRUCache(maxsize=ALIGNMENTS_CACHE_SIZE)
 
 
 def create_low_level_tree(pt, parent=None, instances={}):
@@ -123,69 +142,68 @@ def compute_performances_intervals(tree, log, alignments, selected_tree_nodes=No
     all_waiting_times = {t: [None for _ in range(len(log))] for t in tree_nodes}
     all_cycle_times = {t: [None for _ in range(len(log))] for t in tree_nodes}
 
-    cache = {}
+    variants = [variants_util.get_variant_from_trace(trace) for trace in log]
+    # the positions of the activity instances only depend on the alignment, i.e., they are computed once per variant
+    # and only the timestamps are looked up per trace
+    alignment_indices = {
+        variant: [AlignmentIndex(alignment) for alignment in alignments[variant]]
+        for variant in set(variants)
+    }
+    timestamps_cache = {}
+
     for t in tree_nodes:
         # *tau* nodes
         if is_tau_leaf(t):
             continue
         child_nodes = get_all_nodes(t) - {t}
         enabling_nodes = get_enabling_nodes(t)
+        positions_per_variant = {
+            variant: [
+                compute_performance_positions(
+                    t, child_nodes, enabling_nodes, alignment_index
+                )
+                for alignment_index in indices
+            ]
+            for variant, indices in alignment_indices.items()
+        }
+
         for trace_idx, trace in enumerate(log):
-            variant = variants_util.get_variant_from_trace(trace)
-            trace_alignments = alignments[variant]
+            variant = variants[trace_idx]
+            trace_positions = positions_per_variant[variant]
 
             all_service_times[t][trace_idx] = [
-                None for _ in range(len(trace_alignments))
+                None for _ in range(len(trace_positions))
             ]
             all_waiting_times[t][trace_idx] = [
-                None for _ in range(len(trace_alignments))
+                None for _ in range(len(trace_positions))
             ]
-            all_idle_times[t][trace_idx] = [None for _ in range(len(trace_alignments))]
-            all_cycle_times[t][trace_idx] = [None for _ in range(len(trace_alignments))]
-
-            for alignment_idx, alignment in enumerate(trace_alignments):
-                if (trace_idx, alignment_idx) in cache:
-                    (
-                        alignment_tree_nodes,
-                        alignment_events,
-                        alignment_activities,
-                        alignment_active_close,
-                    ) = cache[(trace_idx, alignment_idx)]
-                else:
-                    alignment_tree_nodes = get_alignment_tree_nodes(alignment)
-                    alignment_events = get_alignment_events(alignment, trace)
-                    alignment_activities = get_alignment_activities(alignment)
-                    alignment_active_close = get_alignment_tree_lf(alignment)
-                    cache[(trace_idx, alignment_idx)] = (
-                        alignment_tree_nodes,
-                        alignment_events,
-                        alignment_activities,
-                        alignment_active_close,
-                    )
-
-                performance = compute_performance_trace(
-                    t,
-                    alignment,
-                    child_nodes,
-                    enabling_nodes,
-                    alignment_tree_nodes,
-                    alignment_events,
-                    alignment_activities,
-                    alignment_active_close,
-                )
-                all_service_times[t][trace_idx][alignment_idx] = (
-                    performance.service_times if performance else None
-                )
-                all_idle_times[t][trace_idx][alignment_idx] = (
-                    performance.idle_times if performance else None
-                )
-                all_waiting_times[t][trace_idx][alignment_idx] = (
-                    performance.waiting_times if performance else None
-                )
-                all_cycle_times[t][trace_idx][alignment_idx] = (
-                    performance.cycle_times if performance else None
+            all_idle_times[t][trace_idx] = [None for _ in range(len(trace_positions))]
+            all_cycle_times[t][trace_idx] = [None for _ in range(len(trace_positions))]
+
+            for alignment_idx, positions in enumerate(trace_positions):
+                if positions is None:
+                    continue
+
+                if (trace_idx, alignment_idx) not in timestamps_cache:
+                    timestamps_cache[(trace_idx, alignment_idx)] = [
+                        event[DEFAULT_TIMESTAMP_KEY] if event else None
+                        for event in get_alignment_events(
+                            alignments[variant][alignment_idx], trace
+                        )
+                    ]
+                performance = positions_to_performance(
+                    positions, timestamps_cache[(trace_idx, alignment_idx)]
                 )
 
+                all_service_times[t][trace_idx][
+                    alignment_idx
+                ] = performance.service_times
+                all_idle_times[t][trace_idx][alignment_idx] = performance.idle_times
+                all_waiting_times[t][trace_idx][
+                    alignment_idx
+                ] = performance.waiting_times
+                all_cycle_times[t][trace_idx][alignment_idx] = performance.cycle_times
+
     return all_service_times, all_idle_times, all_waiting_times, all_cycle_times
 
 
@@ -198,6 +216,22 @@ def reduce_alignments(alignments):
     return set(reduced_alignments.values())
 
 
+class InstancePositions:
+    """
+    Positions in an alignment that determine the performance of one instance of a tree node: the start and complete
+    positions of the (child) activity instances, the positions of the start and complete event of the node itself and
+    the position of the enabling event (-1 if the node is enabled by the root).
+    """
+
+    def __init__(
+        self, service_positions, start_position, complete_position, enabling_position
+    ):
+        self.service_positions: List[Tuple[int, int]] = service_positions
+        self.start_position: int = start_position
+        self.complete_position: int = complete_position
+        self.enabling_position: int = enabling_position
+
+
 def compute_performance_trace(
     tree: CortadoProcessTree,
     alignment,
@@ -208,161 +242,152 @@ def compute_performance_trace(
     alignment_activities,
     alignment_active_close,
 ) -> PerformanceMeasures:
-    instances = get_all_indices(alignment_tree_nodes, tree)
+    positions = compute_performance_positions(
+        tree, child_nodes, enabling_nodes, AlignmentIndex(alignment)
+    )
+    if positions is None:
+        return None
+
+    timestamps = [
+        event[DEFAULT_TIMESTAMP_KEY] if event else None for event in alignment_events
+    ]
+    return positions_to_performance(positions, timestamps)
+
+
+def compute_performance_positions(
+    tree: CortadoProcessTree,
+    child_nodes,
+    enabling_nodes,
+    alignment_index: AlignmentIndex,
+) -> Optional[List[InstancePositions]]:
+    """
+    Computes the alignment positions of all instances of the tree node, None if the node is not executed in the
+    alignment or an instance consists of log moves only
+    """
+    instances = alignment_index.get_positions(tree)
     instances = [instances[i : i + 2] for i in range(0, len(instances), 2)]
 
     if len(instances) == 0:
         return None
 
-    parent_indices = get_all_indices(alignment_tree_nodes, tree.parent)
-    parent_active_indices = [
-        i for i in parent_indices if i == -1 or alignment_active_close[i] == "active"
-    ]
+    if tree.parent is None:
+        parent_active_indices = [-1]
+    else:
+        parent_active_indices = alignment_index.active_positions.get(
+            id(tree.parent), []
+        )
 
-    enabling_indices = [
-        i for n in enabling_nodes for i in get_all_indices(alignment_tree_nodes, n)
-    ]
-    enabling_completing_indices = [
+    enabling_completing_indices = sorted(
         i
-        for i in enabling_indices
-        if alignment_activities[i] and "complete" in alignment_activities[i] or i == -1
-    ]
+        for n in enabling_nodes
+        for i in (
+            [-1] if n is None else alignment_index.complete_positions.get(id(n), [])
+        )
+    )
 
-    waiting_times = []
-    service_times = []
-    cycle_times = []
-    idle_times = []
+    child_node_ids = (
+        alignment_index.get_node_ids_in(child_nodes) if len(tree.children) > 0 else []
+    )
 
+    res = []
     for self_index_start, self_index_end in instances:
         if len(tree.children) == 0:
-            self_start_event = alignment_events[self_index_start]
-            self_complete_event = alignment_events[self_index_end]
-            service_time_intervals = [
-                [
-                    (
-                        self_start_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_start_event
-                        else None
-                    ),
-                    (
-                        self_complete_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_complete_event
-                        else None
-                    ),
-                ]
-            ]
+            service_positions = [(self_index_start, self_index_end)]
+            start_position = self_index_start
+            complete_position = self_index_end
         else:
             # restrict search to range self_start to self_end
-            starting_nodes_indices = [
-                i
-                for i in range(self_index_start, self_index_end)
-                if (
-                    bool(alignment_activities[i])
-                    and alignment[i]
-                    and "start" in alignment_activities[i]
-                )
-                and alignment_tree_nodes[i] in child_nodes
-            ]
-            if not starting_nodes_indices:
+            start_position = alignment_index.get_first_start_position(
+                child_node_ids, self_index_start, self_index_end
+            )
+            if start_position is None:
                 # only log moves of child nodes
                 return None
-            self_start_event = min(starting_nodes_indices)
-            self_start_event = alignment_events[self_start_event]
-
-            completing_indices = [
-                i
-                for i in range(self_index_start, self_index_end)
-                if (alignment_activities[i] and "complete" in alignment_activities[i])
-                and alignment_tree_nodes[i] in child_nodes
-            ]
-            if not completing_indices:
+
+            complete_position = alignment_index.get_last_complete_position(
+                child_node_ids, self_index_start, self_index_end
+            )
+            if complete_position is None:
                 # only log moves of child nodes
                 return None
-            self_complete_event = max(completing_indices)
-            self_complete_event = alignment_events[self_complete_event]
 
-            activity_instances = get_tree_instances(
-                alignment[self_index_start:self_index_end], nodes=child_nodes
+            service_positions = __get_activity_instances(
+                alignment_index, self_index_start, self_index_end, child_nodes
             )
-            activity_instances_events = [
-                (
-                    alignment_events[self_index_start + ai[0]],
-                    alignment_events[self_index_start + ai[1]],
-                )
-                for ai in activity_instances
-            ]
-            service_time_intervals = [
-                [
-                    ai[0][DEFAULT_TIMESTAMP_KEY] if ai[0] else None,
-                    ai[1][DEFAULT_TIMESTAMP_KEY] if ai[1] else None,
-                ]
-                for ai in activity_instances_events
-            ]
-
-        service_times.append(compute_service_times(service_time_intervals))
-        idle_times.append(compute_idle_times(service_time_intervals))
 
         if tree.parent and tree.parent.operator == Operator.PARALLEL:
-            parent_active_index = max(
-                [i for i in parent_active_indices if i < self_index_start]
+            parent_active_index = get_last_position_before(
+                parent_active_indices, self_index_start
             )
+            assert parent_active_index is not None, "no active parent"
         else:
             parent_active_index = self_index_start
 
-        candidates = [i for i in enabling_completing_indices if i < parent_active_index]
-        if not candidates:
+        max_enabling = get_last_position_before(
+            enabling_completing_indices, parent_active_index
+        )
+        if max_enabling is None:
             # Should not happen
             assert False, "no enabling candidates"
 
-        max_enabling = max(candidates)
-        # enabled by root
-        if max_enabling == -1:
-            waiting_times.append(
-                (
-                    (
-                        self_start_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_start_event
-                        else None
-                    ),
-                    (
-                        self_start_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_start_event
-                        else None
-                    ),
-                )
-            )
-            cycle_times.append(
-                [
-                    (
-                        self_start_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_start_event
-                        else None
-                    ),
-                    (
-                        self_complete_event[DEFAULT_TIMESTAMP_KEY]
-                        if self_complete_event
-                        else None
-                    ),
-                ]
+        res.append(
+            InstancePositions(
+                service_positions, start_position, complete_position, max_enabling
             )
+        )
+
+    return res
+
+
+def __get_activity_instances(
+    alignment_index: AlignmentIndex, start: int, end: int, nodes
+) -> List[Tuple[int, int]]:
+    # same matching of start and complete moves as get_tree_instances, but on the indexed alignment
+    starts = {}
+    instances = []
+    for i in range(start, end):
+        t = alignment_index.tree_nodes[i]
+        a = alignment_index.activities[i]
+        if t not in nodes:
+            continue
+        if t is None or not a:
             continue
 
-        enabling_event = alignment_events[max_enabling]
-        waiting_time_interval = (
-            enabling_event[DEFAULT_TIMESTAMP_KEY] if enabling_event else None,
-            self_start_event[DEFAULT_TIMESTAMP_KEY] if self_start_event else None,
-        )
-        waiting_times.append(waiting_time_interval)
-        cycle_times.append(
-            [
-                enabling_event[DEFAULT_TIMESTAMP_KEY] if enabling_event else None,
-                (
-                    self_complete_event[DEFAULT_TIMESTAMP_KEY]
-                    if self_complete_event
-                    else None
-                ),
-            ]
-        )
+        if "_start" in a:
+            starts[t] = starts.get(t, []) + [i]
+        else:
+            start_idx = starts[t].pop()
+            instances.append((start_idx, i))
+    return instances
+
+
+def positions_to_performance(
+    positions: List[InstancePositions], timestamps: List[Optional[datetime]]
+) -> PerformanceMeasures:
+    waiting_times = []
+    service_times = []
+    cycle_times = []
+    idle_times = []
+
+    for instance in positions:
+        service_time_intervals = [
+            [timestamps[start], timestamps[complete]]
+            for start, complete in instance.service_positions
+        ]
+        service_times.append(compute_service_times(service_time_intervals))
+        idle_times.append(compute_idle_times(service_time_intervals))
+
+        start_timestamp = timestamps[instance.start_position]
+        complete_timestamp = timestamps[instance.complete_position]
+        # enabled by root
+        if instance.enabling_position == -1:
+            waiting_times.append((start_timestamp, start_timestamp))
+            cycle_times.append([start_timestamp, complete_timestamp])
+            continue
+
+        enabling_timestamp = timestamps[instance.enabling_position]
+        waiting_times.append((enabling_timestamp, start_timestamp))
+        cycle_times.append([enabling_timestamp, complete_timestamp])
 
     return PerformanceMeasures(
         service_times=service_times,
@@ -377,8 +402,9 @@ def get_tree_performance_intervals(
     log,
     alignment_variant=net_alignment.Variants.VERSION_STATE_EQUATION_A_STAR,
     alignment_time_limit=None,
-    alignment_params={},
+    alignment_params=None,
     selected_tree_nodes=None,
+    pool: Optional[Pool] = None,
 ):
     log_lifecycle = to_low_level_log(log)
 
@@ -388,6 +414,7 @@ def get_tree_performance_intervals(
         alignment_variant=alignment_variant,
         alignment_time_limit=alignment_time_limit,
         alignment_params=alignment_params,
+        pool=pool,
     )
     performances = compute_performances_intervals(
         pt, log_lifecycle, alignments, selected_tree_nodes
@@ -425,19 +452,56 @@ def apply_aggregation(
 def apply_aggregation_intervals(
     values: List, cases_aggregator, alignments_aggregator, instances_aggregator
 ):
-    return cases_aggregator(
-        [
-            alignments_aggregator(
-                [
-                    decide_aggregator(instances, instances_aggregator)
-                    for instances in alignments
-                ]
-            )
-            for alignments in values
-            if alignments is not None
-        ]
+    """
+    Aggregates the intervals of a tree node over instances, alignments and cases. The intervals are converted into a
+    columnar representation once, aggregators with a segmented numpy version (see SEGMENTED_AGGREGATORS) are applied to
+    all alignments/cases at once, all other aggregators are called on plain lists as before.
+    """
+    columns = IntervalColumns(values)
+    alignment_values = __aggregate_segments(
+        columns.get_instance_values(),
+        columns.alignment_offsets,
+        instances_aggregator,
+        columns.alignment_valid,
+    )
+    case_values = __aggregate_segments(
+        alignment_values, columns.case_offsets, alignments_aggregator
     )
 
+    if (
+        isinstance(case_values, np.ndarray)
+        and cases_aggregator not in ARRAY_AGGREGATORS
+    ):
+        case_values = __to_list(case_values)
+
+    return cases_aggregator(case_values)
+
+
+def __aggregate_segments(values, offsets: np.ndarray, aggregator, valid=None):
+    """
+    Applies the aggregator to every segment values[offsets[i]:offsets[i + 1]]. Returns a float array (NaN for None) if
+    the aggregator has a segmented version and the values are a float array, a list otherwise.
+    :param valid: segments marked as invalid are aggregated to None
+    """
+    if isinstance(values, np.ndarray) and aggregator in SEGMENTED_AGGREGATORS:
+        res = SEGMENTED_AGGREGATORS[aggregator](values, offsets)
+        if valid is not None:
+            res[~valid] = np.nan
+        return res
+
+    if isinstance(values, np.ndarray):
+        values = __to_list(values)
+
+    bounds = offsets.tolist()
+    return [
+        aggregator(values[start:end]) if valid is None or valid[i] else None
+        for i, (start, end) in enumerate(zip(bounds, bounds[1:]))
+    ]
+
+
+def __to_list(values: np.ndarray) -> List[Optional[float]]:
+    return [None if math.isnan(v) else v for v in values.tolist()]
+
 
 def decide_aggregator(instances, aggregator):
     if instances is None:
@@ -494,24 +558,113 @@ def get_all_alignments(
     log_lifecycle,
     alignment_variant=net_alignment.Variants.VERSION_STATE_EQUATION_A_STAR,
     alignment_time_limit=None,
-    alignment_params={},
+    alignment_params=None,
+    pool: Optional[Pool] = None,
 ):
-    net, im, fm = to_petri_net_transition_bordered.apply(pt)
-    low_level_net, im, fm, _ = get_low_level_net(net)
+    """
+    Aligns every variant of the lifecycle log with the low-level net of the tree. The low-level net is cached per tree
+    structure and the alignments are cached per tree structure and variant, i.e., repeated calls for the same tree
+    (e.g., with other selected tree nodes or aggregations) only align variants that were not aligned before.
+    :param pool: Pool to parallelize the alignment computations
+    :return: alignments per variant (referencing the nodes of pt), the lifecycle log and the mean fitness
+    """
     variants = variants_filter.get_variants(log_lifecycle)
-    all_alignments = {}
-    fitness = 0
-    for variant in tqdm(variants):
-        v_trace = variant_to_trace(variant)
-        if alignment_time_limit is not None:
-            alignment_params[net_alignment.Parameters.PARAM_MAX_ALIGN_TIME_TRACE] = (
-                alignment_time_limit
+    variant_alignments = get_variant_alignments(
+        pt,
+        list(variants),
+        alignment_variant=alignment_variant,
+        alignment_time_limit=alignment_time_limit,
+        alignment_params=alignment_params,
+        pool=pool,
+    )
+    all_alignments = {
+        v: alignments for v, (alignments, _) in variant_alignments.items()
+    }
+    fitness = sum(fitness for _, fitness in variant_alignments.values())
+    mean_fitness = fitness / len(variants)
+    return all_alignments, log_lifecycle, mean_fitness
+
+
+def get_variant_alignments(
+    pt,
+    variants: List,
+    alignment_variant=net_alignment.Variants.VERSION_STATE_EQUATION_A_STAR,
+    alignment_time_limit=None,
+    alignment_params=None,
+    pool: Optional[Pool] = None,
+) -> Dict:
+    """
+    Aligns the lifecycle variants with the low-level net of the tree, see get_all_alignments
+    :return: dictionary variant -> (alignments referencing the nodes of pt, fitness)
+    """
+    alignment_params = dict(alignment_params) if alignment_params is not None else {}
+    if alignment_time_limit is not None:
+        alignment_params[net_alignment.Parameters.PARAM_MAX_ALIGN_TIME_TRACE] = (
+            alignment_time_limit
+        )
+    alignment_params[
+        net_alignment.Parameters.PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE
+    ] = True
+
+    fingerprint = get_structural_fingerprint(pt)
+    low_level_net, im, fm = get_cached_low_level_net(pt, fingerprint)
+    cache_key = (
+        fingerprint,
+        alignment_variant,
+        tuple(sorted((str(k), repr(v)) for k, v in alignment_params.items())),
+    )
+    if cache_key not in _alignments_cache:
+        _alignments_cache[cache_key] = {}
+    cached_alignments = _alignments_cache[cache_key]
+
+    missing_variants = [v for v in variants if v not in cached_alignments]
+    if pool is None or len(missing_variants) < 2:
+        results = [
+            align_variants(
+                [v], low_level_net, im, fm, alignment_variant, alignment_params
             )
-        alignment_params[
-            net_alignment.Parameters.PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE
-        ] = True
+            for v in tqdm(missing_variants)
+        ]
+    else:
+        # the members of net_alignment.Variants hold modules, which cannot be pickled
+        variant_name = alignment_variant.name
+        results = pool.starmap(
+            align_variants,
+            [
+                (chunk, low_level_net, im, fm, variant_name, alignment_params)
+                for chunk in __get_chunks(missing_variants, ALIGNMENT_CHUNK_SIZE)
+            ],
+        )
+    for result in results:
+        cached_alignments.update(result)
+
+    nodes = get_preorder_nodes(pt)
+    res = {}
+    for variant in variants:
+        alignments, fitness = cached_alignments[variant]
+        res[variant] = (
+            [__bind_alignment(alignment, nodes) for alignment in alignments],
+            fitness,
+        )
+    return res
+
+
+def align_variants(
+    variants, low_level_net, im, fm, alignment_variant, alignment_params
+) -> Dict:
+    """
+    Aligns the variants with the (cached) low-level net, whose transition names reference tree nodes by their preorder
+    index
+    :param alignment_variant: member or name of a member of net_alignment.Variants
+    :return: dictionary variant -> (alignments, fitness)
+    """
+    if isinstance(alignment_variant, str):
+        alignment_variant = net_alignment.Variants[alignment_variant]
+
+    res = {}
+    for variant in variants:
         alignments = net_alignment.apply(
-            v_trace,
+            variant_to_trace(variant),
             low_level_net,
             im,
             fm,
@@ -519,13 +672,51 @@ def get_all_alignments(
             parameters=alignment_params,
         )
         if "all_alignments" in alignments:
-            # reduced_alignments = reduce_alignments(alignments["all_alignments"])
-            all_alignments[variant] = alignments["all_alignments"]
+            res[variant] = (alignments["all_alignments"], alignments["fitness"])
         else:
-            all_alignments[variant] = [alignments["alignment"]]
-        fitness += alignments["fitness"]
-    mean_fitness = fitness / len(variants)
-    return all_alignments, log_lifecycle, mean_fitness
+            res[variant] = ([alignments["alignment"]], alignments["fitness"])
+    return res
+
+
+def get_cached_low_level_net(pt, fingerprint=None):
+    """
+    Returns the low-level net of the tree. Its transitions are named (preorder index of the tree node, status) instead
+    of (tree node, status), s.t. the net does not reference the tree and can be reused for all structurally identical
+    trees and sent to worker processes.
+    """
+    if fingerprint is None:
+        fingerprint = get_structural_fingerprint(pt)
+    if fingerprint not in _low_level_nets_cache:
+        net, _, _ = to_petri_net_transition_bordered.apply(pt)
+        node_indices = {id(n): i for i, n in enumerate(get_preorder_nodes(pt))}
+        for t in net.transitions:
+            t.name = (node_indices[id(t.name[0])], t.name[1])
+        low_level_net, im, fm, _ = get_low_level_net(net)
+        _low_level_nets_cache[fingerprint] = (low_level_net, im, fm)
+
+    return _low_level_nets_cache[fingerprint]
+
+
+def get_preorder_nodes(pt) -> List:
+    nodes = [pt]
+    for c in pt.children:
+        nodes.extend(get_preorder_nodes(c))
+    return nodes
+
+
+def __bind_alignment(alignment, nodes: List):
+    return [
+        (
+            ((log_move, (nodes[model_move[0]], model_move[1])), labels)
+            if model_move != ">>"
+            else ((log_move, model_move), labels)
+        )
+        for (log_move, model_move), labels in alignment
+    ]
+
+
+def __get_chunks(values: List, chunk_size: int) -> List[List]:
+    return [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
 
 
 def view_tree(pt):
@@ -0,0 +1,181 @@
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Set, Tuple
+
+from pm4py.algo.conformance.alignments.petri_net import algorithm as net_alignment
+from pm4py.objects.process_tree.obj import ProcessTree
+from pm4py.util import variants_util
+
+from cortado_core.performance.tree_performance import (
+    compute_performances_intervals,
+    get_preorder_nodes,
+    get_variant_alignments,
+    to_low_level_log,
+)
+from cortado_core.performance.utils import get_alignment_tree_nodes
+from cortado_core.performance.waiting_time import get_enabling_nodes
+from cortado_core.process_tree_utils.miscellaneous import replace_tree_in_children
+
+
+class TreePerformanceSession:
+    """
+    Keeps the alignments and the intervals of a tree performance computation, s.t. they can be updated incrementally
+    after a subtree of the tree was replaced (e.g., by an LCA repair or by freezing). After an edit,
+    - only variants whose alignments executed the replaced subtree or that do not fit the tree are realigned (a fitting
+    alignment that does not enter the subtree is still a fitting alignment of the edited tree),
+    - for traces of realigned variants, the intervals of all nodes are recomputed,
+    - for all other traces, only the intervals of the new subtree, its ancestors and the nodes enabled by it are
+    recomputed, the intervals of all other nodes are kept.
+    The performances have the same format as the ones returned by get_tree_performance_intervals.
+    """
+
+    def __init__(
+        self,
+        pt: ProcessTree,
+        log,
+        alignment_variant=net_alignment.Variants.VERSION_STATE_EQUATION_A_STAR,
+        alignment_time_limit=None,
+        alignment_params=None,
+        pool: Optional[Pool] = None,
+    ):
+        self.tree = pt
+        self.log_lifecycle = to_low_level_log(log)
+        self.alignment_variant = alignment_variant
+        self.alignment_time_limit = alignment_time_limit
+        self.alignment_params = alignment_params
+        self.pool = pool
+
+        self.trace_variants = [
+            variants_util.get_variant_from_trace(trace) for trace in self.log_lifecycle
+        ]
+        self.variant_alignments: Dict = self.__align(
+            list(dict.fromkeys(self.trace_variants))
+        )
+        self.performances = compute_performances_intervals(
+            self.tree, self.log_lifecycle, self.get_alignments()
+        )
+
+    def get_alignments(self) -> Dict:
+        return {v: alignments for v, (alignments, _) in self.variant_alignments.items()}
+
+    def get_mean_fitness(self) -> float:
+        return sum(f for _, f in self.variant_alignments.values()) / len(
+            self.variant_alignments
+        )
+
+    def get_performances(self) -> Tuple[Tuple[Dict, Dict, Dict, Dict], float]:
+        """
+        :return: (service times, idle times, waiting times, cycle times), mean fitness
+        """
+        return self.performances, self.get_mean_fitness()
+
+    def replace_subtree(
+        self, subtree: ProcessTree, new_subtree: ProcessTree
+    ) -> Tuple[Tuple[Dict, Dict, Dict, Dict], float]:
+        """
+        Replaces the subtree of the session's tree by the new subtree and updates the alignments and intervals
+        :param subtree: node of the session's tree
+        :param new_subtree: the replacement, must not be part of the session's tree
+        :return: updated performances, see get_performances
+        """
+        replaced_nodes = {id(n) for n in get_preorder_nodes(subtree)}
+        if subtree is self.tree:
+            new_subtree.parent = None
+            self.tree = new_subtree
+        else:
+            replace_tree_in_children(subtree.parent, subtree, new_subtree)
+
+        realigned_variants = {
+            variant
+            for variant, (alignments, _) in self.variant_alignments.items()
+            if any(
+                self.__touches_nodes(alignment, replaced_nodes)
+                or not self.__is_fitting(alignment)
+                for alignment in alignments
+            )
+        }
+        self.variant_alignments.update(self.__align(list(realigned_variants)))
+
+        realigned_traces = []
+        other_traces = []
+        for i, variant in enumerate(self.trace_variants):
+            if variant in realigned_variants:
+                realigned_traces.append(i)
+            else:
+                other_traces.append(i)
+
+        self.performances = tuple(
+            {k: v for k, v in performance.items() if id(k) not in replaced_nodes}
+            for performance in self.performances
+        )
+        self.__update_performances(realigned_traces, get_preorder_nodes(self.tree))
+        self.__update_performances(other_traces, self.__get_affected_nodes(new_subtree))
+
+        return self.get_performances()
+
+    def __align(self, variants: List) -> Dict:
+        if len(variants) == 0:
+            return {}
+        return get_variant_alignments(
+            self.tree,
+            variants,
+            alignment_variant=self.alignment_variant,
+            alignment_time_limit=self.alignment_time_limit,
+            alignment_params=self.alignment_params,
+            pool=self.pool,
+        )
+
+    def __get_affected_nodes(self, new_subtree: ProcessTree) -> List[ProcessTree]:
+        """
+        Returns the nodes whose intervals can change by replacing a subtree even if the alignment did not change, i.e.,
+        the nodes of the new subtree, its ancestors and the nodes that are enabled by nodes of the new subtree
+        """
+        subtree_nodes = get_preorder_nodes(new_subtree)
+        subtree_node_ids = {id(n) for n in subtree_nodes}
+
+        ancestors = []
+        node = new_subtree.parent
+        while node is not None:
+            ancestors.append(node)
+            node = node.parent
+
+        enabled_nodes = [
+            n
+            for n in get_preorder_nodes(self.tree)
+            if id(n) not in subtree_node_ids
+            and any(
+                e is not None and id(e) in subtree_node_ids
+                for e in get_enabling_nodes(n)
+            )
+        ]
+
+        return subtree_nodes + ancestors + enabled_nodes
+
+    def __update_performances(self, trace_indices: List[int], nodes: List):
+        if len(trace_indices) == 0 or len(nodes) == 0:
+            return
+
+        sublog = [self.log_lifecycle[i] for i in trace_indices]
+        updates = compute_performances_intervals(
+            self.tree, sublog, self.get_alignments(), nodes
+        )
+        for performance, update in zip(self.performances, updates):
+            for node, values in update.items():
+                if node not in performance:
+                    performance[node] = [None for _ in self.log_lifecycle]
+                for i, value in zip(trace_indices, values):
+                    performance[node][i] = value
+
+    @staticmethod
+    def __touches_nodes(alignment, node_ids: Set[int]) -> bool:
+        return any(
+            n is not None and id(n) in node_ids
+            for n in get_alignment_tree_nodes(alignment)
+        )
+
+    @staticmethod
+    def __is_fitting(alignment) -> bool:
+        # log moves and visible model moves are the only moves with costs
+        return all(
+            model_move != ">>" and (log_move != ">>" or model_label is None)
+            for (log_move, model_move), (_, model_label) in alignment
+        )
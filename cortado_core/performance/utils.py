@@ -1,3 +1,6 @@
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
 from pm4py.objects.process_tree.obj import ProcessTree
 
 
@@ -61,3 +64,82 @@ def get_tree_instances(alignment, nodes=None):
             start_idx = starts[t].pop()
             instances.append((start_idx, i))
     return instances
+
+
+class AlignmentIndex:
+    """
+    Index of an alignment on the low-level net that maps each tree node (by id) to the sorted positions of its moves.
+    Additionally, the positions of 'active' moves and of start and complete moves are kept per node, s.t. all
+    position queries of the performance computation are dictionary lookups and binary searches.
+    """
+
+    def __init__(self, alignment):
+        self.alignment = alignment
+        self.tree_nodes = get_alignment_tree_nodes(alignment)
+        self.activities = get_alignment_activities(alignment)
+        self.active_close = get_alignment_tree_lf(alignment)
+
+        self.nodes: Dict[int, ProcessTree] = {}
+        self.positions: Dict[int, List[int]] = {}
+        self.active_positions: Dict[int, List[int]] = {}
+        self.start_positions: Dict[int, List[int]] = {}
+        self.complete_positions: Dict[int, List[int]] = {}
+
+        for i, (node, activity, active_close) in enumerate(
+            zip(self.tree_nodes, self.activities, self.active_close)
+        ):
+            if node is None:
+                continue
+            node_id = id(node)
+            self.nodes[node_id] = node
+            self.positions.setdefault(node_id, []).append(i)
+            if active_close == "active":
+                self.active_positions.setdefault(node_id, []).append(i)
+            if activity and "start" in activity:
+                self.start_positions.setdefault(node_id, []).append(i)
+            if activity and "complete" in activity:
+                self.complete_positions.setdefault(node_id, []).append(i)
+
+    def get_positions(self, node: Optional[ProcessTree]) -> List[int]:
+        if node is None:
+            return [-1]
+        return self.positions.get(id(node), [])
+
+    def get_node_ids_in(self, nodes) -> List[int]:
+        """
+        Returns the ids of the nodes in the alignment that are contained in the given collection (using its notion of
+        equality)
+        """
+        return [node_id for node_id, node in self.nodes.items() if node in nodes]
+
+    def get_first_start_position(self, node_ids: List[int], start: int, end: int):
+        """
+        Returns the smallest start position of the given nodes in [start, end), None if there is no such position
+        """
+        res = None
+        for node_id in node_ids:
+            positions = self.start_positions.get(node_id, [])
+            k = bisect_left(positions, start)
+            if k < len(positions) and positions[k] < end:
+                res = positions[k] if res is None else min(res, positions[k])
+        return res
+
+    def get_last_complete_position(self, node_ids: List[int], start: int, end: int):
+        """
+        Returns the largest complete position of the given nodes in [start, end), None if there is no such position
+        """
+        res = None
+        for node_id in node_ids:
+            positions = self.complete_positions.get(node_id, [])
+            k = bisect_left(positions, end)
+            if k > 0 and positions[k - 1] >= start:
+                res = positions[k - 1] if res is None else max(res, positions[k - 1])
+        return res
+
+
+def get_last_position_before(positions: List[int], position: int) -> Optional[int]:
+    """
+    Returns the largest element of the sorted positions that is smaller than the given position
+    """
+    k = bisect_left(positions, position)
+    return positions[k - 1] if k > 0 else None
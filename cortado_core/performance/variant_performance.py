@@ -1,8 +1,16 @@
 from collections import Counter
 from typing import List, Tuple, Dict, Any
 
+import numpy as np
+from cachetools import LRUCache
+
 from cortado_core.performance.aggregators import stats
+from cortado_core.performance.intervals import (
+    IntervalLogView,
+    microseconds_to_seconds,
+)
 from cortado_core.utils.split_graph import (
+    FrozenGroup,
     Group,
     LeafGroup,
     ParallelGroup,
@@ -10,17 +18,60 @@ from cortado_core.utils.split_graph import (
 )
 from pm4py.objects.log.obj import EventLog, Trace
 from pm4py.objects.log.util.interval_lifecycle import to_interval
-from pm4py.objects.log.util.xes import (
-    DEFAULT_START_TIMESTAMP_KEY,
-    DEFAULT_TIMESTAMP_KEY,
-)
 from pm4py.util.xes_constants import DEFAULT_NAME_KEY
 
 DEFAULT_NAME_KEY_UNIQUE = DEFAULT_NAME_KEY + "_unique"
 
+# maximal number of groups per variant whose activities/timestamps are cached during the performance computation
+VARIANT_GROUPS_CACHE_SIZE = 256
+
+
+class VariantPerformanceContext:
+    """
+    Keeps a columnar view of the traces of a variant and caches the activities and the per-trace timestamp bounds of
+    the (uniquely named) groups of the variant while its performance is computed. The frozen groups are used as keys,
+    i.e., the caches use the structural hashes of the groups, which are only computed once per group. A context
+    belongs to the traces of a single variant and is discarded after the variant's performance is assigned, the groups
+    must not be changed while the context is used.
+    """
+
+    def __init__(self, traces: List[Trace], max_size: int = VARIANT_GROUPS_CACHE_SIZE):
+        self.view = IntervalLogView(traces, activity_key=DEFAULT_NAME_KEY_UNIQUE)
+        self.activities_cache = LRUCache(maxsize=max_size)
+        self.bounds_cache = LRUCache(maxsize=max_size)
+        self.frozen_groups: Dict[int, Tuple[Group, FrozenGroup]] = {}
+
+    def get_all_activities(self, variant: Group) -> List[str]:
+        key = variant.freeze(self.frozen_groups)
+        if key not in self.activities_cache:
+            all_activities = []
+            if isinstance(variant, (SequenceGroup, ParallelGroup)):
+                all_activities = [
+                    e for g in variant for e in self.get_all_activities(g)
+                ]
+            elif isinstance(variant, LeafGroup):
+                all_activities = [e for e in variant]
+            self.activities_cache[key] = all_activities
+
+        return self.activities_cache[key]
+
+    def get_group_bounds(
+        self, variant: Group
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the earliest start and the latest complete timestamp (in microseconds) of the group's events in each
+        trace and whether the trace contains events of the group
+        """
+        key = variant.freeze(self.frozen_groups)
+        if key not in self.bounds_cache:
+            mask = self.view.get_activity_mask(self.get_all_activities(variant))
+            self.bounds_cache[key] = self.view.get_trace_bounds(mask)
+
+        return self.bounds_cache[key]
+
 
 def assign_variants_performances(
-    variants: Dict[int, Tuple[Group, List[Trace], List, Any]]
+    variants: Dict[int, Tuple[Group, List[Trace], List, Any]],
 ):
     for variant, traces, _, info in variants.values():
         if info.is_user_defined:
@@ -30,178 +81,76 @@ def assign_variants_performances(
         v_unique = unique_names(variant)
 
         unique_activity_names(log)
-        assign_wait_time(variant, v_unique, log)
-        assign_variant_service_time(variant, v_unique, log)
+        context = VariantPerformanceContext(log)
+        assign_wait_time(variant, v_unique, context)
+        assign_variant_service_time(variant, v_unique, context)
 
 
 def assign_variant_service_time(
-    variant: Group, variant_unique: Group, traces: List[Trace]
+    variant: Group, variant_unique: Group, context: VariantPerformanceContext
 ):
-    events = get_variant_events(variant_unique, traces)
-    service_times = []
-    for t_events in events:
-        if len(t_events) == 0:
-            continue
-        e_start = min(
-            t_events,
-            key=lambda e: (
-                e[DEFAULT_START_TIMESTAMP_KEY]
-                if DEFAULT_START_TIMESTAMP_KEY in e
-                else e[DEFAULT_TIMESTAMP_KEY]
-            ),
-        )
-        e_end = max(t_events, key=lambda e: e[DEFAULT_TIMESTAMP_KEY])
-
-        t_start = (
-            e_start[DEFAULT_START_TIMESTAMP_KEY]
-            if DEFAULT_START_TIMESTAMP_KEY in e_start
-            else e_start[DEFAULT_TIMESTAMP_KEY]
-        )
-        t_end = e_end[DEFAULT_TIMESTAMP_KEY]
-
-        service_time = (t_end - t_start).total_seconds()
-        service_times.append(service_time)
+    starts, completes, has_events = context.get_group_bounds(variant_unique)
+    service_times = microseconds_to_seconds(completes[has_events] - starts[has_events])
 
     variant.performance["service_time"] = stats(service_times)
 
-    if type(variant) != LeafGroup and len(events) > 0:
+    if type(variant) != LeafGroup and len(context.view) > 0:
         for g, g_unique in zip(variant, variant_unique):
-            assign_variant_service_time(g, g_unique, traces)
+            assign_variant_service_time(g, g_unique, context)
 
 
-def assign_wait_time(variant: Group, variant_unique: Group, traces: List[Trace]):
+def assign_wait_time(
+    variant: Group, variant_unique: Group, context: VariantPerformanceContext
+):
     if type(variant) == SequenceGroup:
         for i in range(variant_unique.list_length() - 1):
             e1 = variant_unique[i]
             e2 = variant_unique[i + 1]
             e2_orig = variant[i + 1]
-            wait_time = get_wait_time_between(e1, e2, traces)
+            wait_time = get_wait_time_between(e1, e2, context)
             e2_orig.performance["wait_time"] = wait_time
 
     if type(variant) == ParallelGroup:
-        assign_wait_times_parallel(variant, variant_unique, traces)
+        assign_wait_times_parallel(variant, variant_unique, context)
 
     if type(variant) != LeafGroup:
         for g, g_unique in zip(variant, variant_unique):
-            assign_wait_time(g, g_unique, traces)
-
-
-def get_wait_time_between(g1: Group, g2: Group, traces: List[Trace]):
-    events_g1 = get_variant_events(g1, traces)
-    events_g2 = get_variant_events(g2, traces)
-
-    wait_times = []
-    for t_events_g1, t_events_g2 in zip(events_g1, events_g2):
-        g1_end = max(t_events_g1, key=lambda e: e[DEFAULT_TIMESTAMP_KEY])
-        g2_start = min(
-            t_events_g2,
-            key=lambda e: (
-                e[DEFAULT_START_TIMESTAMP_KEY]
-                if DEFAULT_START_TIMESTAMP_KEY in e
-                else e[DEFAULT_TIMESTAMP_KEY]
-            ),
-        )
-        wait_time = (
-            g2_start[DEFAULT_START_TIMESTAMP_KEY] - g1_end[DEFAULT_TIMESTAMP_KEY]
-        ).total_seconds()
-        wait_times.append(wait_time)
+            assign_wait_time(g, g_unique, context)
+
+
+def get_wait_time_between(g1: Group, g2: Group, context: VariantPerformanceContext):
+    _, g1_ends, g1_has_events = context.get_group_bounds(g1)
+    g2_starts, _, g2_has_events = context.get_group_bounds(g2)
+    has_events = g1_has_events & g2_has_events
+
+    wait_times = microseconds_to_seconds(g2_starts[has_events] - g1_ends[has_events])
 
     results_dict = stats(wait_times)
     return results_dict
 
 
 def assign_wait_times_parallel(
-    variant: ParallelGroup, variant_unique: ParallelGroup, traces: List[Trace]
+    variant: ParallelGroup,
+    variant_unique: ParallelGroup,
+    context: VariantPerformanceContext,
 ):
-    events = get_variant_events(variant_unique, traces)
-
-    def get_start(trace):
-        start = min(
-            trace,
-            key=lambda e: (
-                e[DEFAULT_START_TIMESTAMP_KEY]
-                if DEFAULT_START_TIMESTAMP_KEY in e
-                else e[DEFAULT_TIMESTAMP_KEY]
-            ),
-        )
-        return (
-            start[DEFAULT_START_TIMESTAMP_KEY]
-            if DEFAULT_START_TIMESTAMP_KEY in start
-            else start[DEFAULT_TIMESTAMP_KEY]
-        )
-
-    def get_end(trace):
-        end = max(trace, key=lambda e: e[DEFAULT_TIMESTAMP_KEY])
-        return end[DEFAULT_TIMESTAMP_KEY]
-
-    start_ends = [(get_start(trace), get_end(trace)) for trace in events]
+    starts, ends, has_events = context.get_group_bounds(variant_unique)
 
     for g, g_unique in zip(variant, variant_unique):
-        events_g = get_variant_events(g_unique, traces)
-
-        wait_times = []
-        wait_times_next = []
-
-        for (start, end), trace_g in zip(start_ends, events_g):
-            start_g = min(
-                trace_g,
-                key=lambda e: (
-                    e[DEFAULT_START_TIMESTAMP_KEY]
-                    if DEFAULT_START_TIMESTAMP_KEY in e
-                    else e[DEFAULT_TIMESTAMP_KEY]
-                ),
-            )
-            end_g = max(trace_g, key=lambda e: e[DEFAULT_TIMESTAMP_KEY])
-
-            t_start_g = (
-                start_g[DEFAULT_START_TIMESTAMP_KEY]
-                if DEFAULT_START_TIMESTAMP_KEY in start_g
-                else start_g[DEFAULT_TIMESTAMP_KEY]
-            )
-            t_end_g = end_g[DEFAULT_TIMESTAMP_KEY]
-
-            wait_times.append((t_start_g - start).total_seconds())
-            wait_times_next.append((end - t_end_g).total_seconds())
+        starts_g, ends_g, has_events_g = context.get_group_bounds(g_unique)
+        has_events_both = has_events & has_events_g
+
+        wait_times = microseconds_to_seconds(
+            starts_g[has_events_both] - starts[has_events_both]
+        )
+        wait_times_next = microseconds_to_seconds(
+            ends[has_events_both] - ends_g[has_events_both]
+        )
 
         g.performance["wait_time_start"] = stats(wait_times)
         g.performance["wait_time_end"] = stats(wait_times_next)
 
 
-variant_events_cache = {}
-
-
-def get_variant_events(variant, traces):
-    cache_key = (str(variant.serialize(include_performance=False)), id(traces))
-    if cache_key in variant_events_cache:
-        return variant_events_cache[cache_key]
-
-    activities = get_all_activities(variant)
-    events = [
-        [e for e in t if e[DEFAULT_NAME_KEY_UNIQUE] in activities] for t in traces
-    ]
-
-    # variant_events_cache[cache_key] = events
-    return events
-
-
-get_all_activities_cache = {}
-
-
-def get_all_activities(variant):
-    cache_key = str(variant.serialize(include_performance=False))
-    if cache_key in get_all_activities_cache:
-        return get_all_activities_cache[cache_key]
-
-    all_activities = []
-    if isinstance(variant, (SequenceGroup, ParallelGroup)):
-        all_activities = [e for g in variant for e in get_all_activities(g)]
-    elif isinstance(variant, LeafGroup):
-        all_activities = [e for e in variant]
-
-    get_all_activities_cache[cache_key] = all_activities
-    return all_activities
-
-
 def unique_activity_names(traces):
     for t in traces:
         counter = Counter()
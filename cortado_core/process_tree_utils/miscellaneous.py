@@ -1,4 +1,4 @@
-from typing import List, Tuple, Set
+from typing import List, Tuple, Set, Any
 
 from pm4py.objects.process_tree.obj import ProcessTree
 from pm4py.objects.process_tree.utils.generic import parse as pt_parse
@@ -9,6 +9,21 @@ def pt_dict_key(pt: ProcessTree) -> Tuple[ProcessTree, int]:
     return pt, id(pt)
 
 
+def get_structural_fingerprint(pt: ProcessTree) -> Tuple[Any, ...]:
+    """
+    returns a hashable representation of the tree's operators and labels. Two trees have the same fingerprint iff they
+    are structurally identical, i.e., comparing fingerprints is a cheap alternative to deep-copying a tree to detect
+    changes
+    :param pt:
+    :return:
+    """
+    return (
+        pt.operator,
+        pt.label,
+        tuple(get_structural_fingerprint(c) for c in pt.children),
+    )
+
+
 def get_index_of_pt_in_children_list(pt: ProcessTree, wanted_child: ProcessTree) -> int:
     for i, c in enumerate(pt.children):
         if c is wanted_child:
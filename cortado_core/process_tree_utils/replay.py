@@ -0,0 +1,207 @@
+from typing import Optional, Sequence, List, Any
+
+from pm4py.objects.process_tree.obj import ProcessTree, Operator
+
+# upper bound for the number of simultaneously reachable tree states. If it is exceeded, the replay is aborted and the
+# caller has to fall back to alignments
+MAX_NUMBER_OF_STATES = 10000
+
+# state of a visible leaf that was executed
+EXECUTED = True
+
+SUPPORTED_OPERATORS = {
+    None,
+    Operator.SEQUENCE,
+    Operator.XOR,
+    Operator.PARALLEL,
+    Operator.LOOP,
+}
+
+
+class ProcessTreeReplayer:
+    """
+    Decides whether a trace is in the language of a process tree by replaying it directly on the tree, i.e., without
+    computing an alignment. The replayer keeps the set of tree states that are reachable after each event. Silent steps,
+    i.e., tau leaves and the opening and closing of operator nodes, are resolved while replaying the next activity.
+    The state of a node is None if the node was not executed yet. Otherwise, it is
+    - EXECUTED for visible leaves,
+    - (i, state of the i-th child) for sequences, choices and loops (loops: 0 is the do-child, i > 0 a redo-child),
+    - a tuple containing the states of all children for parallel nodes.
+    Loops with more than two children are interpreted as loops with a choice over all redo-children.
+    """
+
+    def __init__(self, pt: ProcessTree):
+        self.operators: List[Optional[Operator]] = []
+        self.labels: List[Optional[str]] = []
+        self.children: List[List[int]] = []
+        self.supported = True
+        self.__compile(pt)
+        self.nullable = self.__calculate_nullable()
+        self.__step_cache = {}
+
+    def __compile(self, pt: ProcessTree) -> int:
+        idx = len(self.operators)
+        self.operators.append(pt.operator)
+        self.labels.append(pt.label)
+        self.children.append([])
+        if pt.operator not in SUPPORTED_OPERATORS or (
+            pt.operator is not None and len(pt.children) == 0
+        ):
+            self.supported = False
+
+        self.children[idx] = [self.__compile(c) for c in pt.children]
+
+        return idx
+
+    def __calculate_nullable(self) -> List[bool]:
+        """
+        A node is nullable if it can be executed without executing any visible activity.
+        """
+        nullable = [False] * len(self.operators)
+        # children have higher indices than their parents (preorder), so a reverse iteration is bottom-up
+        for idx in reversed(range(len(self.operators))):
+            operator = self.operators[idx]
+            children = self.children[idx]
+            if operator is None:
+                nullable[idx] = self.labels[idx] is None
+            elif operator == Operator.XOR:
+                nullable[idx] = any(nullable[c] for c in children)
+            elif operator == Operator.LOOP:
+                nullable[idx] = len(children) > 0 and nullable[children[0]]
+            else:
+                nullable[idx] = all(nullable[c] for c in children)
+
+        return nullable
+
+    def accepts(
+        self, activities: Sequence[str], prefix: bool = False
+    ) -> Optional[bool]:
+        """
+        Replays the activities on the process tree.
+        :param activities: sequence of activity labels
+        :param prefix: if True, it is checked whether the activities form a prefix of a trace in the language
+        :return: True if the activities fit the tree, False if not, None if the replay was not possible (unsupported
+        operator or too many reachable states)
+        """
+        if not self.supported:
+            return None
+
+        states = {None}
+        for activity in activities:
+            next_states = set()
+            for state in states:
+                next_states.update(self.__step(0, state, activity))
+
+            if len(next_states) == 0:
+                return False
+            if len(next_states) > MAX_NUMBER_OF_STATES:
+                return None
+
+            states = next_states
+
+        if prefix:
+            # every reachable state of a process tree can be completed
+            return True
+
+        return any(self.__can_finish(0, state) for state in states)
+
+    def __can_finish(self, node: int, state: Any) -> bool:
+        if state is None:
+            return self.nullable[node]
+
+        operator = self.operators[node]
+        children = self.children[node]
+
+        if operator is None:
+            return state is EXECUTED
+        if operator == Operator.PARALLEL:
+            return all(self.__can_finish(c, s) for c, s in zip(children, state))
+
+        i, child_state = state
+        if not self.__can_finish(children[i], child_state):
+            return False
+        if operator == Operator.SEQUENCE:
+            return all(self.nullable[c] for c in children[i + 1 :])
+        if operator == Operator.LOOP and i > 0:
+            return self.nullable[children[0]]
+
+        return True
+
+    def __step(self, node: int, state: Any, activity: str) -> List[Any]:
+        key = (node, state, activity)
+        if key not in self.__step_cache:
+            self.__step_cache[key] = self.__calculate_step(node, state, activity)
+
+        return self.__step_cache[key]
+
+    def __calculate_step(self, node: int, state: Any, activity: str) -> List[Any]:
+        """
+        Calculates all states of the node that are reachable from the given state by executing silent steps and
+        exactly one visible activity
+        """
+        operator = self.operators[node]
+        children = self.children[node]
+
+        if operator is None:
+            if state is None and self.labels[node] == activity:
+                return [EXECUTED]
+            return []
+
+        if operator == Operator.PARALLEL:
+            if state is None:
+                state = (None,) * len(children)
+            res = []
+            for i, c in enumerate(children):
+                for s in self.__step(c, state[i], activity):
+                    res.append(state[:i] + (s,) + state[i + 1 :])
+            return res
+
+        if operator == Operator.XOR:
+            if state is None:
+                return [
+                    (i, s)
+                    for i, c in enumerate(children)
+                    for s in self.__step(c, None, activity)
+                ]
+            i, child_state = state
+            return [(i, s) for s in self.__step(children[i], child_state, activity)]
+
+        if operator == Operator.SEQUENCE:
+            i, child_state = state if state is not None else (0, None)
+            res = [(i, s) for s in self.__step(children[i], child_state, activity)]
+            while i + 1 < len(children) and self.__can_finish(children[i], child_state):
+                i, child_state = i + 1, None
+                res.extend((i, s) for s in self.__step(children[i], None, activity))
+            return res
+
+        # loop
+        i, child_state = state if state is not None else (0, None)
+        res = [(i, s) for s in self.__step(children[i], child_state, activity)]
+        if self.__can_finish(children[i], child_state):
+            visited = set()
+            to_visit = self.__next_loop_children(node, i)
+            while len(to_visit) > 0:
+                j = to_visit.pop()
+                if j in visited:
+                    continue
+                visited.add(j)
+                res.extend((j, s) for s in self.__step(children[j], None, activity))
+                if self.nullable[children[j]]:
+                    to_visit.extend(self.__next_loop_children(node, j))
+        return res
+
+    def __next_loop_children(self, node: int, i: int) -> List[int]:
+        if i == 0:
+            return list(range(1, len(self.children[node])))
+        return [0]
+
+
+def activities_fit_process_tree(
+    activities: Sequence[str], pt: ProcessTree, prefix: bool = False
+) -> Optional[bool]:
+    """
+    Checks whether a sequence of activities is in the language of the process tree (or a prefix of a trace in the
+    language) without computing an alignment. The runtime is roughly linear in the number of activities.
+    :return: True if fitting, False if not fitting, None if the check is not applicable to the tree
+    """
+    return ProcessTreeReplayer(pt).accepts(activities, prefix)
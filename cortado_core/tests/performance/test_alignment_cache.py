@@ -0,0 +1,93 @@
+import unittest
+from multiprocessing import Pool
+from unittest import mock
+
+from pm4py.objects.log.obj import EventLog, Trace, Event
+from pm4py.objects.process_tree.utils.generic import parse
+from pm4py.util.xes_constants import (
+    DEFAULT_NAME_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+    DEFAULT_TRANSITION_KEY,
+)
+
+from cortado_core.performance import tree_performance
+from cortado_core.performance.utils import get_alignment_tree_nodes
+from .test_utils import timestamp
+
+TREE = "->('A',X('B','C'),*('D',tau))"
+
+
+def create_trace(activities):
+    trace = Trace()
+    for i, activity in enumerate(activities):
+        for j, transition in enumerate(["start", "complete"]):
+            trace.append(
+                Event(
+                    {
+                        DEFAULT_NAME_KEY: activity,
+                        DEFAULT_TIMESTAMP_KEY: timestamp(2 * i + j),
+                        DEFAULT_TRANSITION_KEY: transition,
+                    }
+                )
+            )
+    return trace
+
+
+def create_log():
+    return EventLog(
+        [
+            create_trace(["A", "B", "D"]),
+            create_trace(["A", "C", "D", "D"]),
+            create_trace(["A", "E", "D"]),
+            create_trace(["A", "B", "D"]),
+        ]
+    )
+
+
+class TestAlignmentCache(unittest.TestCase):
+    def setUp(self):
+        tree_performance._alignments_cache.clear()
+
+    def test_alignments_are_reused_for_identical_trees(self):
+        log_lifecycle = tree_performance.to_low_level_log(create_log())
+        _, _, fitness = tree_performance.get_all_alignments(parse(TREE), log_lifecycle)
+
+        pt = parse(TREE)
+        with mock.patch.object(tree_performance, "align_variants") as align_variants:
+            alignments, _, cached_fitness = tree_performance.get_all_alignments(
+                pt, log_lifecycle
+            )
+            align_variants.assert_not_called()
+
+        self.assertEqual(fitness, cached_fitness)
+        self.assertEqual(3, len(alignments))
+        nodes = {id(n) for n in tree_performance.get_preorder_nodes(pt)}
+        for variant_alignments in alignments.values():
+            for alignment in variant_alignments:
+                for node in get_alignment_tree_nodes(alignment):
+                    self.assertTrue(node is None or id(node) in nodes)
+
+    def test_alignment_params_are_not_mutated(self):
+        log_lifecycle = tree_performance.to_low_level_log(create_log())
+        alignment_params = {}
+        tree_performance.get_all_alignments(
+            parse(TREE),
+            log_lifecycle,
+            alignment_time_limit=10,
+            alignment_params=alignment_params,
+        )
+
+        self.assertEqual({}, alignment_params)
+
+    def test_pool_results_match_serial_results(self):
+        log_lifecycle = tree_performance.to_low_level_log(create_log())
+        _, _, fitness = tree_performance.get_all_alignments(parse(TREE), log_lifecycle)
+        tree_performance._alignments_cache.clear()
+
+        with Pool(2) as pool:
+            alignments, _, pool_fitness = tree_performance.get_all_alignments(
+                parse(TREE), log_lifecycle, pool=pool
+            )
+
+        self.assertEqual(fitness, pool_fitness)
+        self.assertEqual(3, len(alignments))
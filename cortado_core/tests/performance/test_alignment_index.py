@@ -0,0 +1,57 @@
+import unittest
+
+from pm4py.objects.process_tree.obj import ProcessTree
+
+from cortado_core.performance.utils import (
+    AlignmentIndex,
+    get_all_indices,
+    get_alignment_tree_nodes,
+    get_last_position_before,
+)
+
+A = ProcessTree(label="A")
+B = ProcessTree(label="B")
+SEQ = ProcessTree(children=[A, B])
+
+
+def move(node, status, label):
+    return (("t", (node, status)), (label, label))
+
+
+ALIGNMENT = [
+    move(SEQ, "active", None),
+    move(A, "active+closed", "A_start"),
+    move(A, "active+closed", "A_complete"),
+    (("X_start", ">>"), ("X_start", ">>")),
+    move(B, "active+closed", "B_start"),
+    move(B, "active+closed", "B_complete"),
+    move(SEQ, "closed", None),
+]
+
+
+class TestAlignmentIndex(unittest.TestCase):
+    def test_positions_match_linear_scan(self):
+        index = AlignmentIndex(ALIGNMENT)
+        tree_nodes = get_alignment_tree_nodes(ALIGNMENT)
+
+        for node in [SEQ, A, B, None]:
+            self.assertEqual(
+                get_all_indices(tree_nodes, node), index.get_positions(node)
+            )
+        self.assertEqual([0], index.active_positions[id(SEQ)])
+
+    def test_binary_searches(self):
+        index = AlignmentIndex(ALIGNMENT)
+        child_ids = index.get_node_ids_in({A, B})
+
+        self.assertEqual(1, index.get_first_start_position(child_ids, 0, 6))
+        self.assertEqual(4, index.get_first_start_position(child_ids, 2, 6))
+        self.assertIsNone(index.get_first_start_position(child_ids, 5, 6))
+        self.assertEqual(5, index.get_last_complete_position(child_ids, 0, 6))
+        self.assertEqual(2, index.get_last_complete_position(child_ids, 0, 5))
+        self.assertEqual(2, get_last_position_before([-1, 2, 5], 4))
+        self.assertIsNone(get_last_position_before([3], 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from pm4py.objects.log.obj import Event, Trace
+from pm4py.objects.log.util.xes import (
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+)
+
+from cortado_core.performance.aggregators import avg, stats
+from cortado_core.performance.intervals import (
+    IntervalColumns,
+    IntervalLogView,
+    to_microseconds,
+)
+from cortado_core.utils.timestamp_utils import TimeUnit, transform_timestamp
+from cortado_core.performance.tree_performance import (
+    apply_aggregation_intervals,
+    decide_aggregator,
+)
+
+
+def ts(hour, tz=timezone.utc):
+    return datetime(2020, 1, 1, hour, tzinfo=tz)
+
+
+# case -> alignment -> instance -> interval(s)
+VALUES = [
+    [[(ts(1), ts(5, timezone(timedelta(hours=2)))), (ts(2), None)], None],
+    None,
+    [[[[ts(1), ts(2)], [ts(3), ts(5)]], []]],
+]
+
+
+def max_ignore_none(values):
+    return max([v for v in values if v is not None], default=None)
+
+
+class TestIntervalColumns(unittest.TestCase):
+    def test_offsets(self):
+        columns = IntervalColumns(VALUES)
+
+        self.assertEqual([0, 1, 2, 4, 4], columns.interval_offsets.tolist())
+        self.assertEqual([0, 2, 2, 4], columns.alignment_offsets.tolist())
+        self.assertEqual([True, False, True], columns.alignment_valid.tolist())
+        self.assertEqual([0, 2, 3], columns.case_offsets.tolist())
+
+    def test_instance_values(self):
+        values = IntervalColumns(VALUES).get_instance_values()
+
+        self.assertEqual(7200, values[0])
+        self.assertTrue(np.isnan(values[1]))
+        self.assertEqual(10800, values[2])
+        self.assertTrue(np.isnan(values[3]))
+
+    def test_numeric_intervals(self):
+        values = IntervalColumns([[[(1, 3), (2, None)]]]).get_instance_values()
+
+        self.assertEqual(2, values[0])
+        self.assertTrue(np.isnan(values[1]))
+
+    def test_aggregation_matches_list_based_aggregation(self):
+        # avg has a segmented version, the maximum is aggregated on lists
+        for instances_aggregator in [avg, max_ignore_none]:
+            expected = stats(
+                [
+                    avg(
+                        [
+                            decide_aggregator(instances, instances_aggregator)
+                            for instances in alignments
+                        ]
+                    )
+                    for alignments in VALUES
+                    if alignments is not None
+                ]
+            )
+            self.assertEqual(
+                expected,
+                apply_aggregation_intervals(VALUES, stats, avg, instances_aggregator),
+            )
+
+    def test_stats_of_array(self):
+        self.assertEqual(
+            stats([1, None, 2, 6]), stats(np.array([1, np.nan, 2, 6], dtype=float))
+        )
+
+
+def create_trace(intervals):
+    trace = Trace()
+    for name, start, end in intervals:
+        event = Event()
+        event["concept:name"] = name
+        if start is not None:
+            event[DEFAULT_START_TIMESTAMP_KEY] = start
+        event[DEFAULT_TIMESTAMP_KEY] = end
+        trace.append(event)
+    return trace
+
+
+class TestIntervalLogView(unittest.TestCase):
+    def test_timestamps_are_truncated_like_transform_timestamp(self):
+        timestamp = datetime(
+            2021, 3, 17, 13, 45, 31, 123456, tzinfo=timezone(timedelta(hours=-5))
+        )
+        epoch = datetime(1970, 1, 1)
+
+        for granularity in TimeUnit:
+            expected = (
+                transform_timestamp(timestamp, granularity) - epoch
+            ) // timedelta(microseconds=1)
+            self.assertEqual(expected, to_microseconds([timestamp], granularity)[0])
+
+    def test_columns(self):
+        view = IntervalLogView(
+            [
+                create_trace([("a", ts(1), ts(2)), ("b", None, ts(4))]),
+                create_trace([]),
+                create_trace([("b", ts(2), ts(3))]),
+            ]
+        )
+
+        self.assertEqual(["a", "b"], view.activities)
+        self.assertEqual([0, 1, 1], view.activity_codes.tolist())
+        self.assertEqual([0, 2, 2, 3], view.trace_offsets.tolist())
+        self.assertEqual([0, 0, 2], view.get_trace_indices().tolist())
+        # events without start timestamp start at their complete timestamp
+        self.assertEqual(view.completes[1], view.starts[1])
+
+    def test_trace_bounds(self):
+        view = IntervalLogView(
+            [
+                create_trace([("a", ts(1), ts(2)), ("b", ts(3), ts(5))]),
+                create_trace([("a", ts(2), ts(4))]),
+            ]
+        )
+
+        starts, completes, has_events = view.get_trace_bounds(
+            view.get_activity_mask(["b"])
+        )
+
+        self.assertEqual([True, False], has_events.tolist())
+        self.assertEqual(2 * 3600, (completes[0] - starts[0]) / 10**6)
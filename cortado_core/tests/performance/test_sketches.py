@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from cortado_core.performance.aggregators import stats
+from cortado_core.performance.sketches import QuantileSketch, StatsSketch
+
+
+class TestStatsSketch(unittest.TestCase):
+    def test_small_inputs_are_exact(self):
+        values = [3.0, None, 1.0, 7.5, 2.0]
+
+        expected = stats(values)
+        actual = stats(values, use_sketch=True)
+
+        self.assertEqual(expected.keys(), actual.keys())
+        for key in expected:
+            self.assertAlmostEqual(expected[key], actual[key])
+
+    def test_no_values(self):
+        self.assertIsNone(stats([None, None], use_sketch=True))
+        self.assertIsNone(stats([], use_sketch=True))
+
+    def test_merged_chunks(self):
+        values = np.random.default_rng(42).exponential(100, 50000)
+        sketch = StatsSketch()
+        for chunk in np.array_split(values, 16):
+            sketch.merge(StatsSketch().update(chunk))
+
+        expected = stats(values)
+        actual = sketch.to_stats()
+
+        # counts and moments are exact
+        self.assertEqual(expected["n"], actual["n"])
+        self.assertEqual(expected["min"], actual["min"])
+        self.assertEqual(expected["max"], actual["max"])
+        self.assertAlmostEqual(expected["mean"], actual["mean"])
+        self.assertAlmostEqual(expected["stdev"], actual["stdev"])
+
+        # quantiles are approximated, i.e., their rank error is small
+        for key, quantile in [("median", 0.5), ("95th", 0.95)]:
+            self.assertLess(abs(np.mean(values <= actual[key]) - quantile), 0.02)
+
+    def test_quantile_sketch_is_bounded(self):
+        sketch = QuantileSketch(size=50)
+        for chunk in np.array_split(np.arange(100000, dtype=float), 100):
+            sketch.update(chunk)
+
+        self.assertEqual(100000, sketch.n)
+        self.assertLess(sum(len(level) for level in sketch.levels), 500)
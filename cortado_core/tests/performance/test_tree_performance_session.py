@@ -0,0 +1,59 @@
+import unittest
+from unittest import mock
+
+from pm4py.objects.process_tree.utils.generic import parse
+
+from cortado_core.performance import tree_performance, tree_performance_session
+from cortado_core.performance.tree_performance_session import TreePerformanceSession
+from .test_alignment_cache import create_log
+
+TREE = "->('A',X('B','C'),*('D',tau))"
+
+
+class TestTreePerformanceSession(unittest.TestCase):
+    def test_initial_performances_match_tree_performance(self):
+        session = TreePerformanceSession(parse(TREE), create_log())
+        performances, fitness = session.get_performances()
+
+        _, _, expected_fitness = tree_performance.get_all_alignments(
+            parse(TREE), session.log_lifecycle
+        )
+        self.assertAlmostEqual(expected_fitness, fitness)
+        self.assertEqual(
+            tree_performance.compute_performances_intervals(
+                session.tree, session.log_lifecycle, session.get_alignments()
+            ),
+            performances,
+        )
+
+    def test_replace_subtree_matches_full_recomputation(self):
+        session = TreePerformanceSession(parse(TREE), create_log())
+        choice = session.tree.children[1]
+        performances, fitness = session.replace_subtree(choice, parse("X('B','E')"))
+
+        _, _, expected_fitness = tree_performance.get_all_alignments(
+            session.tree, session.log_lifecycle
+        )
+        self.assertAlmostEqual(expected_fitness, fitness)
+        self.assertEqual(
+            tree_performance.compute_performances_intervals(
+                session.tree, session.log_lifecycle, session.get_alignments()
+            ),
+            performances,
+        )
+
+    def test_only_affected_variants_are_realigned(self):
+        session = TreePerformanceSession(parse(TREE), create_log())
+        choice = session.tree.children[1]
+        b = choice.children[0]
+
+        with mock.patch.object(
+            tree_performance_session,
+            "get_variant_alignments",
+            wraps=tree_performance.get_variant_alignments,
+        ) as get_variant_alignments:
+            session.replace_subtree(b, parse("'F'"))
+
+        # A,B,D executes B and A,E,D does not fit, A,C,D,D fits without executing B
+        realigned_variants = get_variant_alignments.call_args[0][1]
+        self.assertEqual(2, len(realigned_variants))
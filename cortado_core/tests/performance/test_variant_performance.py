@@ -0,0 +1,73 @@
+import unittest
+from datetime import datetime
+
+from pm4py.objects.log.obj import EventLog, Trace, Event
+from pm4py.objects.log.util.xes import (
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+)
+
+from cortado_core.performance import variant_performance
+from cortado_core.performance.variant_performance import (
+    VariantPerformanceContext,
+    unique_activity_names,
+    unique_names,
+)
+from cortado_core.utils.cvariants import get_concurrency_variants
+
+
+class VariantInfo:
+    is_user_defined = False
+
+
+def create_trace(intervals):
+    trace = Trace()
+    for name, start, end in intervals:
+        event = Event()
+        event["concept:name"] = name
+        event[DEFAULT_START_TIMESTAMP_KEY] = datetime(2020, 1, 1, start)
+        event[DEFAULT_TIMESTAMP_KEY] = datetime(2020, 1, 1, end)
+        trace.append(event)
+    return trace
+
+
+def create_log():
+    return EventLog(
+        [
+            create_trace([("a", 1, 2), ("b", 3, 5), ("c", 4, 6)]),
+            create_trace([("a", 1, 3), ("b", 4, 5), ("c", 4, 7)]),
+        ]
+    )
+
+
+class TestVariantPerformance(unittest.TestCase):
+    def test_assign_variants_performances(self):
+        variants = get_concurrency_variants(create_log())
+        self.assertEqual(1, len(variants))
+        variant, traces = list(variants.items())[0]
+
+        variant_performance.assign_variants_performances(
+            {0: (variant, traces, [], VariantInfo())}
+        )
+
+        self.assertEqual(5.5 * 3600, variant.performance["service_time"]["mean"])
+        self.assertEqual(1.5 * 3600, variant[0].performance["service_time"]["mean"])
+        self.assertEqual(3600, variant[1].performance["wait_time"]["mean"])
+
+    def test_context_caches_group_bounds(self):
+        variants = get_concurrency_variants(create_log())
+        variant, traces = list(variants.items())[0]
+        log = EventLog(traces)
+        unique_activity_names(log)
+        variant_unique = unique_names(variant)
+
+        context = VariantPerformanceContext(log, max_size=2)
+        starts, completes, has_events = context.get_group_bounds(variant_unique[1])
+
+        self.assertIs(starts, context.get_group_bounds(variant_unique[1])[0])
+        self.assertEqual([True, True], has_events.tolist())
+        self.assertEqual([3 * 3600, 3 * 3600], ((completes - starts) / 10**6).tolist())
+
+        for g in variant_unique:
+            context.get_group_bounds(g)
+        self.assertLessEqual(len(context.bounds_cache), 2)
@@ -1,9 +1,20 @@
+import math
 import unittest
+from collections import OrderedDict
 
 from pm4py.objects.log.obj import EventLog, Trace, Event
 from pm4py.objects.process_tree.utils.generic import parse
 
 from cortado_core.freezing.apply import add_trace_to_pt_language_with_freezing
+from cortado_core.freezing.project_log import project_log
+from cortado_core.freezing.reinsert_frozen_subtrees import (
+    calculate_execution_numbers,
+    activity_zero_times_replayable,
+    activity_one_times_replayable,
+    activity_multiple_times_replayable,
+)
+from cortado_core.process_tree_utils.miscellaneous import pt_dict_key
+from cortado_core.tests.test_infix_alignments import generate_test_trace
 
 
 class TestFreezing(unittest.TestCase):
@@ -114,6 +125,65 @@ class TestFreezing(unittest.TestCase):
         self.assertEqual(parse("->('a', 'd')"), resulting_pt)
         self.assertEqual(frozen_subtrees, res_frozen_subtrees)
 
+    def test_project_log_incrementally_replaces_frozen_subtrees(self):
+        pt = parse("->('a', X('b', 'c'), +('d', 'e'))")
+        frozen_1 = pt.children[1]
+        frozen_2 = pt.children[2]
+        frozen_subtrees = OrderedDict(
+            [(pt_dict_key(frozen_1), "X"), (pt_dict_key(frozen_2), "Y")]
+        )
+        log = EventLog([generate_test_trace("abed"), generate_test_trace("acde")])
+
+        incremental_logs, final_log = project_log(pt, log, frozen_subtrees)
+
+        def to_tuples(projected_log):
+            return [
+                tuple(e["concept:name"] for e in trace.trace) for trace in projected_log
+            ]
+
+        self.assertEqual(
+            [
+                ("a", "X+ACTIVATED", "X+CLOSED", "e", "d"),
+                ("a", "X+ACTIVATED", "X+CLOSED", "d", "e"),
+            ],
+            to_tuples(incremental_logs[frozenset([pt_dict_key(frozen_1)])]),
+        )
+        expected_final_log = [
+            ("a", "X+ACTIVATED", "X+CLOSED", "Y+ACTIVATED", "Y+CLOSED"),
+            ("a", "X+ACTIVATED", "X+CLOSED", "Y+ACTIVATED", "Y+CLOSED"),
+        ]
+        self.assertEqual(
+            expected_final_log,
+            to_tuples(
+                incremental_logs[
+                    frozenset([pt_dict_key(frozen_1), pt_dict_key(frozen_2)])
+                ]
+            ),
+        )
+        self.assertEqual(expected_final_log, to_tuples(final_log))
+
+    def test_calculate_execution_numbers_matches_alignment_based_checks(self):
+        trees = [
+            "->('a', 'X')",
+            "X('a', 'X')",
+            "*('X', tau)",
+            "*(tau, 'X')",
+            "+('X', X('X', tau))",
+            "*(X('a', tau), ->('b', X('X', tau)))",
+            "->(X('a', 'b'), +('c', 'd'))",
+        ]
+        for tree in trees:
+            pt = parse(tree)
+            expected = set()
+            if activity_zero_times_replayable(pt, "X"):
+                expected.add(0)
+            if activity_one_times_replayable(pt, "X"):
+                expected.add(1)
+                if activity_multiple_times_replayable(pt, "X"):
+                    expected.add(math.inf)
+
+            self.assertEqual(expected, calculate_execution_numbers(pt, "X"), tree)
+
 
 if __name__ == "__main__":
     unittest.main()
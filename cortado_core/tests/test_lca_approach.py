@@ -6,7 +6,10 @@ from pm4py.objects.log.obj import EventLog, Event, Trace
 from pm4py.objects.process_tree.obj import Operator
 from pm4py.objects.process_tree.utils.generic import parse as pt_parse, tree_sort
 
-from cortado_core.lca_approach import add_trace_to_pt_language
+from cortado_core.lca_approach import (
+    add_trace_to_pt_language,
+    add_traces_to_pt_language,
+)
 from cortado_core.models.infix_type import InfixType
 from cortado_core.tests.test_infix_alignments import generate_test_trace
 from cortado_core.utils.alignment_utils import typed_trace_fits_process_tree
@@ -288,3 +291,104 @@ class LCA_Approach_Tests(unittest.TestCase):
             added.append(trace_to_add)
             for i2, trace in enumerate(added):
                 self.assertTrue(typed_trace_fits_process_tree(trace, tree))
+
+    def test_add_single_trace_with_batch_insertion(self):
+        tree = pt_parse("->('a', *(->('b', X('c', tau), 'd', X('e', tau)), tau), 'f')")
+
+        trace_to_add = generate_test_trace("abcdebcf")
+        previously_added_traces = EventLog([generate_test_trace("abdf")])
+        new_tree = add_traces_to_pt_language(
+            tree,
+            previously_added_traces,
+            EventLog([trace_to_add]),
+            try_pulling_lca_down=True,
+            add_artificial_start_end=False,
+        )
+        expected_tree = pt_parse(
+            "->('a', *(->('b', X(tau, 'c'), X(tau, ->('d', X(tau, 'e')))), tau), 'f')"
+        )
+
+        self.assertEqual(tree_sort(expected_tree), tree_sort(new_tree))
+
+    def test_add_multiple_traces_with_same_lca(self):
+        tree = pt_parse("->('a', 'b', 'c', 'd')")
+        previously_added = EventLog([generate_test_trace("abcd")])
+        traces_to_add = EventLog(
+            [
+                generate_test_trace("abxcd"),
+                generate_test_trace("abycd"),
+                generate_test_trace("abxcd"),
+                generate_test_trace("abcd"),
+            ]
+        )
+
+        new_tree = add_traces_to_pt_language(
+            tree,
+            previously_added,
+            traces_to_add,
+            add_artificial_start_end=False,
+        )
+
+        for trace in list(previously_added) + list(traces_to_add):
+            self.assertTrue(
+                typed_trace_fits_process_tree(
+                    TypedTrace(trace, InfixType.NOT_AN_INFIX), new_tree
+                )
+            )
+
+    def test_batch_insertion_with_process_pool(self):
+        traces_to_add = EventLog(
+            [
+                generate_test_trace("abxcd"),
+                generate_test_trace("abycd"),
+                generate_test_trace("axbcd"),
+                generate_test_trace("abcdz"),
+            ]
+        )
+
+        def add_traces(pool):
+            return add_traces_to_pt_language(
+                pt_parse("->('a', 'b', 'c', 'd')"),
+                EventLog([generate_test_trace("abcd")]),
+                traces_to_add,
+                add_artificial_start_end=False,
+                pool=pool,
+            )
+
+        with Pool() as pool:
+            tree = add_traces(pool)
+
+        # the alignments computed by the pool are reused by the repair step
+        self.assertEqual(tree_sort(add_traces(None)), tree_sort(tree))
+
+    def test_random_traces_batch_insertion(self):
+        random.seed(10)
+
+        def generate_random_trace(max_length: int, labels: list[str]):
+            trace = Trace()
+            length = random.randint(0, max_length)
+            for i in range(length):
+                label = labels[random.randint(0, len(labels) - 1)]
+                e = Event()
+                e["concept:name"] = label
+                trace.append(e)
+
+            return TypedTrace(trace, InfixType(random.randint(1, 4)))
+
+        tree = pt_parse("->('a', 'b', +('c', 'd'))")
+        log = [
+            generate_random_trace(8, ["a", "b", "c", "d", "e", "f"]) for _ in range(10)
+        ]
+
+        with Pool() as pool:
+            tree = add_traces_to_pt_language(
+                tree,
+                [],
+                log,
+                try_pulling_lca_down=True,
+                add_artificial_start_end=False,
+                pool=pool,
+            )
+
+        for trace in log:
+            self.assertTrue(typed_trace_fits_process_tree(trace, tree))
@@ -1,13 +1,22 @@
+import copy
 import unittest
+from multiprocessing import Pool
+
 from cortado_core.model_repair.algorithm import (
     Sublog,
     Subtrace,
+    VariantAlignments,
+    add_loops,
     align_subtraces,
+    alignment_fits,
     group_into_sublogs,
+    repair_petri_net_with_log,
 )
 from pm4py.objects.log.obj import EventLog, Event, Trace
 from pm4py.objects.petri_net.obj import PetriNet, Marking
 from pm4py.objects.petri_net.utils import petri_utils
+from pm4py.objects.process_tree.utils.generic import parse
+from pm4py.objects.conversion.process_tree.converter import apply as pt_to_net
 
 p1 = PetriNet.Place("p1")
 p2 = PetriNet.Place("p2")
@@ -98,3 +107,105 @@ class ModelRepairTests(unittest.TestCase):
         sublog2 = Sublog(frozenset({sub4}), frozenset({p1, p4}))
 
         assert sublogs == {sublog1, sublog2}
+
+    def test_variant_alignments_reuse_fitting_alignments(self):
+        pt_net, pt_im, pt_fm = pt_to_net(parse("->('a', X('b', 'c'), 'd')"))
+        variant_log = EventLog(
+            [Trace([a, b, d]), Trace([a, b, d]), Trace([a, c, d]), Trace([a, e, d])]
+        )
+
+        variant_alignments = VariantAlignments(variant_log)
+        self.assertEqual([2, 1, 1], variant_alignments.counts)
+
+        alignments = variant_alignments.align(pt_net, pt_im, pt_fm)
+        self.assertEqual([True, True, False], [alignment_fits(a) for a in alignments])
+
+        fitting_alignment = alignments[0]
+        deviating_alignment = alignments[2]
+        alignments = variant_alignments.align(pt_net, pt_im, pt_fm)
+        self.assertIs(fitting_alignment, alignments[0])
+        self.assertIsNot(deviating_alignment, alignments[2])
+
+        t_b_in_net = [t for t in pt_net.transitions if t.label == "b"][0]
+        variant_alignments.invalidate({t_b_in_net})
+        self.assertIsNone(variant_alignments.alignments[0])
+        self.assertIs(alignments[1], variant_alignments.alignments[1])
+
+    def test_repair_petri_net_with_log(self):
+        pt_net, pt_im, pt_fm = pt_to_net(parse("->('a', X('b', 'c'), 'd')"))
+        repair_log = EventLog(
+            [Trace([a, b, d]), Trace([a, e, c, d]), Trace([a, e, c, d]), Trace([a, d])]
+        )
+
+        repair_petri_net_with_log(pt_net, pt_im, pt_fm, repair_log)
+
+        alignments = VariantAlignments(repair_log).align(pt_net, pt_im, pt_fm)
+        self.assertTrue(all(alignment_fits(a) for a in alignments))
+
+    def test_subtrace_decomposition_of_long_subtraces(self):
+        prefix = tuple(f"x{i}" for i in range(30))
+        suffix = tuple(f"y{i}" for i in range(30))
+        long_trace = prefix + tuple("cd") + suffix
+        subtraces_test = {
+            Subtrace(long_trace, frozenset({p1})),
+            Subtrace(tuple("cd"), frozenset({p2})),
+        }
+
+        decomposed_subtraces = {
+            frozenset({subtrace.trace for subtrace in eq_class})
+            for eq_class in align_subtraces(subtraces_test)
+        }
+
+        self.assertEqual(
+            {
+                frozenset({tuple("cd")}),
+                frozenset({prefix}),
+                frozenset({suffix}),
+            },
+            decomposed_subtraces,
+        )
+
+    def test_add_loops_in_parallel(self):
+        sublogs = set()
+        pt_net, _, _ = pt_to_net(parse("->('a', 'b', 'c', 'd')"))
+        for trace, after in [(tuple("ab"), "b"), (tuple("bc"), "c")]:
+            location = frozenset(
+                [
+                    list(t.out_arcs)[0].target
+                    for t in pt_net.transitions
+                    if t.label == after
+                ]
+            )
+            sublogs.add(Sublog(frozenset([Subtrace(trace, location)]), location))
+
+        # the sublogs reference the places of the net, i.e., they are copied together
+        net_parallel, sublogs_parallel = copy.deepcopy((pt_net, sublogs))
+        net_sequential, sublogs_sequential = copy.deepcopy((pt_net, sublogs))
+        with Pool(2) as pool:
+            added_parallel = add_loops(net_parallel, sublogs_parallel, pool=pool)
+        added_sequential = add_loops(net_sequential, sublogs_sequential)
+
+        def get_loop_arcs(transitions):
+            return sorted(
+                (
+                    tuple(sorted(arc.target.name for arc in t.out_arcs)),
+                    tuple(sorted(arc.source.name for arc in t.in_arcs)),
+                )
+                for t in transitions
+            )
+
+        def get_arcs(net):
+            # added transitions have random names, they are compared by their labels
+            return sorted(
+                (
+                    (arc.source.name, str(arc.target.label))
+                    if isinstance(arc.source, PetriNet.Place)
+                    else (str(arc.source.label), arc.target.name)
+                )
+                for arc in net.arcs
+            )
+
+        self.assertEqual(2, len(added_parallel))
+        self.assertEqual(get_loop_arcs(added_parallel), get_loop_arcs(added_sequential))
+        self.assertEqual(get_arcs(net_parallel), get_arcs(net_sequential))
+        self.assertEqual(len(pt_net.transitions) + 2, len(net_parallel.transitions))
@@ -0,0 +1,77 @@
+import random
+import unittest
+
+from pm4py.objects.process_tree.utils.generic import parse as pt_parse
+
+from cortado_core.models.infix_type import InfixType
+from cortado_core.process_tree_utils.replay import activities_fit_process_tree
+from cortado_core.tests.test_infix_alignments import generate_test_trace
+from cortado_core.utils.alignment_utils import (
+    alignment_contains_deviation,
+    calculate_alignment_typed_trace,
+)
+from cortado_core.utils.trace import TypedTrace
+
+
+class TestTreeReplay(unittest.TestCase):
+    def test_sequence(self):
+        tree = pt_parse("->('a', 'b', 'c')")
+
+        self.assertTrue(activities_fit_process_tree(list("abc"), tree))
+        self.assertFalse(activities_fit_process_tree(list("ab"), tree))
+        self.assertFalse(activities_fit_process_tree(list("acb"), tree))
+        self.assertTrue(activities_fit_process_tree(list("ab"), tree, prefix=True))
+
+    def test_choice_and_tau(self):
+        tree = pt_parse("->('a', X('b', tau), 'c')")
+
+        self.assertTrue(activities_fit_process_tree(list("abc"), tree))
+        self.assertTrue(activities_fit_process_tree(list("ac"), tree))
+        self.assertFalse(activities_fit_process_tree(list("abbc"), tree))
+
+    def test_parallel(self):
+        tree = pt_parse("+('a', ->('b', 'c'), 'd')")
+
+        self.assertTrue(activities_fit_process_tree(list("bacd"), tree))
+        self.assertTrue(activities_fit_process_tree(list("bdca"), tree))
+        self.assertFalse(activities_fit_process_tree(list("cbad"), tree))
+        self.assertFalse(activities_fit_process_tree(list("abc"), tree))
+
+    def test_loop_with_silent_children(self):
+        tree = pt_parse("*(X('a', tau), tau)")
+
+        self.assertTrue(activities_fit_process_tree([], tree))
+        self.assertTrue(activities_fit_process_tree(list("aaaa"), tree))
+
+        tree = pt_parse("->('a', *('b', 'c', 'd'), 'e')")
+
+        self.assertTrue(activities_fit_process_tree(list("abcbdbe"), tree))
+        self.assertFalse(activities_fit_process_tree(list("abcde"), tree))
+
+    def test_random_traces_match_alignments(self):
+        random.seed(42)
+        trees = [
+            "->('a', *(->('b', X('c', tau), 'd', X('e', tau)), tau), 'f')",
+            "+(*('a', 'b'), X('c', ->('d', 'e')), tau)",
+            "X(->('a', +('b', 'c')), *(tau, 'd'), ->('e', 'f'))",
+            "*(+('a', X('b', tau)), ->('c', 'd'))",
+        ]
+
+        for tree_string in trees:
+            tree = pt_parse(tree_string)
+            for _ in range(30):
+                length = random.randint(0, 7)
+                activities = "".join(random.choice("abcdef") for _ in range(length))
+                for infix_type in [InfixType.NOT_AN_INFIX, InfixType.PREFIX]:
+                    trace = TypedTrace(generate_test_trace(activities), infix_type)
+                    alignment = calculate_alignment_typed_trace(tree, trace)
+
+                    self.assertEqual(
+                        not alignment_contains_deviation(alignment),
+                        activities_fit_process_tree(
+                            list(activities),
+                            tree,
+                            prefix=infix_type == InfixType.PREFIX,
+                        ),
+                        (tree_string, activities, infix_type),
+                    )
@@ -0,0 +1,97 @@
+import datetime
+import unittest
+
+from pm4py.util.xes_constants import (
+    DEFAULT_NAME_KEY,
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+)
+
+from cortado_core.utils.cgroups_graph import cgroups_graph
+from cortado_core.utils.timestamp_utils import TimeUnit
+
+BASE = datetime.datetime(2023, 1, 1)
+
+
+def create_event(activity, start, complete):
+    return {
+        DEFAULT_NAME_KEY: activity,
+        DEFAULT_START_TIMESTAMP_KEY: BASE + datetime.timedelta(seconds=start),
+        DEFAULT_TIMESTAMP_KEY: BASE + datetime.timedelta(seconds=complete),
+    }
+
+
+class TestCGroupsGraph(unittest.TestCase):
+    def test_sequence_with_concurrency(self):
+        # a -> (b || c) -> d
+        trace = [
+            create_event("d", 10, 11),
+            create_event("a", 0, 1),
+            create_event("b", 2, 5),
+            create_event("c", 3, 4),
+        ]
+        graph = cgroups_graph(trace, TimeUnit.SEC)
+
+        self.assertEqual({"a", "b", "c", "d"}, graph.events)
+        self.assertEqual({("b", "c")}, graph.concurrency_pairs)
+        self.assertEqual(
+            {("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")}, graph.directly_follows
+        )
+        self.assertEqual(
+            {("a", "b"), ("a", "c"), ("a", "d"), ("b", "d"), ("c", "d")},
+            set(graph.follows),
+        )
+        self.assertEqual(5, len(graph.follows))
+        self.assertIn(("a", "d"), graph.follows)
+        self.assertNotIn(("d", "a"), graph.follows)
+        self.assertNotIn(("b", "c"), graph.follows)
+        self.assertEqual({"a"}, graph.start_activities)
+        self.assertEqual({"d"}, graph.end_activities)
+
+    def test_directly_follows_stops_at_completed_successor(self):
+        # b completes before c starts, so c only directly follows b
+        trace = [
+            create_event("a", 0, 1),
+            create_event("b", 2, 3),
+            create_event("c", 4, 5),
+        ]
+        graph = cgroups_graph(trace, TimeUnit.SEC)
+
+        self.assertEqual({("a", "b"), ("b", "c")}, graph.directly_follows)
+        self.assertEqual({("a", "b"), ("a", "c"), ("b", "c")}, set(graph.follows))
+
+    def test_time_granularity_and_input_not_modified(self):
+        trace = [
+            create_event("a", 0, 10),
+            create_event("b", 30, 40),
+        ]
+        timestamps = [
+            (e[DEFAULT_START_TIMESTAMP_KEY], e[DEFAULT_TIMESTAMP_KEY]) for e in trace
+        ]
+
+        graph = cgroups_graph(trace, TimeUnit.MIN)
+
+        self.assertEqual({("a", "b")}, graph.concurrency_pairs)
+        self.assertEqual(0, len(graph.follows))
+        self.assertEqual({"a", "b"}, graph.start_activities)
+        self.assertEqual({"a", "b"}, graph.end_activities)
+        self.assertEqual(
+            timestamps,
+            [(e[DEFAULT_START_TIMESTAMP_KEY], e[DEFAULT_TIMESTAMP_KEY]) for e in trace],
+        )
+
+    def test_duplicate_activities(self):
+        trace = [
+            create_event("a", 0, 1),
+            create_event("b", 2, 3),
+            create_event("a", 4, 5),
+        ]
+        graph = cgroups_graph(trace, TimeUnit.SEC)
+
+        self.assertEqual({("a", "b"), ("a", "a"), ("b", "a")}, set(graph.follows))
+        self.assertEqual(3, len(graph.follows))
+        self.assertEqual(graph.get(), cgroups_graph(trace, TimeUnit.SEC).get())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import datetime
+import unittest
+
+import pandas as pd
+from pm4py.objects.log.obj import Event, EventLog, Trace
+
+from cortado_core.tests.pattern_mining.example_log import create_example_log_1
+from cortado_core.utils.columnar_log import ColumnarIntervalLog
+from cortado_core.utils.cvariants import (
+    get_concurrency_variants,
+    get_concurrency_variants_from_columns,
+    get_concurrency_variants_from_dataframe,
+)
+from cortado_core.utils.timestamp_utils import TimeUnit
+
+BASE = datetime.datetime(2023, 1, 1)
+
+# (case, activity, lifecycle, minute)
+LIFECYCLE_EVENTS = [
+    ("c1", "a", "start", 0),
+    ("c1", "b", "start", 1),
+    ("c1", "a", "complete", 2),
+    ("c1", "b", "complete", 3),
+    ("c1", "c", "complete", 5),
+    ("c2", "a", "complete", 0),
+    ("c2", "a", "start", 1),
+    ("c2", "b", "start", 2),
+    ("c2", "b", "complete", 3),
+    ("c2", "a", "complete", 4),
+    ("c3", "a", "start", 0),
+    ("c3", "c", "complete", 10),
+    ("c3", "a", "complete", 20),
+]
+
+
+def create_lifecycle_log():
+    log = EventLog()
+    for case in dict.fromkeys(c for c, _, _, _ in LIFECYCLE_EVENTS):
+        log.append(
+            Trace(
+                [
+                    Event(
+                        {
+                            "concept:name": activity,
+                            "lifecycle:transition": lifecycle,
+                            "time:timestamp": BASE + datetime.timedelta(minutes=m),
+                        }
+                    )
+                    for c, activity, lifecycle, m in LIFECYCLE_EVENTS
+                    if c == case
+                ],
+                attributes={"concept:name": case},
+            )
+        )
+    return log
+
+
+def to_comparable(variants, get_case):
+    return sorted(
+        (str(v), sorted(get_case(t) for t in traces), sorted(v.graphs.values()))
+        for v, traces in variants.items()
+    )
+
+
+class TestColumnarLog(unittest.TestCase):
+    def test_pairing_and_renaming(self):
+        columnar_log = ColumnarIntervalLog(
+            [c for c, _, _, _ in LIFECYCLE_EVENTS],
+            [a for _, a, _, _ in LIFECYCLE_EVENTS],
+            [BASE + datetime.timedelta(minutes=m) for _, _, _, m in LIFECYCLE_EVENTS],
+            lifecycles=[l for _, _, l, _ in LIFECYCLE_EVENTS],
+        )
+
+        self.assertEqual(3, len(columnar_log))
+        activities, starts, completes = columnar_log.get_traces()[1]
+        minute = 60 * 10**6
+        start = int(BASE.replace(tzinfo=datetime.timezone.utc).timestamp()) * 10**6
+        # the first complete event of a has no start event, the second one is paired with the start event
+        self.assertEqual(["a0", "a1", "b0"], activities)
+        self.assertEqual([start, start + minute, start + 2 * minute], starts)
+        self.assertEqual([start, start + 4 * minute, start + 3 * minute], completes)
+        self.assertEqual(
+            {"a0": "a", "a1": "a", "b0": "b", "c0": "c"}, columnar_log.names
+        )
+
+    def test_columns_match_event_log(self):
+        log = create_lifecycle_log()
+        variants = get_concurrency_variants(log)
+
+        columnar_variants = get_concurrency_variants_from_columns(
+            [c for c, _, _, _ in LIFECYCLE_EVENTS],
+            [a for _, a, _, _ in LIFECYCLE_EVENTS],
+            [BASE + datetime.timedelta(minutes=m) for _, _, _, m in LIFECYCLE_EVENTS],
+            lifecycles=[l for _, _, l, _ in LIFECYCLE_EVENTS],
+        )
+
+        cases = ["c1", "c2", "c3"]
+        self.assertEqual(
+            to_comparable(variants, lambda t: t.attributes["concept:name"]),
+            to_comparable(columnar_variants, lambda i: cases[i]),
+        )
+
+    def test_dataframe_matches_interval_log(self):
+        log = create_example_log_1()
+        for i, trace in enumerate(log):
+            trace.attributes["concept:name"] = str(i)
+        df = pd.DataFrame(
+            [
+                {"case:concept:name": trace.attributes["concept:name"], **event}
+                for trace in log
+                for event in trace
+            ]
+        )
+
+        for time_granularity in [TimeUnit.MS, TimeUnit.HOUR]:
+            variants = get_concurrency_variants(log, time_granularity=time_granularity)
+            df_variants = get_concurrency_variants_from_dataframe(
+                df, time_granularity=time_granularity
+            )
+
+            self.assertEqual(
+                to_comparable(variants, lambda t: t.attributes["concept:name"]),
+                to_comparable(df_variants, lambda c: c),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
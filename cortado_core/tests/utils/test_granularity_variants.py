@@ -0,0 +1,61 @@
+import unittest
+
+from cortado_core.tests.pattern_mining.example_log import create_example_log_1
+from cortado_core.tests.utils.test_columnar_log import create_lifecycle_log
+from cortado_core.utils.cvariants import get_concurrency_variant_indices
+from cortado_core.utils.granularity_variants import MultiGranularityVariants
+from cortado_core.utils.split_graph import ParallelGroup, SequenceGroup
+from cortado_core.utils.timestamp_utils import TimeUnit
+
+TIME_GRANULARITIES = [
+    TimeUnit.MS,
+    TimeUnit.SEC,
+    TimeUnit.MIN,
+    TimeUnit.HOUR,
+    TimeUnit.DAY,
+]
+
+
+def to_comparable(variants):
+    return sorted(
+        (str(v), sorted(indices), sorted(v.graphs.values()))
+        for v, indices in variants.items()
+    )
+
+
+class TestMultiGranularityVariants(unittest.TestCase):
+    def test_variants_match_single_granularity_variants(self):
+        for log in [create_example_log_1(), create_lifecycle_log()]:
+            variants = MultiGranularityVariants(log).compute(TIME_GRANULARITIES)
+
+            for time_granularity, granularity_variants in zip(
+                TIME_GRANULARITIES, variants
+            ):
+                self.assertEqual(
+                    to_comparable(
+                        get_concurrency_variant_indices(
+                            log, time_granularity=time_granularity
+                        )
+                    ),
+                    to_comparable(granularity_variants),
+                )
+
+    def test_variants_are_cached_per_granularity(self):
+        variants = MultiGranularityVariants(create_lifecycle_log())
+
+        minutes = variants.get_variants(TimeUnit.MIN)
+
+        self.assertIs(minutes, variants.get_variants(TimeUnit.MIN))
+        self.assertIsNot(minutes, variants.get_variants(TimeUnit.HOUR))
+        # all events of a case happen within the same hour, i.e., they are concurrent if truncated to hours
+        self.assertTrue(
+            all(
+                isinstance(v, ParallelGroup)
+                for v in variants.get_variants(TimeUnit.HOUR)
+            )
+        )
+        self.assertTrue(any(isinstance(v, SequenceGroup) for v in minutes))
+
+
+if __name__ == "__main__":
+    unittest.main()
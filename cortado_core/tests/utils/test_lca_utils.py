@@ -0,0 +1,54 @@
+import unittest
+from collections import Counter
+
+from pm4py.objects.process_tree.utils.generic import parse as pt_parse, tree_sort
+
+from cortado_core.utils.lca_utils import (
+    discover_process_tree_from_sublog,
+    get_sublog_fingerprint,
+    rediscover_subtree_and_modify_pt,
+)
+
+
+class TestLcaUtils(unittest.TestCase):
+    def test_sublog_fingerprint_is_independent_of_insertion_order(self):
+        sublog_1 = Counter({("a", "b"): 2, ("b",): 1, (): 3})
+        sublog_2 = Counter({(): 3, ("b",): 1})
+        sublog_2[("a", "b")] += 2
+
+        self.assertEqual(
+            get_sublog_fingerprint(sublog_1), get_sublog_fingerprint(sublog_2)
+        )
+        self.assertNotEqual(
+            get_sublog_fingerprint(sublog_1),
+            get_sublog_fingerprint(Counter({("a", "b"): 1, ("b",): 1, (): 3})),
+        )
+
+    def test_memoized_discovery_returns_independent_trees(self):
+        sublog = Counter({("a", "b", "c"): 4, ("a", "c"): 1})
+
+        tree_1 = discover_process_tree_from_sublog(sublog)
+        tree_2 = discover_process_tree_from_sublog(Counter(sublog))
+
+        self.assertIsNot(tree_1, tree_2)
+        self.assertEqual(tree_1, tree_2)
+
+        tree_1.children.pop()
+        tree_3 = discover_process_tree_from_sublog(sublog)
+        expected_tree = pt_parse("->('a', X(tau, 'b'), 'c')")
+        tree_sort(tree_3)
+        tree_sort(expected_tree)
+        self.assertEqual(expected_tree, tree_3)
+
+    def test_rediscover_subtree(self):
+        tree = pt_parse("->('a', ->('b', 'c'), 'd')")
+        lca = tree.children[1]
+
+        new_tree = rediscover_subtree_and_modify_pt(
+            lca, Counter({("b", "c"): 2, ("c", "b"): 1})
+        )
+
+        expected_tree = pt_parse("->('a', +('b', 'c'), 'd')")
+        tree_sort(new_tree)
+        tree_sort(expected_tree)
+        self.assertEqual(expected_tree, new_tree)
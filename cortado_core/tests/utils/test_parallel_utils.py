@@ -0,0 +1,39 @@
+import unittest
+from multiprocessing import Pool
+
+from cortado_core.tests.pattern_mining.example_log import create_example_log_1
+from cortado_core.utils.cvariants import get_concurrency_variants
+from cortado_core.utils.parallel_utils import get_chunk_bounds
+
+
+class TestParallelUtils(unittest.TestCase):
+    def test_chunk_bounds_balance_sizes(self):
+        bounds = get_chunk_bounds([1, 1, 1, 1, 4, 4, 4, 4], n_workers=1)
+
+        self.assertEqual([(0, 5), (5, 6), (6, 7), (7, 8)], bounds)
+
+    def test_chunk_bounds_empty_and_small(self):
+        self.assertEqual([], get_chunk_bounds([], n_workers=2))
+        self.assertEqual([(0, 1), (1, 2)], get_chunk_bounds([3, 3], n_workers=2))
+
+    def test_pool_variants_match_serial_variants(self):
+        log = create_example_log_1()
+        variants = get_concurrency_variants(log)
+
+        with Pool(2) as pool:
+            pool_variants = get_concurrency_variants(log, use_mp=True, pool=pool)
+
+        self.assertEqual(list(variants.keys()), list(pool_variants.keys()))
+        self.assertEqual(
+            [len(traces) for traces in variants.values()],
+            [len(traces) for traces in pool_variants.values()],
+        )
+        self.assertEqual(len(log), sum(len(t) for t in pool_variants.values()))
+        for variant, pool_variant in zip(variants, pool_variants):
+            self.assertEqual(
+                sorted(variant.graphs.values()), sorted(pool_variant.graphs.values())
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import math
+import unittest
+
+import networkx
+from pm4py.objects.conversion.process_tree.converter import apply as pt_to_net
+from pm4py.objects.petri_net.utils import petri_utils
+from pm4py.objects.process_tree.utils.generic import parse
+
+from cortado_core.utils.petri_net_utils import (
+    DistanceTable,
+    _generate_networkx_graph,
+    get_distance_table,
+    get_petri_net_fingerprint,
+    update_distance_table,
+)
+
+
+def get_expected_distances(petri_net):
+    distances = dict(networkx.shortest_path_length(_generate_networkx_graph(petri_net)))
+    return {
+        (t.name, p.name): distances[t].get(p, math.inf)
+        for t in petri_net.transitions
+        for p in petri_net.places
+    }
+
+
+def get_table_distances(distance_table, petri_net):
+    return {
+        (t.name, p.name): distance_table.get_distance(t.name, p.name)
+        for t in petri_net.transitions
+        for p in petri_net.places
+    }
+
+
+class TestDistanceTable(unittest.TestCase):
+    def test_distances_match_shortest_paths(self):
+        net, _, _ = pt_to_net(parse("->('a', +('b', *('c', 'e')), X('d', tau))"))
+
+        self.assertEqual(
+            get_expected_distances(net),
+            get_table_distances(DistanceTable(net), net),
+        )
+
+    def test_distance_table_is_cached_by_fingerprint(self):
+        net, _, _ = pt_to_net(parse("->('a', X('b', 'c'))"))
+
+        self.assertIs(get_distance_table(net), get_distance_table(net))
+
+    def test_update_distance_table_after_adding_transitions(self):
+        net, im, fm = pt_to_net(parse("->('a', X('b', 'c'), 'd')"))
+        get_distance_table(net)
+        fingerprint = get_petri_net_fingerprint(net)
+
+        # loop back from the final place to the initial place
+        loop_back = petri_utils.add_transition(net, "loop_back")
+        petri_utils.add_arc_from_to(list(fm)[0], loop_back, net)
+        petri_utils.add_arc_from_to(loop_back, list(im)[0], net)
+        update_distance_table(fingerprint, net, {loop_back})
+
+        distance_table = get_distance_table(net)
+        self.assertEqual(
+            get_expected_distances(net), get_table_distances(distance_table, net)
+        )
+        self.assertTrue(
+            all(
+                distance < math.inf
+                for distance in get_table_distances(distance_table, net).values()
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import pickle
+import unittest
+
+import networkx as nx
+
+from cortado_core.models.infix_type import InfixType
+from cortado_core.utils.cgroups_graph import (
+    ConcurrencyGroup,
+    cgroups_graph_from_columns,
+)
+from cortado_core.utils.split_graph import (
+    LeafGroup,
+    ParallelGroup,
+    SequenceGroup,
+    split_graph,
+    split_group,
+)
+
+
+def create_variant(parallel_children=("b", "c")):
+    return SequenceGroup(
+        [
+            LeafGroup(["a"]),
+            ParallelGroup([LeafGroup([c]) for c in parallel_children]),
+            LeafGroup(["d", "a"]),
+        ]
+    )
+
+
+class TestFrozenGroup(unittest.TestCase):
+    def test_frozen_groups_are_equal_to_groups(self):
+        variant = create_variant()
+        frozen = variant.freeze()
+
+        self.assertEqual(hash(variant), hash(frozen))
+        self.assertEqual(variant, frozen)
+        self.assertEqual(frozen, variant)
+        self.assertEqual(str(variant), str(frozen))
+        self.assertEqual(5, frozen.number_of_activities())
+        self.assertEqual({variant: 1}[frozen], 1)
+
+        self.assertNotEqual(frozen, create_variant(("b", "d")).freeze())
+        self.assertNotEqual(frozen, SequenceGroup(variant, InfixType.PREFIX).freeze())
+
+    def test_frozen_groups_are_hash_consed(self):
+        frozen = create_variant().freeze()
+
+        self.assertIs(frozen, create_variant().freeze())
+        self.assertIs(frozen, create_variant(("c", "b")).freeze())
+        self.assertIs(frozen[1][0], LeafGroup(["b"]).freeze())
+        self.assertIs(frozen, pickle.loads(pickle.dumps(frozen)))
+
+    def test_leaf_order_is_kept(self):
+        frozen = SequenceGroup([LeafGroup(["a", "b"]), LeafGroup(["c"])]).freeze()
+        variant = SequenceGroup([LeafGroup(["b", "a"]), LeafGroup(["c"])])
+        frozen_reordered = variant.freeze()
+
+        self.assertIsNot(frozen, frozen_reordered)
+        self.assertEqual(frozen, frozen_reordered)
+        self.assertEqual(str(variant), str(frozen_reordered))
+        self.assertEqual(["b", "a"], list(frozen_reordered[0]))
+
+    def test_thaw(self):
+        variant = create_variant(("c", "b"))
+        thawed = variant.freeze().thaw()
+
+        self.assertIsInstance(thawed, SequenceGroup)
+        self.assertEqual(variant, thawed)
+        # the children of parallel groups are in the canonical order, the activities of leaf groups are not reordered
+        self.assertEqual(str(create_variant()), str(thawed))
+        self.assertEqual(["d", "a"], list(thawed[2]))
+
+    def test_frozen_groups_are_sorted_like_groups(self):
+        variants = [
+            create_variant(),
+            create_variant(("b", "d")),
+            SequenceGroup([LeafGroup(["x"])]),
+            ParallelGroup([LeafGroup(["a"]), LeafGroup(["b"])]),
+        ]
+
+        self.assertEqual(
+            [str(v) for v in sorted(variants)],
+            [str(v) for v in sorted(v.freeze() for v in variants)],
+        )
+
+    def test_freeze_memo(self):
+        variant = create_variant()
+        memo = {}
+        frozen = variant.freeze(memo)
+
+        self.assertEqual(6, len(memo))
+        self.assertIs(frozen[1], memo[id(variant[1])][1])
+        self.assertIs(frozen, variant.freeze(memo))
+
+
+class TestSplitGroup(unittest.TestCase):
+    def test_split_interval_events(self):
+        # a0 || (b0 -> c0), then d0, e0, f0 and g0 whose relations form an N (e0 -> f0, e0 -> g0 and d0 -> g0)
+        graph = cgroups_graph_from_columns(
+            ["a0", "b0", "c0", "d0", "e0", "f0", "g0"],
+            [0, 0, 2, 10, 10, 13, 16],
+            [5, 1, 3, 14, 12, 20, 18],
+        )
+
+        variant = split_group(graph)
+
+        self.assertEqual(
+            SequenceGroup(
+                [
+                    ParallelGroup(
+                        [
+                            LeafGroup(["a0"]),
+                            SequenceGroup([LeafGroup(["b0"]), LeafGroup(["c0"])]),
+                        ]
+                    ),
+                    LeafGroup(["d0", "e0", "f0", "g0"]),
+                ]
+            ),
+            variant,
+        )
+        # the events of a leaf group that cannot be split are sorted
+        self.assertEqual(["d0", "e0", "f0", "g0"], list(variant[1]))
+
+    def test_leaf_order_does_not_depend_on_start_order(self):
+        # b0 is concurrent to all other events, whose relations form an N (a0 -> e0, c0 -> e0 and c0 -> d0)
+        activities = ["a0", "b0", "c0", "d0", "e0"]
+        completes = [4, 20, 2, 10, 8]
+        variant = split_group(
+            cgroups_graph_from_columns(activities, [0, 0, 1, 3, 6], completes)
+        )
+        # c0 starts before a0
+        variant_reordered = split_group(
+            cgroups_graph_from_columns(
+                ["b0", "c0", "a0", "d0", "e0"], [0, 0, 1, 3, 6], [20, 2, 4, 10, 8]
+            )
+        )
+
+        self.assertEqual(
+            ParallelGroup([LeafGroup(["b0"]), LeafGroup(["a0", "c0", "d0", "e0"])]),
+            variant,
+        )
+        self.assertEqual(str(variant.freeze()), str(variant_reordered.freeze()))
+        self.assertEqual(hash(variant), hash(variant_reordered))
+
+    def test_split_explicit_relations(self):
+        graph = cgroups_graph_from_columns(
+            ["a0", "b0", "c0", "d0", "e0"],
+            [0, 1, 1, 6, 7],
+            [2, 3, 5, 6, 8],
+        )
+        explicit_graph = ConcurrencyGroup()
+        explicit_graph.events = set(graph.events)
+        explicit_graph.follows = set(graph.follows)
+        explicit_graph.concurrency_pairs = {
+            frozenset(pair) for pair in graph.concurrency_pairs
+        } | {frozenset(["e0"])}
+
+        self.assertEqual(split_group(graph), split_group(explicit_graph))
+
+    def test_split_networkx_graphs(self):
+        g_follows = nx.DiGraph([("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")])
+        g_follows.add_edge("a", "d")
+        g_parallel = nx.DiGraph([("b", "c")])
+
+        self.assertEqual(
+            SequenceGroup(
+                [
+                    LeafGroup(["a"]),
+                    ParallelGroup([LeafGroup(["b"]), LeafGroup(["c"])]),
+                    LeafGroup(["d"]),
+                ]
+            ),
+            split_graph(g_follows, g_parallel),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
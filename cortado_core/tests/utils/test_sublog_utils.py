@@ -1,4 +1,5 @@
 import unittest
+from collections import Counter
 
 from pm4py.objects.process_tree.utils.generic import parse as pt_parse
 from pm4py.algo.conformance.alignments.petri_net.algorithm import (
@@ -28,7 +29,7 @@ class TestFragmentUtils(unittest.TestCase):
 
         sublog = generate_infix_sublog(infix, InfixType.PROPER_INFIX, model, lca)
 
-        self.assertEqual(["b", "c", "d"], [e["concept:name"] for e in sublog[0]])
+        self.assertEqual(Counter({("b", "c", "d"): 1}), sublog)
 
     def test_generate_infix_sublog_trace_lca_is_ancestor_of_lca_infix(self):
         model = pt_parse("->('a', ->('b', X('c', tau), 'd'))")
@@ -38,7 +39,7 @@ class TestFragmentUtils(unittest.TestCase):
 
         sublog = generate_infix_sublog(infix, InfixType.PROPER_INFIX, model, lca)
 
-        self.assertEqual(["a", "b", "c", "d"], [e["concept:name"] for e in sublog[0]])
+        self.assertEqual(Counter({("a", "b", "c", "d"): 1}), sublog)
 
     def test_generate_infix_sublog_trace_lca_is_descendant_of_lca_infix(self):
         model = pt_parse("X(->('a', ->(*('b', tau), X('c', tau)), 'd'), 'e')")
@@ -47,7 +48,7 @@ class TestFragmentUtils(unittest.TestCase):
         infix = generate_test_trace("bbbd")
 
         sublog = generate_infix_sublog(infix, InfixType.PROPER_INFIX, model, lca)
-        self.assertEqual(["b", "b", "b"], [e["concept:name"] for e in sublog[0]])
+        self.assertEqual(Counter({("b", "b", "b"): 1}), sublog)
 
     def test_generate_infix_sublog_trace_lca_is_descendant_of_lca_infix_replayed_two_times(
         self,
@@ -59,10 +60,7 @@ class TestFragmentUtils(unittest.TestCase):
         infix = generate_test_trace("bbcbbbc")
 
         sublog = generate_infix_sublog(infix, InfixType.PROPER_INFIX, model, lca)
-        traces_as_tuples = [tuple([e["concept:name"] for e in t]) for t in sublog]
-        self.assertEqual(2, len(sublog))
-        self.assertIn(("b", "b"), traces_as_tuples)
-        self.assertIn(("b", "b", "b"), traces_as_tuples)
+        self.assertEqual(Counter({("b", "b"): 1, ("b", "b", "b"): 1}), sublog)
 
     def test_generate_infix_sublog_choice_with_lower_cost_without_replay(self):
         model = pt_parse(
@@ -76,8 +74,7 @@ class TestFragmentUtils(unittest.TestCase):
         sublog = generate_infix_sublog(infix, InfixType.PROPER_INFIX, model, lca)
 
         self.assertEqual(
-            ["a", "b", "c", "c", "c", "c", "c", "c", "c"],
-            [e["concept:name"] for e in sublog[0]],
+            Counter({("a", "b", "c", "c", "c", "c", "c", "c", "c"): 1}), sublog
         )
 
     def test_generate_infix_sublog_not_replayable_infix(self):
@@ -119,12 +116,10 @@ class TestFragmentUtils(unittest.TestCase):
             InfixType.NOT_AN_INFIX,
             None,
         )
-        traces_as_tuples = [tuple([e["concept:name"] for e in t]) for t in sublog]
-
-        self.assertEqual(3, len(traces_as_tuples))
-        self.assertIn(("a", "b", "d"), traces_as_tuples)
-        self.assertIn(("b", "a", "c", "d"), traces_as_tuples)
-        self.assertIn(("a", "b", "c", "d"), traces_as_tuples)
+        self.assertEqual(3, sum(sublog.values()))
+        self.assertIn(("a", "b", "d"), sublog)
+        self.assertIn(("b", "a", "c", "d"), sublog)
+        self.assertIn(("a", "b", "c", "d"), sublog)
 
     def test_generate_sublog_lower_level_lca(self):
         model = pt_parse("->('a', 'b', *(X('c', 'e', tau), tau), 'd')")
@@ -151,12 +146,10 @@ class TestFragmentUtils(unittest.TestCase):
             InfixType.NOT_AN_INFIX,
             None,
         )
-        traces_as_tuples = [tuple([e["concept:name"] for e in t]) for t in sublog]
-        print(traces_as_tuples)
-        self.assertEqual(3, len(traces_as_tuples))
-        self.assertIn((), traces_as_tuples)
-        self.assertIn(("c", "f", "e"), traces_as_tuples)
-        self.assertIn(("c", "c", "e", "c", "c", "c", "e", "e"), traces_as_tuples)
+        self.assertEqual(3, sum(sublog.values()))
+        self.assertIn((), sublog)
+        self.assertIn(("c", "f", "e"), sublog)
+        self.assertIn(("c", "c", "e", "c", "c", "c", "e", "e"), sublog)
 
     def test_generate_sublog_filter_alignments_to_contain_valid_prefixes(self):
         model = pt_parse("+('d', 'c', 'b', 'a')")
@@ -166,8 +159,9 @@ class TestFragmentUtils(unittest.TestCase):
 
         sublog = generate_infix_sublog(prefix, InfixType.PREFIX, model, lca)
 
-        self.assertTrue(sublog[0][0]["concept:name"] == "a")
-        self.assertTrue(sublog[0][1]["concept:name"] == "b")
+        variant = next(iter(sublog))
+        self.assertTrue(variant[0] == "a")
+        self.assertTrue(variant[1] == "b")
 
     def test_generate_sublog_filter_alignments_to_contain_valid_postfixes(self):
         model = pt_parse("+('d', 'c', 'b', 'a')")
@@ -177,8 +171,9 @@ class TestFragmentUtils(unittest.TestCase):
 
         sublog = generate_infix_sublog(postfix, InfixType.POSTFIX, model, lca)
 
-        self.assertTrue(sublog[0][-2]["concept:name"] == "a")
-        self.assertTrue(sublog[0][-1]["concept:name"] == "b")
+        variant = next(iter(sublog))
+        self.assertTrue(variant[-2] == "a")
+        self.assertTrue(variant[-1] == "b")
 
     def test_generate_sublog_filter_alignments_to_contain_valid_infixes(self):
         model = pt_parse("+('d', 'c', 'b', 'a')")
@@ -188,6 +183,47 @@ class TestFragmentUtils(unittest.TestCase):
 
         sublog = generate_infix_sublog(postfix, InfixType.PROPER_INFIX, model, lca)
 
-        for idx, event in enumerate(sublog[0]):
-            if event["concept:name"] == "c":
-                self.assertEqual(sublog[0][idx + 1]["concept:name"], "a")
+        variant = next(iter(sublog))
+        for idx, activity in enumerate(variant):
+            if activity == "c":
+                self.assertEqual(variant[idx + 1], "a")
+
+    def test_generate_sublog_compresses_identical_traces(self):
+        model = pt_parse("->('a', 'b', X('c', tau), 'd')")
+        set_preorder_ids_in_tree(model)
+
+        log = [
+            TypedTrace(generate_test_trace("abd"), InfixType.NOT_AN_INFIX),
+            TypedTrace(generate_test_trace("abd"), InfixType.NOT_AN_INFIX),
+            TypedTrace(generate_test_trace("abcd"), InfixType.NOT_AN_INFIX),
+            TypedTrace(generate_test_trace("bc"), InfixType.PROPER_INFIX),
+            TypedTrace(generate_test_trace("bc"), InfixType.PROPER_INFIX),
+        ]
+
+        trace_to_add = generate_test_trace("bacd")
+        net, im, fm = pt_to_petri_net(model)
+        alignment = calculate_alignments(
+            trace_to_add, net, im, fm, parameters={"ret_tuple_as_trans_desc": True}
+        )
+        _, deviation_i = get_first_deviation(alignment)
+        sublog = calculate_sublog_for_lca(
+            model,
+            log,
+            model,
+            alignment,
+            deviation_i,
+            trace_to_add,
+            InfixType.NOT_AN_INFIX,
+            None,
+        )
+
+        self.assertEqual(
+            Counter(
+                {
+                    ("a", "b", "d"): 2,
+                    ("a", "b", "c", "d"): 3,
+                    ("b", "a", "c", "d"): 1,
+                }
+            ),
+            sublog,
+        )
@@ -0,0 +1,107 @@
+import datetime
+import tempfile
+import unittest
+
+import numpy as np
+from pm4py.objects.log.obj import Event, EventLog, Trace
+
+from cortado_core.tests.pattern_mining.example_log import create_example_log_1
+from cortado_core.utils.cvariants import get_concurrency_variant_indices
+from cortado_core.utils.timestamp_utils import TimeUnit
+from cortado_core.utils.variant_cache import (
+    VariantCache,
+    get_concurrency_variants_cached,
+    get_log_fingerprint,
+)
+
+BASE = datetime.datetime(2023, 1, 1)
+
+
+def create_unsplittable_log():
+    """
+    Two traces whose events a, c, d and e form an N (a -> e, c -> e and c -> d) that is concurrent to b, i.e., a leaf
+    group with several activities. The traces only differ in the start order of a and c.
+    """
+    log = EventLog()
+    for a_start, c_start in [(0, 1), (1, 0)]:
+        intervals = [
+            ("a", a_start, 4),
+            ("b", 0, 20),
+            ("c", c_start, 2),
+            ("d", 3, 10),
+            ("e", 6, 8),
+        ]
+        log.append(
+            Trace(
+                [
+                    Event(
+                        {
+                            "concept:name": activity,
+                            "start_timestamp": BASE + datetime.timedelta(minutes=start),
+                            "time:timestamp": BASE
+                            + datetime.timedelta(minutes=complete),
+                        }
+                    )
+                    for activity, start, complete in sorted(
+                        intervals, key=lambda interval: interval[1]
+                    )
+                ]
+            )
+        )
+    return log
+
+
+class TestVariantCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = VariantCache(self.directory.name)
+        self.log = create_example_log_1()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_fingerprint(self):
+        fingerprint = get_log_fingerprint(self.log, TimeUnit.SEC)
+
+        self.assertEqual(fingerprint, get_log_fingerprint(self.log, TimeUnit.SEC))
+        self.assertNotEqual(fingerprint, get_log_fingerprint(self.log, TimeUnit.MIN))
+
+        self.log[0][0]["time:timestamp"] += datetime.timedelta(seconds=1)
+        self.assertNotEqual(fingerprint, get_log_fingerprint(self.log, TimeUnit.SEC))
+
+    def test_cached_variants_match_computed_variants(self):
+        variants = get_concurrency_variant_indices(self.log)
+
+        for _ in range(2):
+            cached_variants = get_concurrency_variants_cached(self.log, self.cache)
+
+            self.assertEqual(list(variants.keys()), list(cached_variants.keys()))
+            for (variant, indices), (cached_variant, cached_indices) in zip(
+                variants.items(), cached_variants.items()
+            ):
+                self.assertIsInstance(cached_indices, np.memmap)
+                self.assertEqual(indices, cached_indices.tolist())
+                self.assertEqual(
+                    sorted(variant.graphs.values()),
+                    sorted(cached_variant.graphs.values()),
+                )
+
+    def test_cached_variants_with_multi_activity_leaves(self):
+        log = create_unsplittable_log()
+        variants = get_concurrency_variant_indices(log)
+        self.assertEqual([[0, 1]], list(variants.values()))
+
+        for _ in range(2):
+            cached_variants = get_concurrency_variants_cached(log, self.cache)
+
+            self.assertEqual(list(variants), list(cached_variants))
+            self.assertEqual(
+                [str(v) for v in variants], [str(v) for v in cached_variants]
+            )
+
+    def test_load_missing_entry(self):
+        self.assertIsNone(self.cache.load(get_log_fingerprint(self.log, TimeUnit.SEC)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import datetime
+import unittest
+
+from pm4py.objects.log.obj import EventLog
+
+from cortado_core.tests.pattern_mining.example_log import create_example_log_1
+from cortado_core.tests.utils.test_columnar_log import create_lifecycle_log
+from cortado_core.utils.cvariants import get_concurrency_variant_indices
+from cortado_core.utils.split_graph import ParallelGroup, SequenceGroup
+from cortado_core.utils.variant_index import VariantIndex
+
+
+def to_comparable(variants):
+    return sorted(
+        (str(v), sorted(cases), sorted(v.graphs.values()))
+        for v, cases in variants.items()
+    )
+
+
+def create_index(log):
+    index = VariantIndex()
+    for i, trace in enumerate(log):
+        index.add_trace(i, trace)
+    return index
+
+
+class TestVariantIndex(unittest.TestCase):
+    def test_variants_match_concurrency_variants(self):
+        for log in [create_example_log_1(), create_lifecycle_log()]:
+            index = create_index(log)
+
+            self.assertEqual(len(log), len(index))
+            self.assertEqual(
+                to_comparable(get_concurrency_variant_indices(log)),
+                to_comparable(index.get_variants()),
+            )
+
+    def test_remove_and_replace_traces(self):
+        log = create_lifecycle_log()
+        index = create_index(log)
+
+        index.remove_trace(0)
+        self.assertNotIn(0, index)
+        self.assertEqual(
+            to_comparable(
+                {
+                    v: [i + 1 for i in indices]
+                    for v, indices in get_concurrency_variant_indices(
+                        EventLog(log[1:])
+                    ).items()
+                }
+            ),
+            to_comparable(index.get_variants()),
+        )
+        with self.assertRaises(KeyError):
+            index.remove_trace(0)
+
+        # c3 becomes a sequence of c and a if the start of a is moved after c
+        log[2][0]["time:timestamp"] += datetime.timedelta(minutes=15)
+        self.assertIsInstance(index.get_variant(2), ParallelGroup)
+        self.assertIsInstance(index.add_trace(2, log[2]), SequenceGroup)
+        self.assertEqual(2, len(index))
+
+        for i in [1, 2]:
+            index.remove_trace(i)
+        self.assertEqual({}, index.get_variants())
+
+    def test_snapshots_are_not_changed_by_updates(self):
+        log = create_lifecycle_log()
+        index = create_index(log)
+
+        case_indices = {id(trace): i for i, trace in enumerate(log)}
+        snapshot = index.snapshot()
+        expected = to_comparable(
+            {v: [case_indices[id(t)] for t in traces] for v, traces in snapshot.items()}
+        )
+        unchanged = index.get_variant(1)
+        index.remove_trace(0)
+        index.add_trace(3, log[0])
+        index.add_trace(4, log[0])
+
+        self.assertEqual(
+            expected,
+            to_comparable(
+                {
+                    v: [case_indices[id(t)] for t in traces]
+                    for v, traces in snapshot.items()
+                }
+            ),
+        )
+        self.assertEqual([3, 4], list(index.get_variants()[index.get_variant(3)]))
+        # the copies of unchanged variants are reused by the next snapshot
+        new_snapshot = index.snapshot()
+        self.assertIs(snapshot[unchanged], new_snapshot[unchanged])
+
+
+if __name__ == "__main__":
+    unittest.main()
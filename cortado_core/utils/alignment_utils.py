@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pm4py.objects.log.obj import Trace
 from pm4py.objects.petri_net.utils.align_utils import SKIP
 from pm4py.objects.petri_net.utils.align_utils import STD_MODEL_LOG_MOVE_COST
@@ -16,6 +18,7 @@ from cortado_core.utils.trace import TypedTrace
 from cortado_core.alignments.infix_alignments import algorithm as infix_alignments
 from cortado_core.alignments.prefix_alignments import algorithm as prefix_alignments
 from cortado_core.alignments.suffix_alignments import algorithm as suffix_alignments
+from cortado_core.process_tree_utils.replay import activities_fit_process_tree
 from cortado_core.process_tree_utils.to_petri_net_transition_bordered import (
     apply as pt_to_petri_net_cortado,
 )
@@ -83,10 +86,33 @@ def calculate_alignment_typed_trace(pt: ProcessTree, trace: TypedTrace):
 
 
 def typed_trace_fits_process_tree(trace: TypedTrace, pt: ProcessTree) -> bool:
+    fits = typed_trace_fits_process_tree_by_replay(trace, pt)
+    if fits is not None:
+        return fits
+
     alignment = calculate_alignment_typed_trace(pt, trace)
     return not alignment_contains_deviation(alignment)
 
 
+def typed_trace_fits_process_tree_by_replay(
+    trace: TypedTrace, pt: ProcessTree
+) -> Optional[bool]:
+    """
+    Checks if the trace fits the process tree by replaying it on the tree, which is much cheaper than calculating an
+    alignment. Returns None if the check is not possible, e.g., for infixes and postfixes.
+    """
+    if (
+        trace.infix_type != InfixType.NOT_AN_INFIX
+        and trace.infix_type != InfixType.PREFIX
+    ):
+        return None
+
+    activities = [e["concept:name"] for e in trace.trace]
+    return activities_fit_process_tree(
+        activities, pt, prefix=trace.infix_type == InfixType.PREFIX
+    )
+
+
 def calculate_infix_postfix_prefix_alignment(
     trace: Trace, pt: ProcessTree, infix_type: InfixType, copy_tree=True
 ):
@@ -1,4 +1,6 @@
-from typing import Mapping
+from bisect import bisect_right
+from collections.abc import Set
+from typing import Iterator, List, Mapping, Tuple
 
 import networkx as nx
 from pm4py.util.xes_constants import (
@@ -59,7 +61,7 @@ class ConcurrencyGroup:
                     tmp[names[e]].add(id_name_map[e])
 
                 else:
-                    tmp[names[e]] = set([(id_name_map[e])])
+                    tmp[names[e]] = set([id_name_map[e]])
 
             return tmp
 
@@ -102,72 +104,130 @@ class ConcurrencyGroup:
         return self.__str__()
 
 
-def cgroups_graph(trace, time_granularity):
-    trace = sorted(trace, key=lambda e: e[DEFAULT_START_TIMESTAMP_KEY])
-
-    parallel = set()
-    follows = set()
-
-    directly_follows = set()
-    activities = set()
-
-    start_activities = set()
-    not_end_activitites = set()
-
-    is_start = True
-
-    for event in trace:
-        event[DEFAULT_START_TIMESTAMP_KEY] = transform_timestamp(
-            event[DEFAULT_START_TIMESTAMP_KEY], time_granularity
+class FollowsRelation(Set):
+    """
+    Read-only set of the (activity, follower) pairs of a trace that is represented implicitly as an interval order.
+    The events are sorted by their start timestamps, and followers[i] is the index of the first event that starts after
+    the i-th event completes, i.e., the i-th event is followed by exactly the events followers[i], ..., n - 1. The
+    relation needs O(n) memory, the pairs are only enumerated if the set is iterated (e.g., for hashing).
+    """
+
+    def __init__(self, activities: List[str], followers: List[int]):
+        self.activities = activities
+        self.followers = followers
+        self.__unique = len(set(activities)) == len(activities)
+
+        # (a, b) is contained iff the last occurrence of b is not before the first follower of any occurrence of a
+        self.__first_follower = {}
+        self.__last_position = {}
+        for i, (activity, follower) in enumerate(zip(activities, followers)):
+            self.__first_follower[activity] = min(
+                follower, self.__first_follower.get(activity, follower)
+            )
+            self.__last_position[activity] = i
+
+    def __contains__(self, pair) -> bool:
+        try:
+            activity, activity2 = pair
+            return self.__last_position[activity2] >= self.__first_follower[activity]
+        except (KeyError, TypeError, ValueError):
+            return False
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        pairs = (
+            (activity, activity2)
+            for activity, follower in zip(self.activities, self.followers)
+            for activity2 in self.activities[follower:]
         )
+        if self.__unique:
+            return pairs
+        return iter(set(pairs))
 
-        event[DEFAULT_TIMESTAMP_KEY] = transform_timestamp(
-            event[DEFAULT_TIMESTAMP_KEY], time_granularity
-        )
+    def __len__(self) -> int:
+        if self.__unique:
+            n = len(self.activities)
+            return sum(n - follower for follower in self.followers)
+        return sum(1 for _ in self)
 
-    for i, event in enumerate(trace):
-        complete = event[DEFAULT_TIMESTAMP_KEY]
-
-        activity = event[DEFAULT_NAME_KEY]
-        activities.add(activity)
-        earliest_complete = None
-
-        for event2 in trace[i + 1 :]:
-            start2 = event2[DEFAULT_START_TIMESTAMP_KEY]
-            complete2 = event2[DEFAULT_TIMESTAMP_KEY]
-            activity2 = event2[DEFAULT_NAME_KEY]
-
-            if complete < start2:
-                follows.add((activity, activity2))
-                not_end_activitites.add(activity)
+    def __repr__(self):
+        return repr(set(self))
 
-                if is_start:
-                    start_activities.add(activity)
 
-                is_start = False
+def cgroups_graph(trace, time_granularity):
+    """
+    Creates the concurrency group of a trace of interval events. Two events are concurrent if their (transformed)
+    intervals overlap, otherwise the earlier one is followed by the later one. The events of the trace are not modified.
+    """
+    trace = sorted(trace, key=lambda e: e[DEFAULT_START_TIMESTAMP_KEY])
 
-                if earliest_complete is None or earliest_complete >= start2:
-                    directly_follows.add((activity, activity2))
+    return cgroups_graph_from_columns(
+        [event[DEFAULT_NAME_KEY] for event in trace],
+        [
+            transform_timestamp(event[DEFAULT_START_TIMESTAMP_KEY], time_granularity)
+            for event in trace
+        ],
+        [
+            transform_timestamp(event[DEFAULT_TIMESTAMP_KEY], time_granularity)
+            for event in trace
+        ],
+    )
+
+
+def cgroups_graph_from_columns(
+    activities: List[str], starts: List, completes: List
+) -> ConcurrencyGroup:
+    """
+    Creates the concurrency group of the events given by their activities and (transformed) start and complete
+    timestamps, sorted by the start timestamps. The events are swept once in this order. As the start timestamps are
+    sorted, the events that follow an event form a suffix of the sweep order that is found by a binary search, so the
+    runtime is O(n log n) plus the number of returned concurrent and directly follows pairs.
+    """
+    n = len(activities)
+
+    # index of the first later event that starts after the event completes
+    followers = [
+        max(i + 1, bisect_right(starts, complete))
+        for i, complete in enumerate(completes)
+    ]
 
-                    if earliest_complete is None:
-                        earliest_complete = complete2
-                    else:
-                        earliest_complete = min(earliest_complete, complete2)
+    parallel = set()
+    directly_follows = set()
+    not_end_activitites = set()
 
-            # All other cases are parallel
-            else:
-                parallel.add((activity, activity2))
+    for i, (activity, follower) in enumerate(zip(activities, followers)):
+        parallel.update(
+            (activity, activity2) for activity2 in activities[i + 1 : follower]
+        )
 
-                if is_start:
-                    start_activities.add(activity)
-                    start_activities.add(activity2)
+        if follower == n:
+            continue
+
+        not_end_activitites.add(activity)
+
+        # an event directly follows if it starts before all events completed that directly follow already
+        earliest_complete = completes[follower]
+        directly_follows.add((activity, activities[follower]))
+        for j in range(follower + 1, n):
+            if starts[j] > earliest_complete:
+                break
+            directly_follows.add((activity, activities[j]))
+            earliest_complete = min(earliest_complete, completes[j])
+
+    # the start activities are the events that are concurrent to each other before the first event completes that is
+    # followed by another event, i.e., if the first event is followed, its concurrent events, otherwise all events
+    if n < 2:
+        start_activities = set()
+    elif followers[0] < n:
+        start_activities = set(activities[: followers[0]])
+    else:
+        start_activities = set(activities)
 
     grp = ConcurrencyGroup()
-    grp.events = activities
-    grp.follows = follows
+    grp.events = set(activities)
+    grp.follows = FollowsRelation(activities, followers)
     grp.concurrency_pairs = parallel
     grp.directly_follows = directly_follows
     grp.start_activities = start_activities
-    grp.end_activities = activities.difference(not_end_activitites)
+    grp.end_activities = grp.events.difference(not_end_activitites)
 
     return grp
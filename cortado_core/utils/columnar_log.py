@@ -0,0 +1,245 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from pm4py.objects.log.obj import EventLog
+from pm4py.util.xes_constants import (
+    DEFAULT_INSTANCE_KEY,
+    DEFAULT_NAME_KEY,
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+    DEFAULT_TRANSITION_KEY,
+)
+
+from cortado_core.performance.intervals import to_microseconds, truncate_microseconds
+from cortado_core.utils.timestamp_utils import TimeUnit
+
+
+class ColumnarIntervalLog:
+    """
+    Interval events of a log given by columns (one entry per event). The events are paired to intervals like pm4py's
+    to_interval, i.e., for every case, activity and lifecycle instance, a complete event is paired with the oldest
+    unpaired start event that occurred before it (if there is none, the interval starts at the complete event).
+    Then, the activities are renamed like cvariants.unique_activities, i.e., the i-th occurrence of an activity in a
+    trace (in the order of the interval trace) is renamed to activity + str(i).
+    Interval event i of the concatenated traces has
+    - the renamed activity renamed_activities[i] (names maps renamed activities to the activities),
+    - the start and complete timestamps starts[i] and completes[i] as int64 microseconds since the epoch (UTC).
+    The events of the j-th trace are trace_offsets[j]:trace_offsets[j + 1], sorted like in cgroups_graph, and the trace
+    corresponds to the case case_indices[j] (index in the order of the first occurrence of the case ids). Cases
+    without interval events are dropped. As cgroups_graph sorts by the original timestamps, the order of the events
+    does not depend on the time granularity, which is only applied by get_traces.
+    """
+
+    def __init__(
+        self,
+        case_ids: Sequence,
+        activities: Sequence[str],
+        timestamps: Sequence,
+        lifecycles: Optional[Sequence[str]] = None,
+        start_timestamps: Optional[Sequence] = None,
+        instances: Optional[Sequence] = None,
+    ):
+        case_codes, self.case_ids = pd.factorize(np.asarray(case_ids), sort=False)
+        activity_codes, activity_names = pd.factorize(
+            np.asarray(activities), sort=False
+        )
+        completes = to_microseconds(timestamps)
+        positions = np.arange(len(case_codes))
+
+        if lifecycles is not None:
+            # events without lifecycle transition are complete events
+            transitions = pd.Series(lifecycles, dtype=object).str.lower()
+            is_start = (transitions == "start").to_numpy()
+            is_complete = ((transitions == "complete") | transitions.isna()).to_numpy()
+        else:
+            is_start = np.zeros(len(case_codes), dtype=bool)
+            is_complete = np.ones(len(case_codes), dtype=bool)
+
+        if start_timestamps is not None:
+            # interval events already, only the start/complete events are considered as in get_concurrency_variants
+            starts = to_microseconds(start_timestamps)
+            keep = is_start | is_complete
+        else:
+            instance_codes = (
+                pd.factorize(np.asarray(instances, dtype=object))[0]
+                if instances is not None
+                else np.zeros(len(case_codes), dtype=np.int64)
+            )
+            starts = self.__pair_intervals(
+                case_codes,
+                activity_codes,
+                instance_codes,
+                completes,
+                is_start,
+                is_complete,
+            )
+            keep = is_complete
+
+        case_codes = case_codes[keep]
+        activity_codes = activity_codes[keep]
+        starts = starts[keep]
+        completes = completes[keep]
+        positions = positions[keep]
+
+        # order of the events in the interval traces, to_interval sorts the events of each trace by start timestamp
+        if start_timestamps is not None:
+            trace_order = np.lexsort((positions, case_codes))
+        else:
+            trace_order = np.lexsort((positions, starts, case_codes))
+        case_codes = case_codes[trace_order]
+        activity_codes = activity_codes[trace_order]
+        starts = starts[trace_order]
+        completes = completes[trace_order]
+
+        occurrences = (
+            pd.Series(activity_codes).groupby([case_codes, activity_codes]).cumcount()
+        )
+        renamed_codes, renamed_pairs = pd.factorize(
+            pd.MultiIndex.from_arrays([activity_codes, occurrences.to_numpy()]),
+            sort=False,
+        )
+        renamed = [
+            activity_names[activity] + str(occurrence)
+            for activity, occurrence in renamed_pairs
+        ]
+        self.names: Dict[str, str] = {
+            name: activity_names[activity]
+            for name, (activity, _) in zip(renamed, renamed_pairs)
+        }
+
+        # cgroups_graph sorts the events of a trace by the (not transformed) start timestamps
+        sweep_order = np.lexsort((np.arange(len(case_codes)), starts, case_codes))
+        case_codes = case_codes[sweep_order]
+        self.renamed_activities = np.array(renamed, dtype=object)[
+            renamed_codes[sweep_order]
+        ]
+        self.starts = starts[sweep_order]
+        self.completes = completes[sweep_order]
+
+        is_first = np.ones(len(case_codes), dtype=bool)
+        is_first[1:] = case_codes[1:] != case_codes[:-1]
+        self.trace_offsets = np.append(np.flatnonzero(is_first), len(case_codes))
+        self.case_indices = case_codes[is_first]
+
+    def __len__(self):
+        return len(self.trace_offsets) - 1
+
+    @classmethod
+    def from_event_log(cls, log: EventLog) -> "ColumnarIntervalLog":
+        """
+        Creates the columns of an event log in lifecycle or interval format, the case ids are the indices of the traces.
+        Like get_concurrency_variants, only start and complete events are considered if the first event has a
+        lifecycle transition, and the log is in interval format if the first remaining event has a start timestamp.
+        """
+        filter_lifecycles = (
+            log.attributes.get("PM4PY_TYPE", "") != "interval"
+            and len(log) > 0
+            and len(log[0]) > 0
+            and DEFAULT_TRANSITION_KEY in log[0][0]
+        )
+        first_events = [
+            e
+            for e in (log[0] if len(log) > 0 else [])
+            if not filter_lifecycles
+            or e[DEFAULT_TRANSITION_KEY].lower() in ("start", "complete")
+        ]
+        is_interval = log.attributes.get("PM4PY_TYPE", "") == "interval" or (
+            len(first_events) > 0 and DEFAULT_START_TIMESTAMP_KEY in first_events[0]
+        )
+
+        events = [(i, event) for i, trace in enumerate(log) for event in trace]
+        return cls(
+            [i for i, _ in events],
+            [event[DEFAULT_NAME_KEY] for _, event in events],
+            [event[DEFAULT_TIMESTAMP_KEY] for _, event in events],
+            lifecycles=(
+                [event.get(DEFAULT_TRANSITION_KEY) for _, event in events]
+                if filter_lifecycles or not is_interval
+                else None
+            ),
+            start_timestamps=(
+                [event[DEFAULT_START_TIMESTAMP_KEY] for _, event in events]
+                if is_interval
+                else None
+            ),
+            instances=(
+                [event.get(DEFAULT_INSTANCE_KEY) for _, event in events]
+                if not is_interval
+                else None
+            ),
+        )
+
+    def get_traces(self, time_granularity: Optional[TimeUnit] = None) -> List[tuple]:
+        """
+        Returns the renamed activities and the start and complete timestamps, truncated to the time granularity like
+        transform_timestamp, of each trace as lists
+        """
+        renamed_activities = self.renamed_activities.tolist()
+        starts = truncate_microseconds(self.starts, time_granularity).tolist()
+        completes = truncate_microseconds(self.completes, time_granularity).tolist()
+        return [
+            (
+                renamed_activities[lower:upper],
+                starts[lower:upper],
+                completes[lower:upper],
+            )
+            for lower, upper in zip(
+                self.trace_offsets[:-1].tolist(), self.trace_offsets[1:].tolist()
+            )
+        ]
+
+    @staticmethod
+    def __pair_intervals(
+        case_codes: np.ndarray,
+        activity_codes: np.ndarray,
+        instance_codes: np.ndarray,
+        timestamps: np.ndarray,
+        is_start: np.ndarray,
+        is_complete: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Returns the start timestamp of the interval of every complete event. Within a group of events with the same
+        case, activity and instance, the j-th complete event pops a start event from the queue of the S_j start events
+        that occurred before it, if the queue is not empty. The number of popped start events after the j-th complete
+        event is p_j = min(p_(j-1) + 1, S_j), i.e., p_j = j + min(0, min_(i <= j) (S_i - i)), and the j-th complete event
+        was paired with the p_j-th start event iff p_j > p_(j-1).
+        """
+        groups = pd.factorize(
+            pd.MultiIndex.from_arrays([case_codes, activity_codes, instance_codes])
+        )[0]
+        order = np.lexsort((np.arange(len(groups)), groups))
+        groups = groups[order]
+        is_start = is_start[order]
+        is_complete = is_complete[order]
+
+        grouped_starts = pd.Series(is_start.astype(np.int64)).groupby(groups)
+        grouped_completes = pd.Series(is_complete.astype(np.int64)).groupby(groups)
+        starts_before = grouped_starts.cumsum().to_numpy()
+        completes_until = grouped_completes.cumsum().to_numpy()
+
+        # only complete events contribute to the minimum
+        slack = np.where(
+            is_complete, starts_before - completes_until, np.iinfo(np.int64).max
+        )
+        min_slack = pd.Series(slack).groupby(groups).cummin().to_numpy()
+        popped = completes_until + np.minimum(0, min_slack)
+        popped_before = (
+            pd.Series(np.where(is_complete, popped, 0))
+            .groupby(groups)
+            .shift(1, fill_value=0)
+        )
+        # the popped counts of the complete events are non-decreasing, the previous complete event has the maximum
+        popped_before = (
+            pd.Series(popped_before.to_numpy()).groupby(groups).cummax().to_numpy()
+        )
+        is_paired = is_complete & (popped > popped_before)
+
+        # the k-th start event of a group is the (first start event of the group + k - 1)-th start event
+        start_positions = np.flatnonzero(is_start)
+        group_offsets = np.searchsorted(groups[start_positions], groups[is_paired])
+        paired_starts = start_positions[group_offsets + popped[is_paired] - 1]
+
+        starts = timestamps.copy()
+        starts[order[is_paired]] = timestamps[order[paired_starts]]
+        return starts
@@ -2,11 +2,15 @@ from collections import Counter
 from collections import defaultdict
 from copy import copy
 from dataclasses import dataclass
-from typing import Mapping, Tuple, Dict, List, Any
+from functools import partial
+from typing import Mapping, Tuple, Dict, List, Any, Sequence, Optional
 
+import numpy as np
+import pandas as pd
 from pm4py.objects.log.obj import EventLog, Trace
 from pm4py.objects.log.util.interval_lifecycle import to_interval
 from pm4py.util.xes_constants import (
+    DEFAULT_INSTANCE_KEY,
     DEFAULT_NAME_KEY,
     DEFAULT_START_TIMESTAMP_KEY,
     DEFAULT_TIMESTAMP_KEY,
@@ -14,7 +18,8 @@ from pm4py.util.xes_constants import (
 )
 
 from cortado_core.utils.timestamp_utils import TimeUnit, transform_timestamp
-from .cgroups_graph import cgroups_graph, ConcurrencyGroup
+from .cgroups_graph import cgroups_graph, cgroups_graph_from_columns, ConcurrencyGroup
+from .columnar_log import ColumnarIntervalLog
 from .parallel_utils import workload_split, workload_split_graphs
 from .split_graph import Group, LeafGroup, ParallelGroup, SequenceGroup, split_group
 
@@ -40,40 +45,55 @@ class SubvariantNode:
 
 
 def create_graphs(
-    log_renamed: EventLog, interval_log: EventLog, use_mp: bool, time_granularity, pool
-):
+    log_renamed: EventLog, interval_log: Sequence, use_mp: bool, time_granularity, pool
+) -> Dict[ConcurrencyGroup, List[Trace]]:
+    """
+    Creates the concurrency groups of the renamed traces
+    :param interval_log: the i-th element is returned for the i-th trace of log_renamed (the trace or, e.g., an index)
+    :return: the elements of interval_log of the traces of each concurrency group
+    """
     if not use_mp or pool is None:
-        return __create_graphs(log_renamed, interval_log, time_granularity)
-
-    graphs = {}
-    (
-        log_renamed_bounded,
-        interval_log_bounded,
-        time_granularity_bounded,
-    ) = workload_split(log_renamed, interval_log, time_granularity)
-    res = pool.starmap(
-        __create_graphs,
-        zip(log_renamed_bounded, interval_log_bounded, time_granularity_bounded),
-    )
-    while len(res) > 0:  # "Merge" the results of all workers
-        partial_result = res.pop()
-        for variant in partial_result:
-            graphs[variant] = graphs.get(variant, []) + partial_result[variant]
+        _, graph_indices = __create_graphs(
+            (0, log_renamed), time_granularity=time_granularity
+        )
+    else:
+        # the workers only return the indices of the traces, the chunks are merged in the order of the log, s.t. the
+        # result does not depend on the scheduling of the workers
+        partial_results = sorted(
+            pool.imap_unordered(
+                partial(__create_graphs, time_granularity=time_granularity),
+                workload_split(log_renamed),
+            ),
+            key=lambda partial_result: partial_result[0],
+        )
+        graph_indices = {}
+        for _, partial_result in partial_results:
+            for variant, indices in partial_result.items():
+                graph_indices.setdefault(variant, []).extend(indices)
 
-    return graphs
+    return {
+        variant: [interval_log[i] for i in indices]
+        for variant, indices in graph_indices.items()
+    }
 
 
 def __create_graphs(
-    log_renamed: EventLog, interval_log: EventLog, time_granularity: TimeUnit
-) -> Mapping[ConcurrencyGroup, List[Trace]]:
-    own_results: Dict[ConcurrencyGroup, List[Trace]] = dict()
-    for trace, original_trace in zip(log_renamed, interval_log):
+    chunk: Tuple[int, Sequence], time_granularity: TimeUnit
+) -> Tuple[int, Dict[ConcurrencyGroup, List[int]]]:
+    """
+    Creates the concurrency groups of a chunk of traces
+    :param chunk: index of the first trace and the traces of the chunk
+    :return: index of the first trace, the indices of the traces of each concurrency group
+    """
+    offset, traces = chunk
+    own_results: Dict[ConcurrencyGroup, List[int]] = dict()
+    for i, trace in enumerate(traces, start=offset):
         variant: ConcurrencyGroup = cgroups_graph(
             trace, time_granularity=time_granularity
         )
-        own_results[variant] = own_results.get(variant, []) + [original_trace]
+        own_results.setdefault(variant, []).append(i)
 
-    return own_results
+    return offset, own_results
 
 
 def create_variants(
@@ -83,40 +103,43 @@ def create_variants(
     use_mp: bool,
     pool,
 ):
-    if not use_mp or pool is None:
-        return __create_variants(list(graphs.items()), names, id_name_map)
+    graph_list = list(graphs.keys())
+    traces = list(graphs.values())
 
-    workload_graphs = workload_split_graphs(graphs)
-    workload_names = [names for _ in range(len(workload_graphs))]
-    workload_id_name_map = [id_name_map for _ in range(len(workload_graphs))]
+    if not use_mp or pool is None:
+        partial_results = [__create_variants((0, graph_list), names, id_name_map)]
+    else:
+        # the traces stay in the parent process, the workers return the variants and the graphs with restored names
+        partial_results = sorted(
+            pool.imap_unordered(
+                partial(__create_variants, names=names, id_name_map=id_name_map),
+                workload_split_graphs(graph_list),
+            ),
+            key=lambda partial_result: partial_result[0],
+        )
 
     variants = dict()
-    res = pool.starmap(
-        __create_variants, zip(workload_graphs, workload_names, workload_id_name_map)
-    )
-    while len(res) > 0:  # "Merge" the results of all workers
-        partial_result = res.pop()
-        for v in partial_result:
-            if not v.checkGroupType():
-                raise Exception("Variant contains ChoiceGroup")
-            variants[v] = graphs.get(v, []) + partial_result[v]
+    for offset, partial_result in partial_results:
+        for i, (v, graph) in enumerate(partial_result, start=offset):
+            variants.setdefault(v, []).append((graph, traces[i]))
 
     return variants
 
 
 def __create_variants(
-    graphs: List[Tuple[ConcurrencyGroup, List[Trace]]], names, id_name_map
-):
-    variants = dict()
-    for variant, traces in graphs:
+    chunk: Tuple[int, List[ConcurrencyGroup]], names, id_name_map
+) -> Tuple[int, List[Tuple[Group, ConcurrencyGroup]]]:
+    offset, graphs = chunk
+    variants = []
+    for variant in graphs:
         v = split_group(variant)
         if not v.checkGroupType():
             raise Exception("Variant contains ChoiceGroup")
         # Restore name and add a Reference to the Group
         variant.restore_names(names, id_name_map)
-        variants[v] = variants.get(v, []) + [(variant, traces)]
+        variants.append((v, variant))
 
-    return variants
+    return offset, variants
 
 
 def get_concurrency_variants(
@@ -125,6 +148,27 @@ def get_concurrency_variants(
     time_granularity: TimeUnit = min(TimeUnit),
     pool=None,
 ):
+    variants, interval_log = __get_variant_indices(log, use_mp, time_granularity, pool)
+
+    return {v: [interval_log[i] for i in indices] for v, indices in variants.items()}
+
+
+def get_concurrency_variant_indices(
+    log: EventLog,
+    use_mp: bool = False,
+    time_granularity: TimeUnit = min(TimeUnit),
+    pool=None,
+) -> Dict[Group, List[int]]:
+    """
+    Computes the same variants as get_concurrency_variants, but returns the indices of the traces in the log instead
+    of the (interval) traces
+    """
+    return __get_variant_indices(log, use_mp, time_granularity, pool)[0]
+
+
+def __get_variant_indices(
+    log: EventLog, use_mp: bool, time_granularity: TimeUnit, pool
+) -> Tuple[Dict[Group, List[int]], EventLog]:
     if log.attributes.get("PM4PY_TYPE", "") != "interval":
         if DEFAULT_TRANSITION_KEY in log[0][0]:
             traces = [
@@ -149,9 +193,11 @@ def get_concurrency_variants(
                 properties=log.properties,
             )
 
+    # to_interval keeps the order of the traces, so trace indices of the interval log are indices of the log
     interval_log = to_interval(log)
+    trace_indices = [i for i, trace in enumerate(interval_log) if len(trace) > 0]
     interval_log_filtered = EventLog(
-        [trace for trace in interval_log if len(trace) > 0],
+        [interval_log[i] for i in trace_indices],
         attributes=copy(log.attributes),
         extensions=log.extensions,
         classifiers=log.classifiers,
@@ -159,17 +205,132 @@ def get_concurrency_variants(
         properties=log.properties,
     )
     log_renamed, names = unique_activities(interval_log_filtered)
-    graphs = create_graphs(
-        log_renamed, interval_log_filtered, use_mp, time_granularity, pool
+    graphs = create_graphs(log_renamed, trace_indices, use_mp, time_granularity, pool)
+
+    return __group_graphs(graphs, names, use_mp, pool), interval_log
+
+
+def get_concurrency_variants_from_columns(
+    case_ids: Sequence,
+    activities: Sequence[str],
+    timestamps: Sequence,
+    lifecycles: Optional[Sequence[str]] = None,
+    start_timestamps: Optional[Sequence] = None,
+    instances: Optional[Sequence] = None,
+    use_mp: bool = False,
+    time_granularity: TimeUnit = min(TimeUnit),
+    pool=None,
+) -> Dict[Group, List[int]]:
+    """
+    Computes the same variants as get_concurrency_variants for a log given by columns with one entry per event, without
+    creating event objects. The events of a case are expected in the order of the log.
+    :param case_ids: case id of each event
+    :param activities: activity of each event
+    :param timestamps: timestamp of each event (datetimes or datetime64, the complete timestamp for interval events)
+    :param lifecycles: lifecycle transition of each event, only start and complete events are considered
+    :param start_timestamps: start timestamp of each event for a log of interval events, otherwise the start and
+    complete events are paired like in pm4py's to_interval
+    :param instances: lifecycle instance of each event, used to pair start and complete events
+    :return: for each variant, the indices of its traces, where the i-th trace is the case with the i-th distinct case
+    id in the order of occurrence
+    """
+    columnar_log = ColumnarIntervalLog(
+        case_ids,
+        activities,
+        timestamps,
+        lifecycles=lifecycles,
+        start_timestamps=start_timestamps,
+        instances=instances,
+    )
+
+    return get_concurrency_variants_from_columnar_log(
+        columnar_log, use_mp, time_granularity, pool
     )
 
+
+def get_concurrency_variants_from_columnar_log(
+    columnar_log: ColumnarIntervalLog,
+    use_mp: bool = False,
+    time_granularity: TimeUnit = min(TimeUnit),
+    pool=None,
+) -> Dict[Group, List[int]]:
+    """
+    :return: for each variant, the indices of its cases in columnar_log.case_ids
+    """
+    graphs = {}
+    for i, trace in zip(
+        columnar_log.case_indices.tolist(), columnar_log.get_traces(time_granularity)
+    ):
+        graphs.setdefault(cgroups_graph_from_columns(*trace), []).append(i)
+
+    return __group_graphs(graphs, columnar_log.names, use_mp, pool)
+
+
+def get_concurrency_variants_from_dataframe(
+    df: pd.DataFrame,
+    use_mp: bool = False,
+    time_granularity: TimeUnit = min(TimeUnit),
+    pool=None,
+    case_id_key: str = "case:concept:name",
+    activity_key: str = DEFAULT_NAME_KEY,
+    timestamp_key: str = DEFAULT_TIMESTAMP_KEY,
+    start_timestamp_key: str = DEFAULT_START_TIMESTAMP_KEY,
+    lifecycle_key: str = DEFAULT_TRANSITION_KEY,
+    instance_key: str = DEFAULT_INSTANCE_KEY,
+) -> Dict[Group, List[Any]]:
+    """
+    Computes the variants of a log given as a dataframe with one row per event (e.g., as returned by pm4py's
+    read_xes), see get_concurrency_variants_from_columns. The start timestamp, lifecycle and instance columns are
+    optional.
+    :return: for each variant, the case ids of its traces
+    """
+
+    def get_timestamps(key: str) -> np.ndarray:
+        return (
+            pd.to_datetime(df[key], utc=True)
+            .dt.tz_localize(None)
+            .to_numpy(dtype="datetime64[us]")
+        )
+
+    def get_column(key: str) -> Optional[np.ndarray]:
+        return df[key].to_numpy() if key in df.columns else None
+
+    variants = get_concurrency_variants_from_columns(
+        df[case_id_key].to_numpy(),
+        df[activity_key].to_numpy(),
+        get_timestamps(timestamp_key),
+        lifecycles=get_column(lifecycle_key),
+        start_timestamps=(
+            get_timestamps(start_timestamp_key)
+            if start_timestamp_key in df.columns
+            else None
+        ),
+        instances=get_column(instance_key),
+        use_mp=use_mp,
+        time_granularity=time_granularity,
+        pool=pool,
+    )
+
+    case_ids = pd.unique(df[case_id_key].to_numpy())
+    return {v: case_ids[indices].tolist() for v, indices in variants.items()}
+
+
+def __group_graphs(
+    graphs: Dict[ConcurrencyGroup, List], names, use_mp: bool, pool
+) -> Dict[Group, List]:
+    """
+    Splits the concurrency groups of the renamed activities into variants
+    :param graphs: traces (or trace indices) of each concurrency group
+    :param names: mapping from the renamed activities to the activities
+    :return: traces (or trace indices) of each variant
+    """
     id_name_map = {name: id for id, name in enumerate(names.keys())}
     variants = create_variants(graphs, names, id_name_map, use_mp, pool)
 
     res_variants = {}
     for v, ls in variants.items():
         for g, ts in ls:
-            res_variants[v] = res_variants.get(v, []) + ts
+            res_variants.setdefault(v, []).extend(ts)
             v.graphs[g] = v.graphs.get(g, 0) + len(ts)
 
     res_variants = restore_names(res_variants, names)
@@ -237,10 +398,14 @@ def restore_name(event, names):
 
 def restore_names(variants, names) -> Dict[Group, List[Trace]]:
     variants_new = {}
+    # different variants of renamed activities can have the same restored variant, their graphs are merged
+    instances = {}
     for v in variants:
         v_new = restore_names_rek(v, names)
-        variants_new[v_new] = variants_new.get(v_new, []) + variants[v]
-        v_new.graphs = v.graphs
+        v_new = instances.setdefault(v_new, v_new)
+        variants_new.setdefault(v_new, []).extend(variants[v])
+        for g, count in v.graphs.items():
+            v_new.graphs[g] = v_new.graphs.get(g, 0) + count
     return variants_new
 
 
@@ -253,7 +418,8 @@ def restore_names_rek(variant, names):
         return g
 
     elif isinstance(variant, LeafGroup):
-        g = LeafGroup([names[e] for e in variant])
+        # canonical order of the activities like in the serialized leaf groups
+        g = LeafGroup(sorted(names[e] for e in variant))
         return g
 
     return variant
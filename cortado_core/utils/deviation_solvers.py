@@ -1,12 +1,12 @@
 import dataclasses
 from abc import ABC, abstractmethod
+from collections import Counter
 from enum import Enum
 from multiprocessing import Pool
 from typing import Optional
 
 from pm4py import ProcessTree
-from pm4py.algo.discovery.inductive import algorithm as inductive_miner
-from pm4py.objects.log.obj import Trace, Event, EventLog
+from pm4py.objects.log.obj import Trace, Event
 from pm4py.objects.process_tree.obj import Operator
 from pm4py.util.typing import AlignmentResult
 
@@ -17,11 +17,14 @@ from cortado_core.utils.alignment_utils import is_log_move, is_sync_move, is_mod
 from cortado_core.utils.lca_utils import (
     find_lowest_common_ancestor,
     rediscover_subtree_and_modify_pt,
+    discover_process_tree_from_sublog,
 )
 from cortado_core.utils.sublog_utils import (
     calculate_sublog_for_lca,
+    calculate_sublog_for_lca_multiple_traces,
     generate_full_alignment_based_on_infix_alignment,
 )
+from cortado_core.utils.trace import trace_to_activity_tuple
 
 
 class DeviationType(Enum):
@@ -174,12 +177,25 @@ class EnclosedDeviationSolverTrace(DeviationSolver):
         self.pool = pool
 
     def solve(self, deviation: Deviation, pt: ProcessTree, log):
-        lca, process_tree_modified = find_lowest_common_ancestor(
-            deviation.left_node[0], deviation.right_node[0], self.try_pulldown
+        return self.solve_multiple([deviation], pt, log)
+
+    def solve_multiple(self, deviations: list[Deviation], pt: ProcessTree, log):
+        """
+        Solves several enclosed deviations that share the same lca at once, i.e., the lca is rediscovered only once
+        based on the sublog containing the deviating parts of all given alignments.
+        Parameters
+        ----------
+        deviations: enclosed deviations of full traces, all having the same lca
+        pt
+        log: already added traces
+
+        Returns
+        -------
+
+        """
+        lca, process_tree_modified = EnclosedDeviationSolverTrace.get_lca(
+            deviations[0], self.try_pulldown
         )
-        lca_is_leaf_node = len(lca.children) == 0
-        if lca_is_leaf_node:
-            lca = lca.parent
 
         assert lca
         assert is_subtree(pt, lca)
@@ -188,31 +204,34 @@ class EnclosedDeviationSolverTrace(DeviationSolver):
             # process tree was modified, recalculation of the alignment is needed
             return get_root(lca)
 
-        alignment_step_index_lca_activated = (
-            DeviationSolver.get_alignment_step_index_of_lca_activation(
-                deviation.deviation_index, deviation.alignment, lca
+        traces_to_add = []
+        for deviation in deviations:
+            alignment_step_index_lca_activated = (
+                DeviationSolver.get_alignment_step_index_of_lca_activation(
+                    deviation.deviation_index, deviation.alignment, lca
+                )
             )
-        )
-        alignment_step_index_lca_closed = (
-            DeviationSolver.get_alignment_step_index_of_lca_closing(
-                deviation.deviation_index, deviation.alignment, lca
+            alignment_step_index_lca_closed = (
+                DeviationSolver.get_alignment_step_index_of_lca_closing(
+                    deviation.deviation_index, deviation.alignment, lca
+                )
             )
-        )
 
-        trace_to_add = DeviationSolver.get_trace_to_add(
-            deviation.alignment,
-            lca,
-            alignment_step_index_lca_activated + 1,
-            alignment_step_index_lca_closed - 1,
-        )
+            trace_to_add = DeviationSolver.get_trace_to_add(
+                deviation.alignment,
+                lca,
+                alignment_step_index_lca_activated + 1,
+                alignment_step_index_lca_closed - 1,
+            )
+            traces_to_add.append(
+                (deviation.alignment, deviation.deviation_index, trace_to_add)
+            )
 
-        sublog = calculate_sublog_for_lca(
+        sublog = calculate_sublog_for_lca_multiple_traces(
             pt,
             log,
             lca,
-            deviation.alignment,
-            deviation.deviation_index,
-            trace_to_add,
+            traces_to_add,
             InfixType.NOT_AN_INFIX,
             self.pool,
         )
@@ -220,6 +239,17 @@ class EnclosedDeviationSolverTrace(DeviationSolver):
         pt = rediscover_subtree_and_modify_pt(lca, sublog)
         return pt
 
+    @staticmethod
+    def get_lca(deviation: Deviation, try_pulldown: bool) -> tuple[ProcessTree, bool]:
+        lca, process_tree_modified = find_lowest_common_ancestor(
+            deviation.left_node[0], deviation.right_node[0], try_pulldown
+        )
+        lca_is_leaf_node = len(lca.children) == 0
+        if lca_is_leaf_node:
+            lca = lca.parent
+
+        return lca, process_tree_modified
+
 
 class FallbackDeviationSolverTrace(DeviationSolver):
     def solve(self, deviation: Deviation, pt: ProcessTree, log):
@@ -301,15 +331,10 @@ class LeftEnclosedDeviationSolver(DeviationSolver):
             deviation.alignment, left_node, left_dev_idx
         )
 
-        trace_leaf_node = Trace()
-        if left_node.label is not None:
-            event_leaf_node = Event()
-            event_leaf_node["concept:name"] = left_node.label
-            trace_leaf_node.append(event_leaf_node)
+        leaf_node_variant = (left_node.label,) if left_node.label is not None else ()
+        sublog = Counter([trace_to_activity_tuple(trace_to_add), leaf_node_variant])
 
-        return rediscover_subtree_and_modify_pt(
-            left_node, EventLog([trace_to_add, trace_leaf_node])
-        )
+        return rediscover_subtree_and_modify_pt(left_node, sublog)
 
 
 class RightEnclosedDeviationSolver(DeviationSolver):
@@ -324,15 +349,10 @@ class RightEnclosedDeviationSolver(DeviationSolver):
             deviation.alignment, right_node, None, right_dev_idx
         )
 
-        trace_leaf_node = Trace()
-        if right_node.label is not None:
-            event_leaf_node = Event()
-            event_leaf_node["concept:name"] = right_node.label
-            trace_leaf_node.append(event_leaf_node)
+        leaf_node_variant = (right_node.label,) if right_node.label is not None else ()
+        sublog = Counter([trace_to_activity_tuple(trace_to_add), leaf_node_variant])
 
-        return rediscover_subtree_and_modify_pt(
-            right_node, EventLog([trace_to_add, trace_leaf_node])
-        )
+        return rediscover_subtree_and_modify_pt(right_node, sublog)
 
 
 class FallbackDeviationSolverInfix(DeviationSolver):
@@ -343,7 +363,9 @@ class FallbackDeviationSolverInfix(DeviationSolver):
 
     def solve(self, deviation: Deviation, pt: ProcessTree, log):
         new_infix = DeviationSolver.get_trace_to_add(deviation.alignment, pt)
-        new_pt_part = inductive_miner.apply(EventLog([new_infix, Trace()]), None)
+        new_pt_part = discover_process_tree_from_sublog(
+            Counter([trace_to_activity_tuple(new_infix), ()])
+        )
         new_root = ProcessTree(operator=Operator.PARALLEL, children=[pt, new_pt_part])
         new_pt_part.parent = new_root
         pt.parent = new_root
@@ -0,0 +1,52 @@
+from typing import Dict, Iterable, List
+
+from pm4py.objects.log.obj import EventLog
+
+from cortado_core.utils.columnar_log import ColumnarIntervalLog
+from cortado_core.utils.cvariants import get_concurrency_variants_from_columnar_log
+from cortado_core.utils.split_graph import Group
+from cortado_core.utils.timestamp_utils import TimeUnit
+
+
+class MultiGranularityVariants:
+    """
+    Concurrency variants of a log for several time granularities. The start and complete events of the log are paired,
+    the activities are renamed and the events of each trace are sorted only once (the order of the events does not
+    depend on the time granularity). For each time granularity, the timestamps are truncated with integer arithmetic
+    and the concurrency groups are created from the shared columns. The variants are cached per time granularity, i.e.,
+    switching to a time granularity that was computed before is a lookup.
+    """
+
+    def __init__(self, log: EventLog, use_mp: bool = False, pool=None):
+        self.columnar_log = ColumnarIntervalLog.from_event_log(log)
+        self.use_mp = use_mp
+        self.pool = pool
+        # TimeUnit is not hashable, the variants are cached by the names of the time units
+        self.__variants: Dict[str, Dict[Group, List[int]]] = {}
+
+    def get_variants(
+        self, time_granularity: TimeUnit = min(TimeUnit)
+    ) -> Dict[Group, List[int]]:
+        """
+        Returns the variants of get_concurrency_variant_indices for the time granularity
+        :return: for each variant, the indices of its traces in the log
+        """
+        if time_granularity.name not in self.__variants:
+            variants = get_concurrency_variants_from_columnar_log(
+                self.columnar_log, self.use_mp, time_granularity, self.pool
+            )
+            self.__variants[time_granularity.name] = {
+                v: self.columnar_log.case_ids[indices].tolist()
+                for v, indices in variants.items()
+            }
+
+        return self.__variants[time_granularity.name]
+
+    def compute(
+        self, time_granularities: Iterable[TimeUnit]
+    ) -> List[Dict[Group, List[int]]]:
+        """
+        Computes (or looks up) the variants for all time granularities
+        :return: the variants of each time granularity, in the given order
+        """
+        return [self.get_variants(g) for g in time_granularities]
@@ -1,18 +1,29 @@
-from typing import List, Tuple
+import copy
 import logging
+from collections import Counter
+from typing import List, Tuple
+
+from cachetools import LRUCache
 
 import pm4py.visualization.process_tree.visualizer as tree_vis
-from pm4py.objects.log.obj import EventLog
+from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructureUVCL
+from pm4py.algo.discovery.inductive.variants.im import IMUVCL
 from pm4py.objects.process_tree.obj import ProcessTree, Operator
-from pm4py.algo.discovery.inductive import algorithm as inductive_miner
 
 from cortado_core.process_tree_utils.miscellaneous import (
     get_index_of_pt_in_children_list,
     get_root,
 )
+from cortado_core.utils.trace import Sublog
 
 DEBUG = False
 
+DISCOVERY_CACHE_SIZE = 256
+
+# identical sublogs frequently occur across successive traces, e.g., if the same lca is repaired again, therefore,
+# discovered process trees are memoized by the fingerprint of the sublog
+_discovered_trees_cache = LRUCache(maxsize=DISCOVERY_CACHE_SIZE)
+
 
 def find_lowest_common_ancestor(
     pt1: ProcessTree, pt2: ProcessTree, try_pulling_lca_down
@@ -162,13 +173,41 @@ def __try_pulling_down_lca(
         return lca, False
 
 
+def get_sublog_fingerprint(sublog: Sublog) -> Tuple:
+    """
+    Canonical representation of a sublog, i.e., its variants in sorted order together with their frequencies
+    :param sublog: multiset of activity sequences
+    :return: hashable fingerprint
+    """
+    return tuple(
+        sorted((variant, count) for variant, count in sublog.items() if count > 0)
+    )
+
+
+def discover_process_tree_from_sublog(sublog: Sublog) -> ProcessTree:
+    """
+    Applies the inductive miner directly on a variant-compressed sublog, i.e., without materializing an event log.
+    Results are memoized, hence, a copy of the discovered tree is returned that can be modified by the caller
+    :param sublog: multiset of activity sequences
+    :return: discovered process tree
+    """
+    fingerprint = get_sublog_fingerprint(sublog)
+    if fingerprint not in _discovered_trees_cache:
+        parameters = {}
+        _discovered_trees_cache[fingerprint] = IMUVCL(parameters).apply(
+            IMDataStructureUVCL(Counter(dict(fingerprint))), parameters
+        )
+
+    return copy.deepcopy(_discovered_trees_cache[fingerprint])
+
+
 def rediscover_subtree_and_modify_pt(
-    subtree: ProcessTree, sublog: EventLog
+    subtree: ProcessTree, sublog: Sublog
 ) -> ProcessTree:
     assert type(subtree) is ProcessTree
-    assert type(sublog) is EventLog
+    assert isinstance(sublog, Counter)
 
-    rediscovered_subtree: ProcessTree = inductive_miner.apply(sublog, None)
+    rediscovered_subtree: ProcessTree = discover_process_tree_from_sublog(sublog)
     # detach old subtree and add rediscovered subtree
     logging.debug("rediscovered subtree:", rediscovered_subtree)
     if DEBUG:
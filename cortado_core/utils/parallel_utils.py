@@ -1,36 +1,80 @@
-from typing import List, Tuple, Mapping
+import os
+from itertools import accumulate
+from typing import List, Optional, Sequence, Tuple
+
+from pm4py.objects.log.obj import EventLog
+from pm4py.util.xes_constants import (
+    DEFAULT_NAME_KEY,
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+)
 
 from cortado_core.utils.cgroups_graph import ConcurrencyGroup
 
-from cortado_core.utils.timestamp_utils import TimeUnit
-from pm4py.objects.log.obj import EventLog, Trace
+# number of chunks per worker, more chunks balance the load between the workers (imap_unordered hands out the next
+# chunk to the first idle worker), fewer chunks reduce the scheduling overhead
+CHUNKS_PER_WORKER = 4
+
+# event attributes that are needed to create the concurrency group of a trace
+GRAPH_EVENT_KEYS = (
+    DEFAULT_NAME_KEY,
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+)
+
+
+def get_chunk_bounds(
+    sizes: Sequence[int], n_workers: Optional[int] = None
+) -> List[Tuple[int, int]]:
+    """
+    Splits the items into contiguous chunks with roughly equal total sizes
+    :param sizes: size, i.e., estimated costs, of each item
+    :param n_workers: number of workers, defaults to the number of cpus
+    :return: (lower, upper) bounds of the chunks
+    """
+    if len(sizes) == 0:
+        return []
+
+    n_chunks = min(len(sizes), CHUNKS_PER_WORKER * (n_workers or os.cpu_count() or 1))
+    # items without costs still have to be sent to the workers
+    cumulative_sizes = list(accumulate(max(size, 1) for size in sizes))
+    chunk_size = cumulative_sizes[-1] / n_chunks
 
-MIN_CHUNKS = 8
+    bounds = []
+    lower = 0
+    for i, cumulative_size in enumerate(cumulative_sizes):
+        if cumulative_size >= chunk_size * (len(bounds) + 1) or i == len(sizes) - 1:
+            bounds.append((lower, i + 1))
+            lower = i + 1
+
+    return bounds
 
 
 def workload_split(
-    log_renamed: EventLog, interval_log: EventLog, time_granularity: TimeUnit
-) -> Tuple[List[EventLog], List[EventLog], List[TimeUnit]]:
-    len_log = len(log_renamed)
-    step_size = min(100, len_log // MIN_CHUNKS)
-    bounds = [(i, min([i + step_size, len_log])) for i in range(0, len_log, step_size)]
-
-    log_renamed_bounds = [log_renamed[lower:upper] for lower, upper in bounds]
-    interval_log_bounds = [interval_log[lower:upper] for lower, upper in bounds]
-
-    return (
-        log_renamed_bounds,
-        interval_log_bounds,
-        [time_granularity for _ in range(len(bounds))],
-    )
-
-
-def workload_split_graphs(graphs: Mapping[ConcurrencyGroup, List[Trace]]):
-    len_graphs = len(graphs)
-    step_size = min(100, len_graphs // MIN_CHUNKS)
-    bounds = [
-        (i, min([i + step_size, len_graphs])) for i in range(0, len_graphs, step_size)
+    log_renamed: EventLog, n_workers: Optional[int] = None
+) -> List[Tuple[int, List[List[dict]]]]:
+    """
+    Splits the log into chunks with roughly the same number of events. The events are reduced to the attributes that
+    are needed to create the concurrency groups, s.t. only a fraction of the log has to be sent to the workers.
+    :return: (index of the first trace, traces of reduced events) of each chunk
+    """
+    traces = [
+        [{key: event[key] for key in GRAPH_EVENT_KEYS} for event in trace]
+        for trace in log_renamed
     ]
-    flattend_graphs = list(graphs.items())
+    bounds = get_chunk_bounds([len(trace) for trace in traces], n_workers)
+
+    return [(lower, traces[lower:upper]) for lower, upper in bounds]
+
+
+def workload_split_graphs(
+    graphs: Sequence[ConcurrencyGroup], n_workers: Optional[int] = None
+) -> List[Tuple[int, List[ConcurrencyGroup]]]:
+    """
+    Splits the graphs into chunks with roughly the same costs of splitting the graphs into variants, which grow
+    quadratically with the number of events
+    :return: (index of the first graph, graphs) of each chunk
+    """
+    bounds = get_chunk_bounds([len(graph.events) ** 2 for graph in graphs], n_workers)
 
-    return [flattend_graphs[lower:upper] for lower, upper in bounds]
+    return [(lower, list(graphs[lower:upper])) for lower, upper in bounds]
@@ -1,8 +1,11 @@
 import math
 from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, Tuple
 
 import networkx
 import networkx as nx
+import numpy as np
+from cachetools import LRUCache
 from pm4py.objects.log.obj import Trace
 from pm4py.objects.petri_net.obj import PetriNet, Marking
 from pm4py.objects.petri_net.utils import petri_utils
@@ -43,21 +46,186 @@ def get_distances_from_transitions_to_places(petri_net: PetriNet):
     Returns the distances from all transitions to all reachable places.
     The distance denotes the number of arcs in the petri_net.
     """
-    distances = get_all_distances(petri_net)
+    distance_table = get_distance_table(petri_net)
     res = {}
-    for source, distances in distances:
-        if type(source) is PetriNet.Transition:
-            res[source] = defaultdict(
-                lambda: math.inf,
-                {
-                    target.name: distances[target]
-                    for target in distances
-                    if type(target) is PetriNet.Place
-                },
-            )
+    for transition in petri_net.transitions:
+        res[transition] = defaultdict(
+            lambda: math.inf,
+            {
+                place_name: distance
+                for place_name, distance in distance_table.get_distances(
+                    transition.name
+                ).items()
+                if distance < math.inf
+            },
+        )
     return res
 
 
+DISTANCE_TABLE_CACHE_SIZE = 32
+_distance_tables = LRUCache(maxsize=DISTANCE_TABLE_CACHE_SIZE)
+
+PetriNetFingerprint = Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[Tuple[str, str]]]
+
+
+class DistanceTable:
+    """
+    Distances (number of arcs) from every transition to every place of a petri net. The net is stored as CSR adjacency
+    and a breadth-first search is only started from transitions, the results are kept in a dense matrix with one row
+    per transition and one column per place. Transitions and places are identified by their names, so the table can be
+    shared between (deep) copies of a net.
+    """
+
+    def __init__(self, petri_net: PetriNet):
+        self.place_index: Dict[str, int] = {}
+        self.transition_index: Dict[str, int] = {}
+        self.__build_adjacency(petri_net)
+        self.distances = np.full(
+            (len(self.transition_index), len(self.place_index)), np.inf
+        )
+        for row in range(len(self.transition_index)):
+            self.__update_row(row)
+
+    def __build_adjacency(self, petri_net: PetriNet):
+        for place in petri_net.places:
+            self.place_index.setdefault(place.name, len(self.place_index))
+        for transition in petri_net.transitions:
+            self.transition_index.setdefault(
+                transition.name, len(self.transition_index)
+            )
+
+        # places are the nodes 0, ..., |P| - 1, transitions the nodes |P|, ..., |P| + |T| - 1
+        n_places = len(self.place_index)
+        sources = []
+        targets = []
+        for arc in petri_net.arcs:
+            sources.append(self.__get_node(arc.source, n_places))
+            targets.append(self.__get_node(arc.target, n_places))
+        sources = np.array(sources, dtype=np.int64)
+        targets = np.array(targets, dtype=np.int64)
+
+        order = np.argsort(sources, kind="stable")
+        self.indices = targets[order]
+        self.indptr = np.zeros(n_places + len(self.transition_index) + 1, np.int64)
+        np.cumsum(
+            np.bincount(sources, minlength=len(self.indptr) - 1),
+            out=self.indptr[1:],
+        )
+
+    def __get_node(self, node, n_places: int) -> int:
+        if type(node) is PetriNet.Place:
+            return self.place_index[node.name]
+        return n_places + self.transition_index[node.name]
+
+    def __update_row(self, row: int):
+        n_places = len(self.place_index)
+        node_distances = np.full(len(self.indptr) - 1, -1, dtype=np.int64)
+        frontier = np.array([n_places + row], dtype=np.int64)
+        node_distances[frontier] = 0
+        distance = 0
+        while frontier.size > 0:
+            distance += 1
+            starts = self.indptr[frontier]
+            counts = self.indptr[frontier + 1] - starts
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            neighbours = self.indices[offsets + np.arange(counts.sum())]
+            frontier = np.unique(neighbours[node_distances[neighbours] < 0])
+            node_distances[frontier] = distance
+
+        place_distances = node_distances[:n_places].astype(float)
+        place_distances[place_distances < 0] = np.inf
+        self.distances[row] = place_distances
+
+    def get_distance(self, transition_name: str, place_name: str) -> float:
+        if (
+            transition_name not in self.transition_index
+            or place_name not in self.place_index
+        ):
+            return math.inf
+        return float(
+            self.distances[
+                self.transition_index[transition_name], self.place_index[place_name]
+            ]
+        )
+
+    def get_distances(self, transition_name: str) -> Dict[str, float]:
+        row = self.distances[self.transition_index[transition_name]]
+        return {name: float(row[i]) for name, i in self.place_index.items()}
+
+    def with_added_transitions(
+        self, petri_net: PetriNet, added_transitions: Iterable[PetriNet.Transition]
+    ) -> "DistanceTable":
+        """
+        Returns the table of the net after the given transitions (and possibly places that are only connected to them)
+        were added. Only the rows of the new transitions and of the transitions that reach a place in the preset of a
+        new transition are recomputed, all other distances cannot change.
+        """
+        res = DistanceTable.__new__(DistanceTable)
+        res.place_index = dict(self.place_index)
+        res.transition_index = dict(self.transition_index)
+        res.__build_adjacency(petri_net)
+
+        res.distances = np.full(
+            (len(res.transition_index), len(res.place_index)), np.inf
+        )
+        res.distances[: self.distances.shape[0], : self.distances.shape[1]] = (
+            self.distances
+        )
+
+        entry_places = [
+            self.place_index[arc.source.name]
+            for t in added_transitions
+            for arc in t.in_arcs
+            if arc.source.name in self.place_index
+        ]
+        affected_rows = set(range(self.distances.shape[0], len(res.transition_index)))
+        if len(entry_places) > 0:
+            affected_rows.update(
+                np.flatnonzero(
+                    np.isfinite(self.distances[:, entry_places]).any(axis=1)
+                ).tolist()
+            )
+        for row in sorted(affected_rows):
+            res.__update_row(row)
+
+        return res
+
+
+def get_petri_net_fingerprint(petri_net: PetriNet) -> PetriNetFingerprint:
+    return (
+        frozenset(p.name for p in petri_net.places),
+        frozenset(t.name for t in petri_net.transitions),
+        frozenset((arc.source.name, arc.target.name) for arc in petri_net.arcs),
+    )
+
+
+def get_distance_table(petri_net: PetriNet) -> DistanceTable:
+    """
+    Returns the (cached) transition-to-place distance table of the petri net
+    """
+    fingerprint = get_petri_net_fingerprint(petri_net)
+    if fingerprint not in _distance_tables:
+        _distance_tables[fingerprint] = DistanceTable(petri_net)
+    return _distance_tables[fingerprint]
+
+
+def update_distance_table(
+    fingerprint_before_modification: PetriNetFingerprint,
+    petri_net: PetriNet,
+    added_transitions: Iterable[PetriNet.Transition],
+):
+    """
+    If the distance table of the net before adding the given transitions is cached, the table of the modified net is
+    derived from it by recomputing the affected rows only
+    """
+    distance_table = _distance_tables.get(fingerprint_before_modification)
+    if distance_table is None:
+        return
+    _distance_tables[get_petri_net_fingerprint(petri_net)] = (
+        distance_table.with_added_transitions(petri_net, added_transitions)
+    )
+
+
 def get_transitions_by_label(petri_net: PetriNet, label: str):
     res = set()
     for t in petri_net.transitions:
@@ -1,14 +1,13 @@
 from collections import Counter
 from copy import deepcopy
-from functools import cmp_to_key
 from itertools import product, combinations
-from typing import List, Mapping
+from typing import Dict, List, Mapping, Optional, Tuple
+from weakref import WeakValueDictionary
 
-import networkx as nx
 from more_itertools import pairwise
 
 from cortado_core.models.infix_type import InfixType
-from cortado_core.utils.cgroups_graph import ConcurrencyGroup
+from cortado_core.utils.cgroups_graph import ConcurrencyGroup, FollowsRelation
 from cortado_core.utils.collection_utils import (
     count_ordererd_sub_list_occurrences,
     count_unordered_sub_list_occurrences,
@@ -131,6 +130,28 @@ class Group(list):
     def number_of_activities(self) -> int:
         return 0
 
+    def freeze(
+        self, memo: Optional[Dict[int, Tuple["Group", "FrozenGroup"]]] = None
+    ) -> "FrozenGroup":
+        """
+        Returns the immutable representation of the group
+        :param memo: maps the ids of groups that were frozen before to (group, frozen group), it is filled with the
+        subgroups of the group, s.t. later calls for the subgroups are O(1). The groups must not be changed while the
+        memo is used.
+        """
+        if memo is not None and id(self) in memo:
+            return memo[id(self)][1]
+
+        if isinstance(self, LeafGroup):
+            children = tuple(self)
+        else:
+            children = tuple(g.freeze(memo) for g in self)
+        frozen = FrozenGroup(type(self), children, self.infix_type)
+
+        if memo is not None:
+            memo[id(self)] = (self, frozen)
+        return frozen
+
     def assign_dfs_ids(self):
         def __dfs_traversal(group, offset):
             group.id = offset
@@ -504,84 +525,307 @@ class LeafGroup(Group):
         return len([x for x in self])
 
 
-def get_compare(G_follows):
-    def compare(p1, p2):
-        e1 = next(iter(p1))
-        e2 = next(iter(p2))
-        if (e1, e2) in G_follows.edges:
-            return -1
-        else:
-            return 1
+class FrozenGroup:
+    """
+    Immutable representation of a group, e.g., to use variants as dict keys. The hash is computed once and equals
+    the hash of the corresponding (mutable) group, i.e., frozen and mutable groups can be used interchangeably as keys.
+    The children of unordered groups (parallel, choice and fallthrough groups) are kept in the canonical order of the
+    hash. Like the strings of groups, the strings of leaf groups depend on the order of their activities, therefore it
+    is kept (and leaf groups with different orders are different, but equal, instances). Frozen groups are hash-consed, i.e., equal frozen groups (and subgroups) are the same instance and
+    comparing them is O(1). The sort key is the string of the group, s.t. frozen groups are sorted like groups.
+    """
 
-    return compare
+    __slots__ = ("kind", "children", "infix_type", "_hash", "_str", "__weakref__")
 
+    __instances: "WeakValueDictionary[tuple, FrozenGroup]" = WeakValueDictionary()
 
-def cut(G_follows, G_parallel, G_split_target):
-    connected_components = list(nx.connected_components(G_split_target.to_undirected()))
-    if len(connected_components) > 1:
-        if G_split_target == G_parallel:
-            connected_components = sorted(
-                connected_components, key=cmp_to_key(get_compare(G_follows))
-            )
-            group = SequenceGroup()
-        else:
-            group = ParallelGroup()
+    def __new__(
+        cls,
+        kind: type,
+        children: tuple,
+        infix_type: InfixType = InfixType.NOT_AN_INFIX,
+    ):
+        """
+        :param kind: type of the corresponding group, e.g., SequenceGroup
+        :param children: frozen children or the activities of a leaf group
+        """
+        if kind in UNORDERED_GROUP_TYPES:
+            children = tuple(sorted(children, key=str))
+        # the children are interned, i.e., they are identified by their ids (equal but differently ordered leaf groups
+        # are different instances). The instance keeps its children alive as long as it is in the table.
+        key = (
+            kind,
+            infix_type,
+            tuple(id(e) if isinstance(e, FrozenGroup) else e for e in children),
+        )
 
-        for connected_component in connected_components:
-            G_parallel_cut = G_parallel.subgraph(connected_component)
-            G_follows_cut = G_follows.subgraph(connected_component)
+        instance = cls.__instances.get(key)
+        if instance is None:
+            instance = super().__new__(cls)
+            instance.kind = kind
+            instance.children = children
+            instance.infix_type = infix_type
+            # same hash as the group, the hashes of the children are cached
+            if kind is LeafGroup:
+                instance._hash = hash(tuple(sorted(children)) + (infix_type,))
+            elif kind in (ChoiceGroup, FallthroughGroup):
+                instance._hash = hash(children)
+            else:
+                instance._hash = hash(children + (infix_type,))
+            instance._str = None
+            cls.__instances[key] = instance
 
-            split = split_graph(G_follows_cut, G_parallel_cut)
-            group.append(split)
-        return group
-    else:
-        return None
+        return instance
+
+    def __reduce__(self):
+        # the hashes of the activities depend on the process, i.e., frozen groups are hash-consed again when unpickled
+        return FrozenGroup, (self.kind, self.children, self.infix_type)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, o: object) -> bool:
+        # equality of groups is the equality of their hashes
+        return self is o or (
+            isinstance(o, (Group, FrozenGroup)) and self._hash == o.__hash__()
+        )
+
+    def __lt__(self, other):
+        return str(self) < str(other)
+
+    def __iter__(self):
+        return iter(self.children)
+
+    def __getitem__(self, i):
+        return self.children[i]
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        if self._str is None:
+            self._str = self.print()
+        return self._str
+
+    @property
+    def sort_key(self) -> str:
+        return str(self)
+
+    def print(self, i=0):
+        s = "-" * i
 
+        if self.kind is not LeafGroup:
+            s += f"{self.kind.__name__}:\n"
 
-def sequence_cut(G_follows, G_parallel):
-    return cut(G_follows, G_parallel, G_parallel)
+        for e in self.children:
+            if isinstance(e, FrozenGroup):
+                s += e.print(i + 2)
+            else:
+                s += str(e)
+                s += "\n"
+        return s
+
+    def list_length(self):
+        return len(self.children)
+
+    def number_of_activities(self) -> int:
+        if self.kind is LeafGroup:
+            return len(self.children)
+        return sum([e.number_of_activities() for e in self.children])
+
+    def thaw(self) -> Group:
+        """
+        Returns a new (mutable) group with the children in the canonical order
+        """
+        if self.kind is LeafGroup:
+            return LeafGroup(self.children, self.infix_type)
+        return self.kind([e.thaw() for e in self.children], self.infix_type)
 
 
-def parallel_cut(G_follows, G_parallel):
-    return cut(G_follows, G_parallel, G_follows)
+# groups whose hash does not depend on the order of their child groups
+UNORDERED_GROUP_TYPES = (ParallelGroup, ChoiceGroup, FallthroughGroup)
 
 
 def split_graph(G_follows, G_parallel):
-    if len(G_follows.nodes) == 1:
-        leaf = LeafGroup(map(lambda x: str(x), G_follows.nodes))
-        try:
-            leaf.alignment_eid = list(G_follows.nodes)[0].eid
-            leaf.is_sync_alignment_group = list(G_follows.nodes)[0].is_synchronous
-        except AttributeError:
-            pass
-        return leaf
-    groups = sequence_cut(G_follows, G_parallel)
-    if groups == None:
-        groups = parallel_cut(G_follows, G_parallel)
-
-    if groups == None:
-        groups = LeafGroup([e for e in G_follows.nodes])
-        # groups = FallthroughGroup([LeafGroup([n]) for n in G_follows.nodes])
-
-    return groups
-
-
-def split_group(g):
-    G_follows = nx.DiGraph()
-    G_follows.add_nodes_from(g.events)
-    G_follows.add_edges_from(g.follows)
-
-    G_parallel = nx.Graph()
-    G_parallel.add_nodes_from(g.events)
-    for edge in g.concurrency_pairs:
-        if len(edge) == 1:
-            G_parallel.add_edge(next(iter(edge)), next(iter(edge)))
-        else:
-            edge = list(edge)
-            G_parallel.add_edge(edge[0], edge[1])
+    """
+    Splits the (networkx) graphs of the follows and the concurrency relation of the events into a variant
+    """
+    nodes = list(G_follows.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
 
-    v = split_graph(G_follows, G_parallel)
-    return v
+    follows = [0] * len(nodes)
+    preceded_by = [0] * len(nodes)
+    parallel = [0] * len(nodes)
+    for e1, e2 in G_follows.edges:
+        follows[index[e1]] |= 1 << index[e2]
+        preceded_by[index[e2]] |= 1 << index[e1]
+    for e1, e2 in G_parallel.edges:
+        parallel[index[e1]] |= 1 << index[e2]
+        parallel[index[e2]] |= 1 << index[e1]
+
+    return split_relations(nodes, follows, preceded_by, parallel)
+
+
+def split_group(g: ConcurrencyGroup):
+    """
+    Splits the concurrency group into a variant
+    """
+    if isinstance(g.follows, FollowsRelation) and len(g.follows.activities) == len(
+        g.events
+    ):
+        return split_relations(g.follows.activities, *__get_interval_relations(g))
+
+    # events of the relations are added like by networkx
+    index = {node: i for i, node in enumerate(g.events)}
+    follows_pairs = [
+        (index.setdefault(e1, len(index)), index.setdefault(e2, len(index)))
+        for e1, e2 in g.follows
+    ]
+    parallel_pairs = []
+    for pair in g.concurrency_pairs:
+        # concurrency pairs of an event with itself can be sets with one element
+        pair = list(pair)
+        e1, e2 = pair[0], pair[-1]
+        parallel_pairs.append(
+            (index.setdefault(e1, len(index)), index.setdefault(e2, len(index)))
+        )
+
+    follows = [0] * len(index)
+    preceded_by = [0] * len(index)
+    parallel = [0] * len(index)
+    for i, j in follows_pairs:
+        follows[i] |= 1 << j
+        preceded_by[j] |= 1 << i
+    for i, j in parallel_pairs:
+        if i != j:
+            parallel[i] |= 1 << j
+            parallel[j] |= 1 << i
+
+    return split_relations(list(index), follows, preceded_by, parallel)
+
+
+def split_relations(
+    nodes: list, follows: List[int], preceded_by: List[int], parallel: List[int]
+) -> Group:
+    """
+    Splits the events into a variant by recursive cuts. If the concurrent events form several connected components,
+    they are split into a sequence of the components, else if the events that follow each other form several connected
+    components, they are split into parallel components, otherwise the events form a leaf group.
+    The relations are given as bitsets over the indices of the events, e.g., bit j of follows[i] is set iff event j
+    follows event i, and the connected components are computed by a closure over the bitsets.
+    :param nodes: the events, leaf groups contain their strings
+    :param follows: events that follow each event
+    :param preceded_by: events that are followed by each event, i.e., the inverse relation of follows
+    :param parallel: events that are concurrent to each event
+    """
+    # a self loop does not connect different events and is not a predecessor of another component
+    follows = [f & ~(1 << i) for i, f in enumerate(follows)]
+    preceded_by = [p & ~(1 << i) for i, p in enumerate(preceded_by)]
+    neighbours = [f | p for f, p in zip(follows, preceded_by)]
+
+    return __split(nodes, (1 << len(nodes)) - 1, preceded_by, neighbours, parallel)
+
+
+def __split(
+    nodes: list,
+    events: int,
+    preceded_by: List[int],
+    neighbours: List[int],
+    parallel: List[int],
+) -> Group:
+    if events != 0 and events & (events - 1) == 0:
+        return __create_leaf(nodes[events.bit_length() - 1])
+
+    components = __get_connected_components(events, parallel)
+    if len(components) > 1:
+        # the components are totally ordered by the follows relation, i.e., the topological rank of a component is the
+        # number of components whose (arbitrary) representative is followed by the representative of the component
+        representatives = 0
+        for component in components:
+            representatives |= component & -component
+        components.sort(
+            key=lambda c: (
+                preceded_by[(c & -c).bit_length() - 1] & representatives
+            ).bit_count()
+        )
+        group = SequenceGroup()
+    else:
+        components = __get_connected_components(events, neighbours)
+        if len(components) <= 1:
+            # canonical order, the order of the events would change the hash of a parent parallel group
+            return LeafGroup(sorted((nodes[i] for i in __get_indices(events)), key=str))
+        group = ParallelGroup()
+
+    for component in components:
+        group.append(__split(nodes, component, preceded_by, neighbours, parallel))
+    return group
+
+
+def __create_leaf(node) -> LeafGroup:
+    leaf = LeafGroup([str(node)])
+    try:
+        leaf.alignment_eid = node.eid
+        leaf.is_sync_alignment_group = node.is_synchronous
+    except AttributeError:
+        pass
+    return leaf
+
+
+def __get_connected_components(events: int, adjacency: List[int]) -> List[int]:
+    """
+    :return: the connected components (bitsets) of the subgraph of the events (bitset)
+    """
+    components = []
+    remaining = events
+    while remaining:
+        component = frontier = remaining & -remaining
+        while frontier:
+            reachable = 0
+            for i in __get_indices(frontier):
+                reachable |= adjacency[i]
+            frontier = reachable & remaining & ~component
+            component |= frontier
+        components.append(component)
+        remaining &= ~component
+
+    return components
+
+
+def __get_indices(bitset: int):
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
+
+
+def __get_interval_relations(g: ConcurrencyGroup) -> Tuple[List[int], ...]:
+    """
+    Returns the bitsets of the follows, the inverse follows and the concurrency relation of a concurrency group created
+    by cgroups_graph, whose events are followed by the suffixes of the sweep order (see FollowsRelation). All other
+    pairs of events are concurrent.
+    """
+    followers = g.follows.followers
+    n = len(followers)
+    all_events = (1 << n) - 1
+
+    follows = [all_events >> follower << follower for follower in followers]
+
+    # event k is followed by the events followers[k], ..., n - 1
+    first_followed = [0] * (n + 1)
+    for k, follower in enumerate(followers):
+        first_followed[follower] |= 1 << k
+    preceded_by = []
+    predecessors = 0
+    for i in range(n):
+        predecessors |= first_followed[i]
+        preceded_by.append(predecessors)
+
+    parallel = [
+        all_events & ~(f | p | (1 << i))
+        for i, (f, p) in enumerate(zip(follows, preceded_by))
+    ]
+
+    return follows, preceded_by, parallel
 
 
 def create_graph_for_cvariant(cvariant):
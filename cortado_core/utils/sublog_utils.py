@@ -1,4 +1,5 @@
-import multiprocessing
+import multiprocessing.pool
+from collections import Counter
 from typing import Optional
 
 from pm4py import ProcessTree, Marking
@@ -8,7 +9,7 @@ from pm4py.algo.conformance.alignments.petri_net.algorithm import (
 from pm4py.algo.conformance.alignments.petri_net.algorithm import (
     variants as variants_calculate_alignments,
 )
-from pm4py.objects.log.obj import Trace, EventLog, Event
+from pm4py.objects.log.obj import Trace, EventLog
 from pm4py.objects.petri_net.semantics import PetriNetSemantics
 from pm4py.objects.petri_net.utils.align_utils import STD_MODEL_LOG_MOVE_COST
 from pm4py.util.typing import AlignmentResult
@@ -24,7 +25,11 @@ from cortado_core.utils.alignment_utils import (
     is_log_move,
 )
 from cortado_core.utils.parallel_alignments import calculate_alignments_parallel
-from cortado_core.utils.trace import TypedTrace, combine_event_logs
+from cortado_core.utils.trace import (
+    TypedTrace,
+    Sublog,
+    trace_to_activity_tuple,
+)
 
 
 def calculate_sublog_for_lca(
@@ -36,9 +41,9 @@ def calculate_sublog_for_lca(
     trace_to_add,
     infix_type: InfixType,
     pool,
-) -> EventLog:
+) -> Sublog:
     """
-    Calculates the sublog given a process tree with its lca.
+    Calculates the (variant-compressed) sublog given a process tree with its lca.
     Parameters
     ----------
     pt: process tree that will be rediscovered
@@ -53,41 +58,83 @@ def calculate_sublog_for_lca(
     Returns
     -------
 
+    """
+    return calculate_sublog_for_lca_multiple_traces(
+        pt, log, lca, [(alignment, deviation_i, trace_to_add)], infix_type, pool
+    )
+
+
+def calculate_sublog_for_lca_multiple_traces(
+    pt: ProcessTree,
+    log: list[TypedTrace],
+    lca: ProcessTree,
+    traces_to_add: list[tuple[AlignmentResult, int, Trace]],
+    infix_type: InfixType,
+    pool,
+) -> Sublog:
+    """
+    Calculates the (variant-compressed) sublog given a process tree with its lca for several traces/fragments that are
+    added at once, i.e., that deviate at the same lca.
+    Parameters
+    ----------
+    pt: process tree that will be rediscovered
+    log: already added traces
+    lca: lca that need to be rediscovered
+    traces_to_add: triples (alignment, deviation_i, trace_to_add) for each added trace/fragment
+    infix_type: type of the traces/fragments that are added
+    pool
+
+    Returns
+    -------
+
     """
     not_infix_log, infix_traces = __split_log_by_infix_type(log)
     sublogs = __calculate_sub_log_for_each_node_regular_traces(
         pt, not_infix_log, pool=pool
     )
-    # adding the fitting prefix is important to ensure that we do not add deviations in the alignment that are on
-    # the left-hand side of the current deviation
-    sublogs = __add_fitting_alignment_prefix_to_sublogs(
-        alignment, deviation_i, infix_type, sublogs
-    )
 
-    sublog = sublogs[lca.id] if lca.id in sublogs else EventLog()
-    sublog.append(trace_to_add)
+    for alignment, deviation_i, trace_to_add in traces_to_add:
+        # adding the fitting prefix is important to ensure that we do not add deviations in the alignment that are on
+        # the left-hand side of the current deviation
+        sublogs = __add_fitting_alignment_prefix_to_sublogs(
+            alignment, deviation_i, infix_type, sublogs
+        )
 
-    return combine_event_logs(
-        sublog, calculate_sublog_for_infix_prefix_postfix_traces(infix_traces, pt, lca)
+    sublog = sublogs[lca.id] if lca.id in sublogs else Counter()
+    for _, _, trace_to_add in traces_to_add:
+        sublog[trace_to_activity_tuple(trace_to_add)] += 1
+    sublog.update(
+        calculate_sublog_for_infix_prefix_postfix_traces(infix_traces, pt, lca)
     )
 
+    return sublog
+
 
 def calculate_sublog_for_infix_prefix_postfix_traces(
     infixes: list[TypedTrace], process_tree: ProcessTree, lca: ProcessTree
-):
-    sublog = EventLog()
+) -> Sublog:
+    # identical infixes/prefixes/postfixes yield identical sublogs, hence, each of them is aligned only once
+    representatives: dict[tuple, TypedTrace] = {}
+    occurrences = Counter()
     for infix in infixes:
-        sublog = combine_event_logs(
-            sublog,
-            generate_infix_sublog(infix.trace, infix.infix_type, process_tree, lca),
+        key = (trace_to_activity_tuple(infix.trace), infix.infix_type)
+        representatives.setdefault(key, infix)
+        occurrences[key] += 1
+
+    sublog = Counter()
+    for key, infix in representatives.items():
+        infix_sublog = generate_infix_sublog(
+            infix.trace, infix.infix_type, process_tree, lca
         )
+        for variant, count in infix_sublog.items():
+            sublog[variant] += count * occurrences[key]
 
     return sublog
 
 
 def generate_infix_sublog(
     infix: Trace, infix_type: InfixType, process_tree: ProcessTree, lca: ProcessTree
-) -> EventLog:
+) -> Sublog:
     """
     Calculates the sublog for the lca of a fitting infix/prefix/postfix
     Parameters
@@ -110,7 +157,7 @@ def generate_infix_sublog(
     sublogs = dict()
     sublogs = add_alignment_to_sublogs(alignment, sublogs, allow_deviations=True)
 
-    return sublogs[lca.id] if lca.id in sublogs else EventLog()
+    return sublogs[lca.id] if lca.id in sublogs else Counter()
 
 
 def generate_full_alignment_based_on_infix_alignment(
@@ -219,7 +266,11 @@ def remove_zeros_from_marking(marking):
     return zero_removed_marking
 
 
-def add_alignment_to_sublogs(alignment, sublogs, allow_deviations=False):
+def add_alignment_to_sublogs(alignment, sublogs, allow_deviations=False, count=1):
+    """
+    Adds the activities executed by each process tree node in the alignment to the sublog of this node. count is the
+    number of traces that share the alignment, i.e., the frequency of the aligned variant.
+    """
     if not allow_deviations:
         assert not alignment_contains_deviation(alignment)
     currently_active_pt_nodes = {}
@@ -229,27 +280,25 @@ def add_alignment_to_sublogs(alignment, sublogs, allow_deviations=False):
         current_pt = step[0][1][0]
         if (current_pt, current_pt.id) in currently_active_pt_nodes:
             if current_pt.id not in sublogs:
-                sublogs[current_pt.id] = EventLog()
+                sublogs[current_pt.id] = Counter()
 
-            sublogs[current_pt.id].append(
-                currently_active_pt_nodes[(current_pt, current_pt.id)]
-            )
+            sublogs[current_pt.id][
+                tuple(currently_active_pt_nodes[(current_pt, current_pt.id)])
+            ] += count
             # every pt node occurs at least twice in an alignment, i.e., start and end. Hence when we observe a pt
             # node for the second time, we know it is closed
             assert step[0][1][1] == "closed"
             del currently_active_pt_nodes[(current_pt, current_pt.id)]
         elif not is_leaf_node(current_pt):
-            currently_active_pt_nodes[(current_pt, current_pt.id)] = Trace()
+            currently_active_pt_nodes[(current_pt, current_pt.id)] = []
 
         if is_leaf_node(current_pt):
             activity_name = step[1][1]
             if activity_name:
                 for active_node, active_node_obj_id in currently_active_pt_nodes:
                     if is_subtree(active_node, current_pt):
-                        event = Event()
-                        event["concept:name"] = activity_name
                         currently_active_pt_nodes[(active_node, active_node.id)].append(
-                            event
+                            activity_name
                         )
 
     return sublogs
@@ -282,10 +331,10 @@ def __split_log_by_infix_type(
 
 def __calculate_sub_log_for_each_node_regular_traces(
     pt: ProcessTree, log: EventLog, pool: Optional[multiprocessing.pool.Pool]
-) -> dict[int, EventLog]:
+) -> dict[int, Sublog]:
     """
     Calculates the sublog for each full, already added trace by first computing the alignment and then adding the relevant
-    parts to the sublog of the lca.
+    parts to the sublog of the lca. Every variant is aligned only once and added to the sublogs with its frequency.
     Parameters
     ----------
     pt
@@ -296,16 +345,29 @@ def __calculate_sub_log_for_each_node_regular_traces(
     -------
 
     """
-    sublogs: dict[int, EventLog] = {}
+    sublogs: dict[int, Sublog] = {}
+    variants: dict[tuple[str, ...], Trace] = {}
+    variant_frequencies = Counter()
+    for trace in log:
+        variant = trace_to_activity_tuple(trace)
+        variants.setdefault(variant, trace)
+        variant_frequencies[variant] += 1
+    variant_log = EventLog(list(variants.values()))
+
     # assumption: log is replayable on process tree without deviations
     net, im, fm = pt_to_petri_net(pt)
     if pool is not None:
         alignments = calculate_alignments_parallel(
-            log, net, im, fm, parameters={"ret_tuple_as_trans_desc": True}, pool=pool
+            variant_log,
+            net,
+            im,
+            fm,
+            parameters={"ret_tuple_as_trans_desc": True},
+            pool=pool,
         )
     else:
         alignments = calculate_alignments(
-            log,
+            variant_log,
             net,
             im,
             fm,
@@ -315,8 +377,10 @@ def __calculate_sub_log_for_each_node_regular_traces(
             },
             variant=variants_calculate_alignments.state_equation_a_star,
         )
-    for alignment in alignments:
-        sublogs = add_alignment_to_sublogs(alignment, sublogs)
+    for variant, alignment in zip(variants, alignments):
+        sublogs = add_alignment_to_sublogs(
+            alignment, sublogs, count=variant_frequencies[variant]
+        )
 
     return sublogs
 
@@ -325,8 +389,8 @@ def __add_fitting_alignment_prefix_to_sublogs(
     alignment: AlignmentResult,
     deviation_i: int,
     infix_type: InfixType,
-    sublogs: dict[int, EventLog],
-) -> dict[int, EventLog]:
+    sublogs: dict[int, Sublog],
+) -> dict[int, Sublog]:
     """
     Adds the fitting prefix of an alignment, i.e. the part in front of the deviation, to the sublog. This is relevant
     in case of loops, because there might be complete fitting executions of the lca in the prefix that we want to ensure
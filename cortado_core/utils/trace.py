@@ -1,9 +1,14 @@
+from collections import Counter
 from dataclasses import dataclass
+from typing import Tuple
 
 from pm4py.objects.log.obj import Trace, EventLog
 
 from cortado_core.models.infix_type import InfixType
 
+# variant-compressed log, i.e., a multiset of activity sequences (activity tuple -> number of occurrences)
+Sublog = Counter[Tuple[str, ...]]
+
 
 @dataclass
 class TypedTrace:
@@ -22,3 +27,11 @@ def combine_event_logs(log1: EventLog, log2: EventLog) -> EventLog:
         log1.append(trace)
 
     return log1
+
+
+def trace_to_activity_tuple(trace: Trace) -> Tuple[str, ...]:
+    return tuple(event["concept:name"] for event in trace)
+
+
+def event_log_to_sublog(log: EventLog) -> Sublog:
+    return Counter(trace_to_activity_tuple(trace) for trace in log)
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from pm4py.objects.log.obj import EventLog
+from pm4py.util.xes_constants import (
+    DEFAULT_INSTANCE_KEY,
+    DEFAULT_NAME_KEY,
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+    DEFAULT_TRANSITION_KEY,
+)
+
+from cortado_core.utils.cvariants import get_concurrency_variant_indices
+from cortado_core.utils.split_graph import Group
+from cortado_core.utils.timestamp_utils import TimeUnit
+
+# has to be increased if the variant computation or the format of the cache changes, s.t. old entries are not used
+VARIANT_CACHE_VERSION = 2
+
+# event attributes that determine the concurrency variants
+FINGERPRINT_KEYS = (
+    DEFAULT_NAME_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TRANSITION_KEY,
+    DEFAULT_INSTANCE_KEY,
+)
+
+VARIANTS_FILE = "variants.json"
+GRAPHS_FILE = "graphs.pickle"
+TRACE_INDICES_FILE = "trace_indices.npy"
+VARIANT_OFFSETS_FILE = "variant_offsets.npy"
+
+
+def get_case_fingerprints(log: EventLog) -> List[bytes]:
+    """
+    Returns a hash of the activities, timestamps and lifecycle attributes of the events of each case
+    """
+    return [
+        hashlib.blake2b(
+            repr(
+                [tuple(event.get(key) for key in FINGERPRINT_KEYS) for event in trace]
+            ).encode(),
+            digest_size=16,
+        ).digest()
+        for trace in log
+    ]
+
+
+def get_log_fingerprint(log: EventLog, time_granularity: TimeUnit) -> str:
+    """
+    Returns a fingerprint of the log and the time granularity that identifies the concurrency variants of the log
+    """
+    fingerprint = hashlib.blake2b(digest_size=16)
+    fingerprint.update(
+        f"{VARIANT_CACHE_VERSION}:{time_granularity.name}:{log.attributes.get('PM4PY_TYPE', '')}".encode()
+    )
+    for case_fingerprint in get_case_fingerprints(log):
+        fingerprint.update(case_fingerprint)
+
+    return fingerprint.hexdigest()
+
+
+class VariantCache:
+    """
+    Stores the concurrency variants of logs on disk. An entry is a directory named by the fingerprint of the log that
+    contains
+    - the serialized variants (json),
+    - the graphs of the variants and their counts (pickle, only entries written by this class should be loaded),
+    - the trace indices of all variants as one int64 array and the offsets of the variants in this array (npy).
+    The arrays are memory-mapped when an entry is loaded, i.e., the trace indices of a variant are only read from disk
+    if they are accessed.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def load(self, fingerprint: str) -> Optional[Dict[Group, np.ndarray]]:
+        """
+        :return: the trace indices of each variant or None if there is no entry for the fingerprint
+        """
+        entry = os.path.join(self.directory, fingerprint)
+        if not os.path.isdir(entry):
+            return None
+
+        with open(os.path.join(entry, VARIANTS_FILE)) as f:
+            variants = [Group.deserialize(v) for v in json.load(f)]
+        with open(os.path.join(entry, GRAPHS_FILE), "rb") as f:
+            graphs = pickle.load(f)
+        trace_indices = np.load(os.path.join(entry, TRACE_INDICES_FILE), mmap_mode="r")
+        offsets = np.load(os.path.join(entry, VARIANT_OFFSETS_FILE))
+
+        res = {}
+        for i, (variant, variant_graphs) in enumerate(zip(variants, graphs)):
+            variant.graphs = dict(variant_graphs)
+            res[variant] = trace_indices[offsets[i] : offsets[i + 1]]
+
+        return res
+
+    def store(self, fingerprint: str, variants: Dict[Group, Sequence[int]]):
+        """
+        Stores the trace indices of each variant. The entry is written to a temporary directory first and then moved,
+        s.t. concurrent readers never see incomplete entries.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        entry = os.path.join(self.directory, fingerprint)
+        tmp_entry = tempfile.mkdtemp(dir=self.directory)
+
+        try:
+            with open(os.path.join(tmp_entry, VARIANTS_FILE), "w") as f:
+                json.dump([v.serialize(include_performance=False) for v in variants], f)
+            with open(os.path.join(tmp_entry, GRAPHS_FILE), "wb") as f:
+                pickle.dump([list(v.graphs.items()) for v in variants], f)
+
+            lengths = [len(indices) for indices in variants.values()]
+            np.save(
+                os.path.join(tmp_entry, TRACE_INDICES_FILE),
+                np.fromiter(
+                    (i for indices in variants.values() for i in indices),
+                    dtype=np.int64,
+                    count=sum(lengths),
+                ),
+            )
+            np.save(
+                os.path.join(tmp_entry, VARIANT_OFFSETS_FILE),
+                np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+            )
+            os.replace(tmp_entry, entry)
+        except OSError:
+            # another process stored the entry in the meantime
+            if not os.path.isdir(entry):
+                raise
+        finally:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def get_concurrency_variants_cached(
+    log: EventLog,
+    cache: VariantCache,
+    use_mp: bool = False,
+    time_granularity: TimeUnit = min(TimeUnit),
+    pool=None,
+) -> Dict[Group, np.ndarray]:
+    """
+    Returns the variants of get_concurrency_variant_indices from the cache, they are computed and stored if the cache
+    has no entry for the log and the time granularity
+    :return: the indices of the traces in the log of each variant
+    """
+    fingerprint = get_log_fingerprint(log, time_granularity)
+    variants = cache.load(fingerprint)
+    if variants is None:
+        cache.store(
+            fingerprint,
+            get_concurrency_variant_indices(log, use_mp, time_granularity, pool),
+        )
+        variants = cache.load(fingerprint)
+
+    return variants
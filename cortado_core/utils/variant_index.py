@@ -0,0 +1,214 @@
+from collections import Counter
+from copy import copy
+from typing import Any, Dict, List, Optional, Tuple
+
+from pm4py.objects.log.obj import EventLog, Trace
+from pm4py.objects.log.util.interval_lifecycle import to_interval
+from pm4py.util.xes_constants import (
+    DEFAULT_NAME_KEY,
+    DEFAULT_START_TIMESTAMP_KEY,
+    DEFAULT_TIMESTAMP_KEY,
+    DEFAULT_TRACEID_KEY,
+    DEFAULT_TRANSITION_KEY,
+)
+
+from cortado_core.utils.cgroups_graph import (
+    ConcurrencyGroup,
+    cgroups_graph_from_columns,
+)
+from cortado_core.utils.cvariants import restore_names_rek
+from cortado_core.utils.split_graph import FrozenGroup, Group, split_group
+from cortado_core.utils.timestamp_utils import TimeUnit, transform_timestamp
+
+
+class VariantIndex:
+    """
+    Concurrency variants of a changing set of cases. Cases can be added, replaced and removed, and the variants and
+    their graph counts are updated in place. The variant of a case is computed like in get_concurrency_variants, i.e.,
+    by cgroups_graph and split_group. Variants of concurrency groups that were seen before are looked up instead of
+    splitting the group again. Cases without start or complete events are not indexed.
+    In contrast to get_concurrency_variants,
+    - the decision whether a trace is in interval or lifecycle format is made per trace instead of per log,
+    - the ids of the renamed activities in the graphs are assigned in the order in which the activities are added, so
+    they only match the ones of get_concurrency_variants if the cases are added in the order of the log,
+    - the traces are returned as they were added (not converted to interval traces).
+    The variants are kept by their frozen groups, i.e., updates do not rehash the variants.
+    """
+
+    def __init__(self, time_granularity: TimeUnit = min(TimeUnit)):
+        self.time_granularity = time_granularity
+        # renamed activity -> activity, renamed activity -> id
+        self.names: Dict[str, str] = {}
+        self.id_name_map: Dict[str, int] = {}
+
+        # case id -> (key of the concurrency group, trace)
+        self.__cases: Dict[Any, Tuple[tuple, Trace]] = {}
+        # key of the concurrency group -> [variant, frozen variant, concurrency group with restored names, number of
+        # cases]
+        self.__graphs: Dict[tuple, list] = {}
+        # frozen variant -> (variant, case id -> trace), equal variants of different concurrency groups share the
+        # variant instance
+        self.__variants: Dict[FrozenGroup, Tuple[Group, Dict[Any, Trace]]] = {}
+        # frozen variant -> (copy of the variant, traces) of the last snapshot, removed if the variant changed
+        self.__snapshots: Dict[FrozenGroup, Tuple[Group, List[Trace]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__cases)
+
+    def __contains__(self, case_id) -> bool:
+        return case_id in self.__cases
+
+    def add_trace(self, case_id, trace: Trace) -> Optional[Group]:
+        """
+        Adds the case or replaces its trace if the case was added before
+        :return: the variant of the trace, None if the trace has no start or complete events
+        """
+        if case_id in self.__cases:
+            self.remove_trace(case_id)
+
+        graph = self.__create_graph(trace)
+        if graph is None:
+            return None
+
+        key = graph.get()
+        if key not in self.__graphs:
+            self.__graphs[key] = [*self.__get_variant(graph), graph, 0]
+        info = self.__graphs[key]
+        variant, frozen_variant, restored_graph, _ = info
+        info[3] += 1
+
+        self.__cases[case_id] = (key, trace)
+        self.__variants.setdefault(frozen_variant, (variant, {}))[1][case_id] = trace
+        variant.graphs[restored_graph] = variant.graphs.get(restored_graph, 0) + 1
+        self.__snapshots.pop(frozen_variant, None)
+
+        return variant
+
+    def add_log(self, log: EventLog, case_id_key: str = DEFAULT_TRACEID_KEY):
+        """
+        Adds or replaces the traces of the log, the case ids are the values of the trace attribute case_id_key
+        """
+        for trace in log:
+            self.add_trace(trace.attributes[case_id_key], trace)
+
+    def remove_trace(self, case_id):
+        """
+        Removes the case, raises a KeyError if the case is unknown
+        """
+        key, _ = self.__cases.pop(case_id)
+        info = self.__graphs[key]
+        variant, frozen_variant, restored_graph, _ = info
+
+        info[3] -= 1
+        if info[3] == 0:
+            del self.__graphs[key]
+
+        variant.graphs[restored_graph] -= 1
+        if variant.graphs[restored_graph] == 0:
+            del variant.graphs[restored_graph]
+
+        _, cases = self.__variants[frozen_variant]
+        del cases[case_id]
+        if len(cases) == 0:
+            del self.__variants[frozen_variant]
+        self.__snapshots.pop(frozen_variant, None)
+
+    def get_variant(self, case_id) -> Group:
+        key, _ = self.__cases[case_id]
+        return self.__graphs[key][0]
+
+    def get_variants(self) -> Dict[Group, Dict[Any, Trace]]:
+        """
+        Returns the variants and their cases (variant -> case id -> trace). The dicts of the cases are the live state
+        of the index, they must not be modified and they change with every update of the index.
+        """
+        return {variant: cases for variant, cases in self.__variants.values()}
+
+    def snapshot(self) -> Dict[Group, List[Trace]]:
+        """
+        Returns the variants and their traces in the format of get_concurrency_variants. The snapshot is not changed by
+        later updates of the index. Copies of variants that did not change since the last snapshot are reused, i.e., a
+        snapshot only costs O(number of variants) plus the size of the changed variants. The variants and lists of a
+        snapshot are shared with later snapshots and must not be modified.
+        """
+        res = {}
+        for frozen_variant, (variant, cases) in self.__variants.items():
+            if frozen_variant not in self.__snapshots:
+                variant_copy = copy(variant)
+                variant_copy.graphs = dict(variant.graphs)
+                self.__snapshots[frozen_variant] = (variant_copy, list(cases.values()))
+            variant_copy, traces = self.__snapshots[frozen_variant]
+            res[variant_copy] = traces
+
+        return res
+
+    def __create_graph(self, trace: Trace) -> Optional[ConcurrencyGroup]:
+        """
+        Creates the concurrency group of the trace with renamed activities like cvariants.unique_activities
+        """
+        interval_trace = self.__to_interval_trace(trace)
+        if len(interval_trace) == 0:
+            return None
+
+        counter = Counter()
+        renamed = []
+        for event in interval_trace:
+            activity = event[DEFAULT_NAME_KEY]
+            new_name = activity + str(counter[activity])
+            counter[activity] += 1
+            renamed.append(new_name)
+            self.names.setdefault(new_name, activity)
+            self.id_name_map.setdefault(new_name, len(self.id_name_map))
+
+        # same (stable) order as in cgroups_graph
+        order = sorted(
+            range(len(interval_trace)),
+            key=lambda i: interval_trace[i][DEFAULT_START_TIMESTAMP_KEY],
+        )
+        return cgroups_graph_from_columns(
+            [renamed[i] for i in order],
+            [
+                transform_timestamp(
+                    interval_trace[i][DEFAULT_START_TIMESTAMP_KEY],
+                    self.time_granularity,
+                )
+                for i in order
+            ],
+            [
+                transform_timestamp(
+                    interval_trace[i][DEFAULT_TIMESTAMP_KEY], self.time_granularity
+                )
+                for i in order
+            ],
+        )
+
+    def __get_variant(self, graph: ConcurrencyGroup) -> Tuple[Group, FrozenGroup]:
+        """
+        Splits the concurrency group into its variant and restores the names of the variant and of the group
+        :return: the variant, which is the instance of an equal variant that was indexed before, and the frozen variant
+        """
+        v = split_group(graph)
+        if not v.checkGroupType():
+            raise Exception("Variant contains ChoiceGroup")
+        graph.restore_names(self.names, self.id_name_map)
+        variant = restore_names_rek(v, self.names)
+        frozen_variant = variant.freeze()
+        if frozen_variant in self.__variants:
+            variant = self.__variants[frozen_variant][0]
+
+        return variant, frozen_variant
+
+    @staticmethod
+    def __to_interval_trace(trace: Trace) -> Trace:
+        # same filtering of the lifecycle transitions as in get_concurrency_variants
+        if len(trace) > 0 and DEFAULT_TRANSITION_KEY in trace[0]:
+            trace = Trace(
+                [
+                    e
+                    for e in trace
+                    if e[DEFAULT_TRANSITION_KEY].lower() in ("start", "complete")
+                ],
+                attributes=trace.attributes,
+            )
+
+        return to_interval(EventLog([trace]))[0]
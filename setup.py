@@ -59,6 +59,7 @@ setup(
         "scikit-learn==1.1.3",
         "zss==1.2.0",
         "numpy>=1.21.2,<2.0.0",
+        "cachetools",
     ],
     python_requires=">=3.10",
 )